@@ -4,29 +4,45 @@ Handles frame data, combos, and attack mechanics
 """
 
 from pygame_compat import pygame
+from collections import deque
 import config as c
+from inputs import ACTION_INDEX, NO_FRAME
+from events import CombatEventQueue
 
 
 class CombatSystem:
     """Manages combat mechanics including combos and frame data"""
     
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else pygame.time  # Time source (anything with get_ticks())
         self.combo_hits = {}  # Track combo hits per fighter
         self.combo_damage = {}  # Track total combo damage
         self.combo_timer = {}  # Track time since last hit for combo drops
         self.last_hit_time = {}  # When the last hit landed
         self.attack_history = {}  # Track attack history for combo strings
         self.active_combo_string = {}  # Currently executing combo string
+        self.combo_matchers = {}  # Compiled combo-string matcher per fighter
+        self.combo_string_state = {}  # Current matcher state per fighter
         self.combo_announcements = []  # Combo announcements to display
+        self.events = CombatEventQueue()  # Combat events for the renderer
         
-    def register_fighter(self, fighter_id):
-        """Register a fighter for combo tracking"""
+    def register_fighter(self, fighter_id, character_name=None):
+        """
+        Register a fighter for combo tracking
+        
+        Args:
+            fighter_id: ID of the fighter ("p1" or "p2")
+            character_name: Name from config.CHARACTERS; selects which
+                combo strings this fighter can perform
+        """
         self.combo_hits[fighter_id] = 0
         self.combo_damage[fighter_id] = 0
         self.combo_timer[fighter_id] = 0
         self.last_hit_time[fighter_id] = 0
-        self.attack_history[fighter_id] = []
+        self.attack_history[fighter_id] = deque(maxlen=10)
         self.active_combo_string[fighter_id] = None
+        self.combo_matchers[fighter_id] = get_combo_matcher(character_name)
+        self.combo_string_state[fighter_id] = 0
         
     def reset_combo(self, fighter_id):
         """Reset combo counter for a fighter"""
@@ -37,6 +53,7 @@ class CombatSystem:
         self.combo_hits[fighter_id] = 0
         self.combo_damage[fighter_id] = 0
         self.combo_timer[fighter_id] = 0
+        self.combo_string_state[fighter_id] = 0
         
     def record_hit(self, attacker_id, damage, attack_type):
         """
@@ -50,14 +67,11 @@ class CombatSystem:
         Returns:
             Dict with combo info including multiplier and announcement
         """
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         
-        # Add to attack history
+        # Add to attack history (keeps last 10 attacks)
         if attacker_id in self.attack_history:
             self.attack_history[attacker_id].append(attack_type)
-            # Keep only last 10 attacks
-            if len(self.attack_history[attacker_id]) > 10:
-                self.attack_history[attacker_id].pop(0)
         
         # Check if this extends an existing combo (within combo window)
         combo_window = 1500  # 1.5 seconds to continue combo
@@ -67,6 +81,7 @@ class CombatSystem:
             # Combo dropped, start fresh
             self.combo_hits[attacker_id] = 0
             self.combo_damage[attacker_id] = 0
+            self.combo_string_state[attacker_id] = 0
         
         # Increment combo
         self.combo_hits[attacker_id] = self.combo_hits.get(attacker_id, 0) + 1
@@ -79,7 +94,7 @@ class CombatSystem:
         multiplier = self.get_combo_damage_multiplier(attacker_id)
         
         # Check for combo string matches
-        combo_string = self._check_combo_strings(attacker_id)
+        combo_string = self._check_combo_strings(attacker_id, attack_type)
         
         # Generate announcement for big combos
         announcement = None
@@ -109,21 +124,20 @@ class CombatSystem:
             'combo_string': combo_string
         }
     
-    def _check_combo_strings(self, fighter_id):
-        """Check if attack history matches any defined combo strings"""
-        history = self.attack_history.get(fighter_id, [])
-        if len(history) < 2:
-            return None
+    def _check_combo_strings(self, fighter_id, attack_type):
+        """
+        Advance the fighter's combo-string matcher by one attack
         
-        # Check against all combo strings
-        for char_name, combos in COMBO_STRINGS.items():
-            for combo_name, combo_data in combos.items():
-                inputs = combo_data['inputs']
-                if len(history) >= len(inputs):
-                    if history[-len(inputs):] == inputs:
-                        return combo_data
+        Returns:
+            Combo string data if this attack completed one, else None
+        """
+        matcher = self.combo_matchers.get(fighter_id)
+        if matcher is None:
+            return None
         
-        return None
+        state, combo_data = matcher.advance(self.combo_string_state.get(fighter_id, 0), attack_type)
+        self.combo_string_state[fighter_id] = state
+        return combo_data
     
     def _announce_combo_drop(self, fighter_id):
         """Announce when a combo drops"""
@@ -132,7 +146,7 @@ class CombatSystem:
             self.combo_announcements.append({
                 'text': f"{hits} HIT COMBO!",
                 'fighter_id': fighter_id,
-                'time': pygame.time.get_ticks(),
+                'time': self.clock.get_ticks(),
                 'hits': hits,
                 'is_final': True
             })
@@ -176,115 +190,419 @@ class CombatSystem:
     def get_combo_count(self, fighter_id):
         """Get current combo count"""
         return self.combo_hits.get(fighter_id, 0)
+    
+    def resolve_hits(self, hits, counter_windows, frame=0):
+        """
+        Apply all hits collected this frame
+        
+        Single place for parry, block, combo scaling and counter bonus,
+        whatever the source (melee, projectile, spinning kick). Outcomes
+        are emitted to self.events for the renderer.
+        
+        Args:
+            hits: List of Hit collected this frame
+            counter_windows: Dict of fighter_id -> counter attack frames left
+                (a successful parry opens the defender's window)
+            frame: Current simulation frame (stamped on events)
+            
+        Returns:
+            Hit-stop frames to apply (0 for none)
+        """
+        hit_stop = 0
+        for hit in hits:
+            attacker = hit.attacker
+            target = hit.target
+            
+            if target.parrying and target.parry_window > 0:
+                # Successful parry - no damage, opens a counter attack window
+                target.parry_success = True
+                target.color_flash = 10
+                target.gain_super_meter(c.SUPER_GAIN_ON_HIT)
+                counter_windows[target.fighter_id] = c.COUNTER_WINDOW_FRAMES
+                self.events.emit('parry', hit.source, hit.attack_type, attacker, target, frame)
+                if hit.projectile is not None:
+                    # Reflect projectile back at its owner
+                    hit.projectile.reflect(target)
+                    self.events.emit('projectile_reflect', hit.source, hit.attack_type, attacker, target, frame)
+                hit_stop = max(hit_stop, c.HIT_STOP_PARRY)
+            else:
+                # Apply combo damage scaling
+                damage = hit.damage
+                if attacker.fighter_id:
+                    combo_info = self.record_hit(attacker.fighter_id, damage, hit.attack_type)
+                    damage *= combo_info['multiplier']
+                
+                # Check for counter attack bonus
+                if counter_windows.get(attacker.fighter_id, 0) > 0:
+                    damage *= c.COUNTER_DAMAGE_MULT
+                
+                if hit.meter_gain:
+                    attacker.gain_super_meter(hit.meter_gain)
+                
+                was_alive = target.alive
+                blocked = target.take_damage(damage, hit.knockback, hit.stun, attacker.facing_right)
+                self.events.emit('block' if blocked else 'hit', hit.source, hit.attack_type, attacker, target, frame)
+                if was_alive and not target.alive:
+                    self.events.emit('ko', hit.source, hit.attack_type, attacker, target, frame)
+                if hit.projectile is not None:
+                    hit.projectile.active = False
+                    hit_stop = max(hit_stop, c.HIT_STOP_PROJECTILE)  # Brief freeze on heavy hits
+        return hit_stop
+    
+    def resolve_clash(self, proj_a, proj_b, frame=0):
+        """
+        Two opposing projectiles collided - both are destroyed
+        
+        Args:
+            proj_a: First projectile
+            proj_b: Second projectile (from the other fighter)
+            frame: Current simulation frame (stamped on the event)
+        """
+        proj_a.active = False
+        proj_b.active = False
+        position = ((proj_a.x + proj_b.x) / 2, (proj_a.y + proj_b.y) / 2)
+        self.events.emit('projectile_clash', 'projectile', 'special', proj_a.owner, proj_b.owner,
+                         frame, position)
 
 
-class AttackBuffer:
+class Hit:
+    """One attack connecting this frame (collected before any hit is applied)"""
+    
+    __slots__ = ('attacker', 'target', 'source', 'attack_type', 'damage',
+                 'knockback', 'stun', 'meter_gain', 'projectile')
+    
+    def __init__(self, attacker, target, source, attack_type, damage, knockback, stun,
+                 meter_gain=0, projectile=None):
+        """
+        Args:
+            attacker: Fighter credited with the hit
+            target: Fighter being hit
+            source: 'melee', 'projectile' or 'spinning_kick'
+            attack_type: Attack name used for combo tracking
+            damage: Base damage before combo scaling / counter bonus
+            knockback: Knockback passed to take_damage
+            stun: Hit stun frames passed to take_damage
+            meter_gain: Super meter the attacker gains on a landed hit
+            projectile: Projectile that hit (reflected on parry, removed on hit)
+        """
+        self.attacker = attacker
+        self.target = target
+        self.source = source
+        self.attack_type = attack_type
+        self.damage = damage
+        self.knockback = knockback
+        self.stun = stun
+        self.meter_gain = meter_gain
+        self.projectile = projectile
+
+
+class ComboStringMatcher:
     """
-    Input buffering system for smooth attack canceling
-    Allows queuing next attack during current attack
+    Suffix automaton (Aho-Corasick) over attack names for one character.
+    
+    Compiled once from that character's COMBO_STRINGS entry. Each hit
+    advances the automaton by one transition-table lookup, so matching is
+    O(1) per hit regardless of how many combo strings are defined.
+    State 0 is the empty history.
     """
     
-    def __init__(self, buffer_window=5):
+    def __init__(self, combos):
         """
-        Initialize attack buffer
+        Compile combo strings into a transition table
         
         Args:
-            buffer_window: Number of frames to buffer input
+            combos: Dict of combo_id -> combo data (with 'inputs' list)
         """
-        self.buffer_window = buffer_window
-        self.buffered_attacks = {}
-        
-    def buffer_attack(self, fighter_id, attack_type, timestamp):
-        """Buffer an attack input"""
-        self.buffered_attacks[fighter_id] = {
-            'type': attack_type,
-            'timestamp': timestamp
-        }
+        # Build trie: goto[state][attack] -> state
+        goto = [{}]
+        terminal = [None]
+        for combo_data in combos.values():
+            state = 0
+            for attack in combo_data['inputs']:
+                if attack not in goto[state]:
+                    goto.append({})
+                    terminal.append(None)
+                    goto[state][attack] = len(goto) - 1
+                state = goto[state][attack]
+            terminal[state] = combo_data
+        
+        # Breadth-first: failure links -> full transition table and outputs.
+        # A state's output is its own combo, else the longest combo that is a
+        # suffix of it (reached through its failure link).
+        alphabet = {attack for edges in goto for attack in edges}
+        self.transitions = [dict() for _ in goto]
+        self.output = list(terminal)
+        fail = [0] * len(goto)
+        queue = deque()
+        for attack in alphabet:
+            child = goto[0].get(attack)
+            if child is None:
+                self.transitions[0][attack] = 0
+            else:
+                self.transitions[0][attack] = child
+                queue.append(child)
+        while queue:
+            state = queue.popleft()
+            if self.output[state] is None:
+                self.output[state] = self.output[fail[state]]
+            for attack in alphabet:
+                child = goto[state].get(attack)
+                if child is None:
+                    self.transitions[state][attack] = self.transitions[fail[state]][attack]
+                else:
+                    fail[child] = self.transitions[fail[state]][attack]
+                    self.transitions[state][attack] = child
+                    queue.append(child)
+    
+    def advance(self, state, attack_type):
+        """
+        Feed one attack into the automaton
         
-    def get_buffered_attack(self, fighter_id, current_time):
-        """Get buffered attack if within window"""
-        if fighter_id not in self.buffered_attacks:
-            return None
-            
-        buffered = self.buffered_attacks[fighter_id]
-        time_diff = current_time - buffered['timestamp']
-        
-        # Check if within buffer window (convert frames to ms at 60fps)
-        if time_diff <= (self.buffer_window * 1000 / 60):
-            # Clear buffer and return attack
-            attack_type = buffered['type']
-            del self.buffered_attacks[fighter_id]
-            return attack_type
+        Args:
+            state: Current matcher state
+            attack_type: Attack that just landed
             
-        # Buffer expired
-        if time_diff > (self.buffer_window * 1000 / 60):
-            del self.buffered_attacks[fighter_id]
+        Returns:
+            (new_state, combo_data or None)
+        """
+        state = self.transitions[state].get(attack_type, 0)
+        return state, self.output[state]
+
+
+_compiled_combo_matchers = {}
+
+
+def get_combo_matcher(character_name):
+    """
+    Get the compiled combo-string matcher for a character (cached)
+    
+    Args:
+        character_name: Name from config.CHARACTERS, or None
         
+    Returns:
+        ComboStringMatcher, or None if the character has no combo strings
+    """
+    combos = COMBO_STRINGS.get(character_name)
+    if not combos:
         return None
+    matcher = _compiled_combo_matchers.get(character_name)
+    if matcher is None:
+        matcher = ComboStringMatcher(combos)
+        _compiled_combo_matchers[character_name] = matcher
+    return matcher
+
+
+class AttackBuffer:
+    """
+    Frame-based input buffering for attacks
+    Remembers attack presses made while the fighter can't act (recovery,
+    cooldown, stun) and hands them back on the first actionable frame.
+    Press frames are read from the fighter's InputHistory.
+    """
+    
+    # Checked in this order; on equal press frames the earlier entry wins
+    BUFFERED_ATTACKS = ('special', 'heavy_kick', 'heavy_punch', 'light_kick', 'light_punch')
+    
+    def __init__(self, history):
+        """
+        Initialize attack buffer
+        
+        Args:
+            history: InputHistory the fighter records into each frame
+        """
+        self.history = history
+        # (attack, action index, buffer window in frames) from FRAME_DATA
+        self.attacks = [
+            (attack, ACTION_INDEX[attack], c.FRAME_DATA[attack]['buffer'])
+            for attack in self.BUFFERED_ATTACKS
+        ]
+        self.consumed_frame = NO_FRAME  # Presses at or before this frame are used up
+        
+    def get_buffered_attack(self):
+        """
+        Get the most recently pressed attack still inside its buffer window
+        
+        Returns:
+            Attack name, or None
+        """
+        frame = self.history.frame
+        last_press = self.history.last_press
+        best_attack = None
+        best_frame = self.consumed_frame
+        for attack, index, window in self.attacks:
+            press_frame = last_press[index]
+            if press_frame > best_frame and frame - press_frame <= window:
+                best_attack = attack
+                best_frame = press_frame
+        return best_attack
+    
+    def clear_buffer(self):
+        """Consume all presses up to the current frame"""
+        self.consumed_frame = self.history.frame
+
+
+# Attack phase of each frame
+PHASE_STARTUP = 0
+PHASE_ACTIVE = 1
+PHASE_RECOVERY = 2
+
+# Per-frame flag bits
+FRAME_CAN_MOVE = 1  # Fighter may walk/jump this frame
+FRAME_HITBOX_ACTIVE = 2  # Attack hitbox is live this frame
+
+
+class CompiledMove:
+    """
+    Frame data for one move compiled into per-frame tables
+    
+    phases[f] and flags[f] describe frame f of the attack (0 = first frame).
+    Frames at or past total are treated as finished (recovery, can move).
+    """
+    
+    __slots__ = ('name', 'total', 'phases', 'flags')
+    
+    def __init__(self, name, data):
+        """
+        Compile one FRAME_DATA entry
+        
+        Args:
+            name: Move name
+            data: FRAME_DATA entry with startup/active/recovery/total
+        """
+        startup = data['startup']
+        active_end = startup + data['active']
+        total = max(data['total'], active_end + data['recovery'])
+        
+        phases = bytearray(total)
+        flags = bytearray(total)
+        for frame in range(total):
+            if frame < startup:
+                # For arcade machines, allow movement during startup frames even for heavy attacks
+                # This makes simultaneous input feel more responsive
+                phases[frame] = PHASE_STARTUP
+                flags[frame] = FRAME_CAN_MOVE
+            elif frame < active_end:
+                phases[frame] = PHASE_ACTIVE
+                flags[frame] = FRAME_HITBOX_ACTIVE
+            else:
+                # Light and heavy attacks both allow movement after active frames
+                phases[frame] = PHASE_RECOVERY
+                flags[frame] = FRAME_CAN_MOVE
+        
+        self.name = name
+        self.total = total
+        self.phases = bytes(phases)
+        self.flags = bytes(flags)
+
+
+def compile_frame_data(frame_data):
+    """
+    Compile frame data into per-move tables
+    
+    Args:
+        frame_data: Dict of move name -> FRAME_DATA entry
+        
+    Returns:
+        Dict of move name -> CompiledMove (moves with open-ended
+        durations, like block, are skipped)
+    """
+    return {
+        name: CompiledMove(name, data)
+        for name, data in frame_data.items()
+        if data['active'] >= 0 and data['total'] >= 0
+    }
+
+
+COMPILED_FRAME_DATA = compile_frame_data(c.FRAME_DATA)
+
+
+def build_hitbox_timeline(attack_type, width, height):
+    """
+    Build per-frame hitbox sizes for a move from its frame data
+    
+    The hitbox winds up during startup and retracts during recovery
+    (scaled by config.HITBOX_PHASE_SCALE); it can only hit on frames
+    flagged FRAME_HITBOX_ACTIVE.
     
-    def clear_buffer(self, fighter_id):
-        """Clear buffered attack"""
-        if fighter_id in self.buffered_attacks:
-            del self.buffered_attacks[fighter_id]
+    Args:
+        attack_type: Move name in COMPILED_FRAME_DATA
+        width: Full hitbox width (reach in front of the fighter)
+        height: Hitbox height
+        
+    Returns:
+        Tuple of (width, height) per attack frame (empty for unknown moves)
+    """
+    move = COMPILED_FRAME_DATA.get(attack_type)
+    if move is None:
+        return ()
+    return tuple(
+        (max(1, round(width * c.HITBOX_PHASE_SCALE[phase])), height)
+        for phase in move.phases
+    )
 
 
 class FrameData:
     """
     Manages attack frame data and recovery
     Determines when a fighter can move based on attack state
+    All queries index the tables in COMPILED_FRAME_DATA with integer frames
     """
     
     @staticmethod
-    def can_move_during_attack(attack_type, frames_elapsed):
+    def get_flags(attack_type, frame):
+        """
+        Get per-frame flag bits for an attack
+        
+        Args:
+            attack_type: Type of attack being performed
+            frame: Frames since attack started (int)
+            
+        Returns:
+            FRAME_* bitmask (0 for unknown moves)
+        """
+        move = COMPILED_FRAME_DATA.get(attack_type)
+        if move is None:
+            return 0
+        if frame >= move.total:
+            return FRAME_CAN_MOVE
+        return move.flags[frame]
+    
+    @staticmethod
+    def get_phase(attack_type, frame):
+        """Get PHASE_* value of an attack frame (recovery once finished)"""
+        move = COMPILED_FRAME_DATA.get(attack_type)
+        if move is None or frame >= move.total:
+            return PHASE_RECOVERY
+        return move.phases[frame]
+    
+    @staticmethod
+    def can_move_during_attack(attack_type, frame):
         """
         Determine if fighter can move during attack
         
         Args:
             attack_type: Type of attack being performed
-            frames_elapsed: Frames since attack started
+            frame: Frames since attack started
             
         Returns:
             True if fighter can move, False otherwise
         """
-        if attack_type not in c.FRAME_DATA:
+        if attack_type not in COMPILED_FRAME_DATA:
             return True
-        
-        data = c.FRAME_DATA[attack_type]
-        
-        # For arcade machines, allow movement during startup frames even for heavy attacks
-        # This makes simultaneous input feel more responsive
-        startup_frames = data['startup']
-        if frames_elapsed < startup_frames:
-            return True  # Always allow movement during startup
-        
-        # Light attacks can move after active frames
-        if data.get('can_move_early', False):
-            active_end = startup_frames + data['active']
-            return frames_elapsed >= active_end
-        
-        # Heavy attacks: allow movement after active frames
-        # (was: require full recovery, now: allow after active)
-        active_end = startup_frames + data['active']
-        return frames_elapsed >= active_end
+        return bool(FrameData.get_flags(attack_type, frame) & FRAME_CAN_MOVE)
     
     @staticmethod
     def get_attack_duration(attack_type):
         """Get total duration of attack in frames"""
-        if attack_type not in c.FRAME_DATA:
+        move = COMPILED_FRAME_DATA.get(attack_type)
+        if move is None:
             return 10  # Default
-        return c.FRAME_DATA[attack_type]['total']
+        return move.total
     
     @staticmethod
-    def is_in_active_frames(attack_type, frames_elapsed):
+    def is_in_active_frames(attack_type, frame):
         """Check if attack is in active (hitting) frames"""
-        if attack_type not in c.FRAME_DATA:
-            return False
-        
-        data = c.FRAME_DATA[attack_type]
-        startup = data['startup']
-        active_end = startup + data['active']
-        
-        return startup <= frames_elapsed < active_end
+        return bool(FrameData.get_flags(attack_type, frame) & FRAME_HITBOX_ACTIVE)
 
 
 class SpecialMoveData:
@@ -368,11 +686,11 @@ def check_combo_string(attack_history, combo_string):
     return recent == combo_string
 
 
-# Character-specific combo definitions
-# NOTE: These combo strings are defined for future enhancement
-# They can be implemented to provide bonus damage when specific attack sequences are performed
+# Character-specific combo definitions, keyed by config.CHARACTERS name
+# Compiled per character into a ComboStringMatcher when a fighter registers
+# NOTE: bonus_damage is not applied yet - matches currently trigger an announcement
 COMBO_STRINGS = {
-    'PROF. KHALID': {
+    'KHALID': {
         'tornado_kick': {
             'inputs': ['light_kick', 'light_kick', 'heavy_kick'],
             'bonus_damage': 0.3,
@@ -384,7 +702,7 @@ COMBO_STRINGS = {
             'name': 'FLYING AXE KICK'
         }
     },
-    'PROF. EDUARDO': {
+    'EDUARDO': {
         'pizza_barrage': {
             'inputs': ['light_punch', 'light_punch', 'special'],
             'bonus_damage': 0.3,
@@ -396,14 +714,14 @@ COMBO_STRINGS = {
             'name': 'MEGA SLICE'
         }
     },
-    'PROF. HASAN': {
+    'HASAN': {
         'flame_uppercut': {
             'inputs': ['light_kick', 'heavy_punch', 'special'],
             'bonus_damage': 0.3,
             'name': 'FLAME UPPERCUT'
         }
     },
-    'PROF. HAMMOUD': {
+    'HAMMOUD': {
         'binary_rush': {
             'inputs': ['light_punch', 'light_punch', 'light_kick', 'heavy_kick'],
             'bonus_damage': 0.3,
@@ -118,24 +118,71 @@ MOTION_INPUT_WINDOW = 20  # Frames to complete motion input
 ATTRACT_MODE_TIMEOUT = 1800  # 30 seconds at 60fps
 
 # Attack Frame Data
+# 'buffer': frames an attack press is remembered while the fighter can't act
 FRAME_DATA = {
-    'light_punch': {'startup': 3, 'active': 2, 'recovery': 5, 'total': 10, 'can_move_early': True},
-    'heavy_punch': {'startup': 8, 'active': 4, 'recovery': 15, 'total': 27, 'can_move_early': False},
-    'light_kick': {'startup': 4, 'active': 3, 'recovery': 6, 'total': 13, 'can_move_early': True},
-    'heavy_kick': {'startup': 10, 'active': 5, 'recovery': 18, 'total': 33, 'can_move_early': False},
-    'special': {'startup': 12, 'active': 10, 'recovery': 20, 'total': 42, 'can_move_early': False},
-    'ultimate': {'startup': 20, 'active': 15, 'recovery': 30, 'total': 65, 'can_move_early': False},
+    'light_punch': {'startup': 3, 'active': 2, 'recovery': 5, 'total': 10, 'can_move_early': True, 'buffer': 6},
+    'heavy_punch': {'startup': 8, 'active': 4, 'recovery': 15, 'total': 27, 'can_move_early': False, 'buffer': 8},
+    'light_kick': {'startup': 4, 'active': 3, 'recovery': 6, 'total': 13, 'can_move_early': True, 'buffer': 6},
+    'heavy_kick': {'startup': 10, 'active': 5, 'recovery': 18, 'total': 33, 'can_move_early': False, 'buffer': 8},
+    'special': {'startup': 12, 'active': 10, 'recovery': 20, 'total': 42, 'can_move_early': False, 'buffer': 10},
+    'ultimate': {'startup': 20, 'active': 15, 'recovery': 30, 'total': 65, 'can_move_early': False, 'buffer': 0},
     # NOTE: Block and dash below are reserved for future implementation
     'block': {'startup': 5, 'active': -1, 'recovery': 3, 'total': -1, 'can_move_early': True},
     'dash': {'startup': 2, 'active': 8, 'recovery': 5, 'total': 15, 'can_move_early': True},
 }
 
+# Hitbox debug view colors by attack phase (startup, active, recovery)
+FRAME_PHASE_COLORS = ((255, 255, 0), (255, 50, 50), (50, 50, 255))
+
+# Hitbox width by attack phase (startup, active, recovery) as a fraction of full reach
+HITBOX_PHASE_SCALE = (0.5, 1.0, 0.75)
+
+# Pushbox: fighter rect narrowed by this many pixels per side; overlapping
+# pushboxes are separated every frame so fighters can't stand inside each other
+PUSHBOX_INSET = 5
+
+# Hurtbox per animation state: (front, top, back, bottom) insets in pixels from
+# the fighter rect, relative to facing. Negative front = extended limb can be hit
+HURTBOXES = {
+    'idle': (0, 0, 0, 0),
+    'jump': (5, 0, 5, 25),  # Legs tucked
+    'block': (10, 10, 0, 0),  # Guarded, leaning back
+    'dash': (0, 25, 0, 0),  # Low profile
+    'light_punch': (-10, 0, 0, 0),
+    'heavy_punch': (-20, 0, 0, 0),
+    'light_kick': (-15, 0, 0, 0),
+    'heavy_kick': (-25, 0, 0, 0),
+    'special': (0, 0, 0, 0),
+    'ultimate': (0, 0, 0, 0),
+}
+
 # Motion Input Patterns (for Hadouken-style inputs)
-# Stored as list of directional states: 'down', 'down_forward', 'forward'
+# Stored as list of directional states (relative to facing): 'neutral', 'up',
+# 'down', 'forward', 'back', 'up_forward', 'up_back', 'down_forward', 'down_back'
+# Steps must appear in order; other directions in between are allowed
 MOTION_INPUTS = {
     'quarter_circle_forward': ['down', 'down_forward', 'forward'],  # QCF: ↓↘→
     'quarter_circle_back': ['down', 'down_back', 'back'],           # QCB: ↓↙←
     'dragon_punch': ['forward', 'down', 'down_forward'],            # DP: →↓↘
+    'full_circle': ['forward', 'down', 'back', 'up'],               # 360: →↓←↑
+    'double_tap_forward': ['forward', 'neutral', 'forward'],        # →→
+    'double_tap_back': ['back', 'neutral', 'back'],                 # ←←
+}
+
+# Charge Inputs: hold a direction for 'frames', then press 'release'
+CHARGE_INPUTS = {
+    'charge_back_forward': {'hold': 'back', 'frames': 45, 'release': 'forward'},  # [←]→
+    'charge_down_up': {'hold': 'down', 'frames': 45, 'release': 'up'},            # [↓]↑
+}
+
+# Per-motion completion windows in frames (default MOTION_INPUT_WINDOW)
+# For charge inputs this is how long the charge is kept after letting go
+MOTION_INPUT_WINDOWS = {
+    'full_circle': 30,
+    'double_tap_forward': 12,
+    'double_tap_back': 12,
+    'charge_back_forward': 10,
+    'charge_down_up': 10,
 }
 
 # Combo System
@@ -156,6 +203,8 @@ BLOCK_DURATION_MS = 3000  # Maximum block duration: 3 seconds
 # Parry System Configuration  
 PARRY_COOLDOWN_FRAMES = 300  # 5 seconds at 60fps
 PARRY_WINDOW_FRAMES = 6  # 6-frame parry window
+COUNTER_WINDOW_FRAMES = 60  # Counter attack window after a parry (1 second)
+COUNTER_DAMAGE_MULT = 1.5  # 50% bonus damage on counter
 
 # Control Mapping System
 # This makes it easy to add arcade machine controls later
@@ -254,6 +303,10 @@ ARCADE_P2_AXIS = {
     'down': (1, 1),
 }
 
+# Player slots for joysticks; each device's slot is remembered by GUID (see joystick.py)
+JOYSTICK_SLOTS = 2
+JOYSTICK_SLOTS_FILE = 'joystick_slots.json'
+
 # Reset button - P1 button (5) on any joystick quits the game
 ARCADE_RESET_BUTTON = '5'
 
@@ -263,4 +316,70 @@ HAT_BUTTONS = {
     'H1': 'right',  # Hat right = move right
     'H2': 'down',   # Hat down = crouch/block
     'H3': 'left',   # Hat left = move left
-}
\ No newline at end of file
+}
+
+# CRT scanlines over the arcade frame (off keeps the classic clean look)
+SCANLINES = False
+
+# ===== ADAPTIVE QUALITY =====
+# Eye candy is dropped in this order when frames run over budget,
+# and restored in reverse order once there is headroom again
+QUALITY_STEPS = [
+    'scanlines',             # CRT scanline overlay
+    'particles',             # Hit/dust particle counts
+    'hit_effects',           # Random comic hit-effect spawns
+    'background_animation',  # Animated background windows
+    'shield_alpha',          # Translucent block/parry shields
+]
+FRAME_BUDGET_MS = 1000 / FPS
+QUALITY_DOWNGRADE_LOAD = 0.85  # Step down when work time exceeds 85% of budget...
+QUALITY_DOWNGRADE_FRAMES = 20  # ...on average over this many frames
+QUALITY_UPGRADE_LOAD = 0.5     # Step back up when under 50% of budget...
+QUALITY_UPGRADE_FRAMES = 180   # ...on average over this many frames
+QUALITY_REDUCED_PARTICLES = 0.4  # Fraction of particles kept when 'particles' is off
+
+# ===== FRAME TIMING =====
+# Simulation always steps at FPS; rendering runs at display rate
+MAX_CATCHUP_STEPS = 5  # Max simulation steps per rendered frame before dropping time
+MAX_RENDER_FPS = 240  # Render cap (vsync normally limits this to the display rate)
+VSYNC = True  # Request vsync from SDL (ignored by pygame builds without support)
+INTERPOLATION_SNAP_DISTANCE = 100  # Pixels moved in one step beyond which we don't interpolate
+
+# ===== RANDOM STREAMS =====
+RNG_SEED = None  # Master seed for rng.RandomStreams (None = new seed every run)
+
+# ===== REPLAYS =====
+RECORD_REPLAYS = False  # Write every match's inputs to REPLAY_DIR (see replay.py)
+REPLAY_HASHES = True  # Store the per-frame state hash alongside the inputs
+REPLAY_DIR = 'replays'
+
+# ===== NETPLAY (rollback, see netplay.py) =====
+NETPLAY_PORT = 7000  # Default UDP port
+NETPLAY_INPUT_DELAY = 2  # Frames local input is delayed (hides latency, fewer rollbacks)
+NETPLAY_MAX_ROLLBACK = 8  # Max frames simulated past the last confirmed remote input
+NETPLAY_MAX_INPUTS_PER_PACKET = 32  # Unacknowledged inputs resent in every packet
+NETPLAY_TIMEOUT_FRAMES = 300  # No packets for this long = disconnected
+
+# ===== RUN-AHEAD (see runahead.py) =====
+RUN_AHEAD_FRAMES = 0  # Fight steps simulated ahead of the displayed frame to hide display lag (0 = off)
+RUN_AHEAD_REPORT_FRAMES = 600  # Print run-ahead CPU cost every this many rendered frames
+
+# ===== LATENCY MEASUREMENT (see latency.py) =====
+MEASURE_LATENCY = False  # Follow input events to the display (latency.py); also main.py --measure-latency
+LATENCY_REPORT_SAMPLES = 100  # Print the latency distribution every this many inputs
+LATENCY_TIMEOUT_FRAMES = 30  # Inputs with no visible effect after this many frames are dropped
+
+# ===== INPUT POLLING (see inputpoll.py) =====
+INPUT_POLLING = False  # Poll input at INPUT_POLL_HZ while waiting to flip (inputpoll.py); also main.py --poll-input
+INPUT_POLL_HZ = 1000  # Input polls per second while waiting
+INPUT_POLL_MARGIN_MS = 2.0  # Stop polling this long before the next flip is due
+INPUT_QUEUE_SIZE = 256  # Polled events held for the next frame (oldest dropped when full)
+
+# ===== HIT-STOP & SLOW MOTION =====
+# Durations are in fixed 60 Hz simulation steps (SimulationClock.tick); simulation
+# time is frozen or scaled for their length, so frame data and ms timers are unaffected
+HIT_STOP_PARRY = 5  # Projectile parried
+HIT_STOP_PROJECTILE = 4  # Projectile hit
+HIT_STOP_ULTIMATE = 8  # Ultimate move activated
+WINNER_SLOWMO_SCALE = 0.5  # Half speed at the start of the winner sequence
+WINNER_SLOWMO_FRAMES = 60  # 30 simulation frames at half speed
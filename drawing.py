@@ -6,6 +6,7 @@ All characters drawn using pygame primitives (no sprites)
 from pygame_compat import pygame
 import math
 import config as c
+from ui_components import GradientBackground
 
 # Animation constants
 SPINNING_KICK_ROTATION_SPEED = 12  # degrees per frame
@@ -34,14 +35,8 @@ def draw_parallax_background(surface, p1_x, p2_x, frame):
     # Draw sky gradient
     sky_top = (40, 40, 80)
     sky_bottom = (80, 60, 100)
-    for y in range(c.FLOOR_Y):
-        ratio = y / c.FLOOR_Y
-        color = (
-            int(sky_top[0] + (sky_bottom[0] - sky_top[0]) * ratio),
-            int(sky_top[1] + (sky_bottom[1] - sky_top[1]) * ratio),
-            int(sky_top[2] + (sky_bottom[2] - sky_top[2]) * ratio)
-        )
-        pygame.draw.line(surface, color, (0, y), (c.SCREEN_WIDTH, y))
+    sky = GradientBackground.get_vertical(c.SCREEN_WIDTH, c.FLOOR_Y, sky_top, sky_bottom)
+    surface.blit(sky, (0, 0))
     
     # Draw distant mountains/buildings (moves at 30%)
     far_offset = parallax_offset * 0.3
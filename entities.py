@@ -1,8 +1,12 @@
 from pygame_compat import pygame
 import math
 import config as c
-from combat import FrameData, CombatSystem, SpecialMoveData
+from combat import FrameData, CombatSystem, SpecialMoveData, AttackBuffer, build_hitbox_timeline
 import drawing
+from timing import lerp
+from inputs import InputHistory, MotionRecognizer, ACTION_BITS
+from collision import Collider, sweep_x, segment_hits_box
+from projectiles import SINE_TABLE, COSINE_TABLE, TRIG_TABLE_SIZE, TRIG_TABLE_MASK, TRIG_STEPS_PER_RADIAN, angle_to_index
 
 class Particle:
     """Simple hit particle effect"""
@@ -27,6 +31,13 @@ class Particle:
 
 class Projectile:
     """Base projectile class"""
+    
+    HALF_SIZE = 10  # Collision box is 20x20 around (x, y)
+    
+    # Mutable state captured by snapshot.save_state (subclasses extend)
+    SNAPSHOT_FIELDS = ('x', 'y', 'vel_x', 'vel_y', 'owner', 'active', 'frame',
+                       'prev_x', 'prev_y', 'last_x', 'last_y')
+    
     def __init__(self, x, y, damage, vel_x, vel_y, owner):
         self.x = x
         self.y = y
@@ -36,148 +47,261 @@ class Projectile:
         self.owner = owner  # Fighter who shot it
         self.active = True
         self.frame = 0
+        self.prev_x = x  # Position at start of the current simulation step
+        self.prev_y = y
+        self.last_x = x  # Position at start of the current frame (swept collision)
+        self.last_y = y
+        self.rect = pygame.Rect(x - 10, y - 10, 20, 20)  # Reused collision rect
+        self.collider = Collider(self.rect, 'projectile', owner, self)
         
     def update(self):
         """Update projectile position"""
-        self.x += self.vel_x
-        self.y += self.vel_y
-        self.frame += 1
+        type(self).update_all((self,))
+    
+    @staticmethod
+    def update_all(projectiles):
+        """Advance a batch of straight-moving projectiles one frame"""
+        max_x = c.SCREEN_WIDTH + 50
+        max_y = c.SCREEN_HEIGHT + 50
+        for proj in projectiles:
+            proj.last_x = proj.x
+            proj.last_y = proj.y
+            proj.x += proj.vel_x
+            proj.y += proj.vel_y
+            proj.frame += 1
+            
+            # Deactivate if off screen
+            if proj.x < -50 or proj.x > max_x or proj.y < -50 or proj.y > max_y:
+                proj.active = False
+    
+    def reflect(self, new_owner):
+        """Send projectile back the way it came (successful parry)"""
+        self.vel_x = -self.vel_x  # Reverse horizontal velocity
+        self.owner = new_owner
+    
+    def update_collider(self):
+        """
+        Sync broadphase collider with this frame's path and owner (owner changes on reflect)
         
-        # Deactivate if off screen
-        if self.x < -50 or self.x > c.SCREEN_WIDTH + 50:
-            self.active = False
-        if self.y < -50 or self.y > c.SCREEN_HEIGHT + 50:
-            self.active = False
+        The rect covers the whole segment travelled this frame so fast
+        projectiles can't skip over anything.
+        """
+        r = self.HALF_SIZE
+        x0, y0, x1, y1 = self.last_x, self.last_y, self.x, self.y
+        self.rect.update(min(x0, x1) - r, min(y0, y1) - r, abs(x1 - x0) + 2 * r, abs(y1 - y0) + 2 * r)
+        self.collider.team = self.owner
+        return self.collider
     
-    def get_rect(self):
-        """Get collision rectangle"""
-        return pygame.Rect(self.x - 10, self.y - 10, 20, 20)
+    def sweep_hits(self, fighter):
+        """
+        Swept test against a fighter's hurtbox
+        
+        Uses this frame's motion relative to the fighter, so neither a fast
+        projectile nor a fast-moving fighter can pass through the other.
+        """
+        box = fighter.hurtbox
+        r = self.HALF_SIZE
+        fighter_dx = fighter.rect.x - fighter.sweep_start_x
+        fighter_dy = fighter.rect.y - fighter.sweep_start_y
+        return segment_hits_box(self.last_x - fighter_dx, self.last_y - fighter_dy, self.x, self.y,
+                                box.left - r, box.top - r, box.right + r, box.bottom + r)
     
-    def draw(self, surface):
+    def sweep_hits_projectile(self, other):
+        """Swept test against another projectile (relative motion this frame)"""
+        size = self.HALF_SIZE + other.HALF_SIZE
+        return segment_hits_box(self.last_x - other.last_x, self.last_y - other.last_y,
+                                self.x - other.x, self.y - other.y,
+                                -size, -size, size, size)
+    
+    def store_render_position(self):
+        """Remember current position before a simulation step (for interpolation)"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+    
+    def get_render_pos(self, interpolation=1.0):
+        """Get position interpolated between the last two simulation steps"""
+        if (abs(self.x - self.prev_x) > c.INTERPOLATION_SNAP_DISTANCE or
+                abs(self.y - self.prev_y) > c.INTERPOLATION_SNAP_DISTANCE):
+            return self.x, self.y
+        return lerp(self.prev_x, self.x, interpolation), lerp(self.prev_y, self.y, interpolation)
+    
+    def draw(self, surface, interpolation=1.0):
         """Override in subclass"""
         pass
 
 
 class PizzaSlice(Projectile):
     """Eduardo's pizza slice projectile"""
+    
+    SNAPSHOT_FIELDS = Projectile.SNAPSHOT_FIELDS + ('rotation', 'delay')
+    
     def __init__(self, x, y, vel_x, vel_y, owner, delay=0):
         super().__init__(x, y, 6, vel_x, vel_y, owner)
         self.rotation = 0
         self.delay = delay  # Delay before becoming active
         self.gravity = 0.2
-        
-    def update(self):
-        # Wait for delay
-        if self.delay > 0:
-            self.delay -= 1
-            self.frame += 1
-            return
+    
+    @staticmethod
+    def update_all(pizzas):
+        """Advance a batch of pizza slices one frame (parabolic arc)"""
+        max_x = c.SCREEN_WIDTH + 50
+        max_y = c.SCREEN_HEIGHT + 50
+        for pizza in pizzas:
+            pizza.last_x = pizza.x
+            pizza.last_y = pizza.y
+            pizza.frame += 1
             
-        # Parabolic arc
-        self.x += self.vel_x
-        self.y += self.vel_y
-        self.vel_y += self.gravity
-        
-        # Rotation
-        self.rotation = (self.rotation + 15) % 360
-        self.frame += 1
-        
-        # Deactivate if off screen
-        if self.x < -50 or self.x > c.SCREEN_WIDTH + 50:
-            self.active = False
-        if self.y > c.SCREEN_HEIGHT + 50:
-            self.active = False
+            # Wait for delay
+            if pizza.delay > 0:
+                pizza.delay -= 1
+                continue
+            
+            # Parabolic arc
+            pizza.x += pizza.vel_x
+            pizza.y += pizza.vel_y
+            pizza.vel_y += pizza.gravity
+            
+            # Rotation
+            pizza.rotation = (pizza.rotation + 15) % 360
+            
+            # Deactivate if off screen
+            if pizza.x < -50 or pizza.x > max_x or pizza.y > max_y:
+                pizza.active = False
     
-    def draw(self, surface):
+    def draw(self, surface, interpolation=1.0):
         import drawing
         if self.delay <= 0:  # Only draw if active
-            drawing.draw_pizza_slice(surface, self.x, self.y, self.rotation)
+            x, y = self.get_render_pos(interpolation)
+            drawing.draw_pizza_slice(surface, x, y, self.rotation)
 
 
 class SineWaveFireball(Projectile):
     """Hasan's sine wave fireball"""
+    
+    SNAPSHOT_FIELDS = Projectile.SNAPSHOT_FIELDS + ('wave_index',)
+    
     def __init__(self, x, y, direction, owner):
         speed = 8
         vel_x = speed * direction
         super().__init__(x, y, 15, vel_x, 0, owner)
         self.start_y = y
-        self.distance_traveled = 0
         self.amplitude = 30
         self.wavelength = 50
-        
-    def update(self):
-        # Horizontal movement
-        self.x += self.vel_x
-        self.distance_traveled += abs(self.vel_x)
-        
-        # Vertical oscillation (sine wave)
-        self.y = self.start_y + self.amplitude * math.sin(self.distance_traveled / self.wavelength)
-        
-        self.frame += 1
-        
-        # Deactivate if off screen
-        if self.x < -50 or self.x > c.SCREEN_WIDTH + 50:
-            self.active = False
+        # Wave phase as a sine table index (advances by distance / wavelength)
+        self.wave_index = 0.0
+        self.wave_step = speed / self.wavelength * TRIG_STEPS_PER_RADIAN
     
-    def draw(self, surface):
+    @staticmethod
+    def update_all(fireballs):
+        """Advance a batch of fireballs one frame (sine wave from the lookup table)"""
+        sine = SINE_TABLE
+        mask = TRIG_TABLE_MASK
+        max_x = c.SCREEN_WIDTH + 50
+        for fireball in fireballs:
+            fireball.last_x = fireball.x
+            fireball.last_y = fireball.y
+            
+            # Horizontal movement
+            fireball.x += fireball.vel_x
+            
+            # Vertical oscillation (sine wave)
+            fireball.wave_index += fireball.wave_step
+            fireball.y = fireball.start_y + fireball.amplitude * sine[int(fireball.wave_index) & mask]
+            
+            fireball.frame += 1
+            
+            # Deactivate if off screen
+            if fireball.x < -50 or fireball.x > max_x:
+                fireball.active = False
+    
+    def draw(self, surface, interpolation=1.0):
         import drawing
-        drawing.draw_fireball(surface, self.x, self.y, self.frame)
+        x, y = self.get_render_pos(interpolation)
+        drawing.draw_fireball(surface, x, y, self.frame)
 
 
 class HomingCircuitBoard(Projectile):
     """Hammoud's homing circuit board"""
+    
+    SPEED = 4
+    SNAPSHOT_FIELDS = Projectile.SNAPSHOT_FIELDS + ('target', 'heading')
+    
     def __init__(self, x, y, direction, owner, target):
-        speed = 4
-        vel_x = speed * direction
+        vel_x = self.SPEED * direction
         super().__init__(x, y, 20, vel_x, 0, owner)
         self.target = target
         self.homing_strength = 0.05
+        # Heading as a trig table index; turn rate in table steps per frame
+        self.heading = 0 if direction > 0 else TRIG_TABLE_SIZE // 2
+        self.turn_steps = max(1, angle_to_index(self.homing_strength))
+    
+    @staticmethod
+    def update_all(boards):
+        """
+        Advance a batch of homing boards one frame
         
-    def update(self):
-        # Calculate angle to target
-        if self.target and self.target.alive:
-            dx = self.target.rect.centerx - self.x
-            dy = self.target.rect.centery - self.y
-            target_angle = math.atan2(dy, dx)
-            
-            # Current angle
-            current_angle = math.atan2(self.vel_y, self.vel_x)
-            
-            # Gradually adjust toward target
-            angle_diff = target_angle - current_angle
-            # Normalize angle difference to [-pi, pi]
-            while angle_diff > math.pi:
-                angle_diff -= 2 * math.pi
-            while angle_diff < -math.pi:
-                angle_diff += 2 * math.pi
-            
-            # Apply correction (limited turning speed)
-            correction = max(-self.homing_strength, min(self.homing_strength, angle_diff))
-            new_angle = current_angle + correction
-            
-            # Update velocity
-            speed = 4
-            self.vel_x = speed * math.cos(new_angle)
-            self.vel_y = speed * math.sin(new_angle)
-        
-        # Move
-        self.x += self.vel_x
-        self.y += self.vel_y
-        self.frame += 1
-        
-        # Deactivate if off screen
-        if self.x < -50 or self.x > c.SCREEN_WIDTH + 50:
-            self.active = False
-        if self.y < -50 or self.y > c.SCREEN_HEIGHT + 50:
-            self.active = False
+        Steering uses the cross/dot products of velocity and the direction to
+        the target instead of atan2: turn by the limited rate toward the side
+        the target is on, unless already within half a turn step of it.
+        """
+        sine = SINE_TABLE
+        cosine = COSINE_TABLE
+        mask = TRIG_TABLE_MASK
+        half_turn = TRIG_TABLE_SIZE // 2
+        max_x = c.SCREEN_WIDTH + 50
+        max_y = c.SCREEN_HEIGHT + 50
+        for board in boards:
+            target = board.target
+            if target and target.alive:
+                dx = target.rect.centerx - board.x
+                dy = target.rect.centery - board.y
+                cross = board.vel_x * dy - board.vel_y * dx
+                dot = board.vel_x * dx + board.vel_y * dy
+                
+                # Within half a step of the target direction: hold course
+                half_step_sin = sine[board.turn_steps // 2]
+                speed_sq = board.vel_x * board.vel_x + board.vel_y * board.vel_y
+                aligned = dot > 0 and cross * cross <= half_step_sin * half_step_sin * speed_sq * (dx * dx + dy * dy)
+                if not aligned:
+                    if cross > 0 or (cross == 0 and dot < 0):
+                        board.heading = (board.heading + board.turn_steps) & mask
+                    else:
+                        board.heading = (board.heading - board.turn_steps) & mask
+                
+                # Update velocity
+                board.vel_x = HomingCircuitBoard.SPEED * cosine[board.heading]
+                board.vel_y = HomingCircuitBoard.SPEED * sine[board.heading]
+            
+            # Move
+            board.last_x = board.x
+            board.last_y = board.y
+            board.x += board.vel_x
+            board.y += board.vel_y
+            board.frame += 1
+            
+            # Deactivate if off screen
+            if board.x < -50 or board.x > max_x or board.y < -50 or board.y > max_y:
+                board.active = False
+        
+    def reflect(self, new_owner):
+        """Turn around and home in on the original owner"""
+        self.heading = (TRIG_TABLE_SIZE // 2 - self.heading) & TRIG_TABLE_MASK
+        self.vel_x = -self.vel_x
+        self.target = self.owner
+        self.owner = new_owner
     
-    def draw(self, surface):
+    def draw(self, surface, interpolation=1.0):
         import drawing
-        drawing.draw_circuit_board(surface, self.x, self.y, self.frame)
+        x, y = self.get_render_pos(interpolation)
+        drawing.draw_circuit_board(surface, x, y, self.frame)
 
 
 class SpinningKickEffect:
     """Visual effect for Khalid's spinning kick"""
+    
+    # Mutable state captured by snapshot.save_state
+    SNAPSHOT_FIELDS = ('frame', 'active', 'hits_dealt', 'hit_cooldown')
+    
     def __init__(self, fighter, duration=60):
         self.fighter = fighter
         self.duration = duration
@@ -186,6 +310,8 @@ class SpinningKickEffect:
         self.start_x = fighter.rect.x
         self.hits_dealt = 0
         self.hit_cooldown = 0
+        self.hit_rect = fighter.rect.inflate(60, 60)
+        self.collider = Collider(self.hit_rect, 'spinning_kick', fighter, self)
         
     def update(self):
         self.frame += 1
@@ -195,10 +321,10 @@ class SpinningKickEffect:
         if self.hit_cooldown > 0:
             self.hit_cooldown -= 1
         
-        # Move fighter forward
+        # Move fighter forward (stops at the opponent instead of passing through)
         direction = 1 if self.fighter.facing_right else -1
         move_per_frame = 150 / 60  # Total movement / duration
-        self.fighter.rect.x += move_per_frame * direction
+        self.fighter.rect.x += self.fighter.limit_to_opponent(move_per_frame * direction)
     
     def get_rotation_angle(self):
         """Get current rotation angle for visual"""
@@ -210,6 +336,12 @@ class SpinningKickEffect:
         """Check if can deal another hit"""
         return self.hits_dealt < 3 and self.hit_cooldown <= 0
     
+    def update_collider(self):
+        """Sync broadphase collider with the spinning fighter (30px reach all round)"""
+        rect = self.fighter.rect
+        self.hit_rect.update(rect.x - 30, rect.y - 30, rect.width + 60, rect.height + 60)
+        return self.collider
+    
     def register_hit(self):
         """Register that a hit was dealt"""
         self.hits_dealt += 1
@@ -278,15 +410,31 @@ class Attack:
         self.stun = stun 
 
 class Fighter:
-    def __init__(self, x, y, stats, controls, is_p2=False, combat_system=None, fighter_id=None, joy_input_getter=None):
+    # Mutable per-frame state captured by snapshot.save_state (rect, input
+    # history and motion recognizer are saved separately)
+    SNAPSHOT_FIELDS = (
+        'prev_x', 'prev_y', 'vel_y', 'health', 'jumping', 'facing_right', 'alive', 'was_on_ground',
+        'attacking', 'attack_type', 'attack_cooldown', 'hit_stun', 'last_attack_time', 'attack_frame',
+        'attack_hit', 'color_flash', 'animation_state', 'animation_frame',
+        'special_move_cooldown', 'last_special_time',
+        'dashing', 'dash_timer', 'dash_cooldown', 'last_dash_time',
+        'parrying', 'parry_window', 'parry_success', 'parry_cooldown',
+        'blocking', 'is_blocking', 'block_start_time', 'block_usage_count',
+        'block_damage_reduction', 'block_stun', 'super_meter', 'ultimate_active',
+        'input_bits', 'opponent', 'sweep_start_x', 'sweep_start_y',
+    )
+    
+    def __init__(self, x, y, stats, controls, is_p2=False, combat_system=None, fighter_id=None, joy_bits_getter=None,
+                 clock=None):
         self.rect = pygame.Rect(x, y, c.P_WIDTH, c.P_HEIGHT)
         self.stats = stats
         self.color = stats['color']
-        self.controls = controls 
+        self.controls = controls  # inputs.ControlMap
         self.is_p2 = is_p2
         self.combat_system = combat_system  # Reference to combat system for combo tracking
         self.fighter_id = fighter_id  # "p1" or "p2" for combo tracking
-        self.joy_input_getter = joy_input_getter  # Function to get joystick input state
+        self.joy_bits_getter = joy_bits_getter  # Function(joystick_id) -> held action bits
+        self.clock = clock if clock is not None else pygame.time  # Time source (anything with get_ticks())
         
         # Physics from stats
         self.speed = stats['speed']
@@ -296,6 +444,8 @@ class Fighter:
         self.dmg_mult = stats['dmg_mult']
         
         # Movement State
+        self.prev_x = x  # Position at start of the current simulation step
+        self.prev_y = y
         self.vel_y = 0
         self.jumping = False
         self.facing_right = not is_p2
@@ -308,8 +458,9 @@ class Fighter:
         self.attack_cooldown = 0
         self.hit_stun = 0
         self.last_attack_time = 0
-        self.attack_start_frame = 0
+        self.attack_frame = 0  # Frames since current attack started
         self.attack_rect = None
+        self.attack_hit = False  # Current attack already connected
         self.color_flash = 0
         self.animation_state = 'idle'
         self.animation_frame = 0
@@ -341,9 +492,13 @@ class Fighter:
         self.super_meter = 0
         self.ultimate_active = False
         
-        # Input Buffer for motion inputs
-        self.input_buffer = []  # Rolling buffer of (direction, timestamp) tuples
-        self.last_direction = None  # Track current direction for motion detection
+        # Input history (per-frame ring buffer) and motion input recognizer
+        self.input_history = InputHistory()
+        self.motion_recognizer = MotionRecognizer()
+        self.input_bits = 0  # Actions held this frame (sampled once per frame)
+        self.input_source = None  # Callable returning input bits; replaces live input (replays)
+        self.latched_bits = 0  # Actions pressed since the last poll, even if already released
+        self.attack_buffer = AttackBuffer(self.input_history)
         
         # Attack history for combos
         self.attack_history = []
@@ -358,21 +513,88 @@ class Fighter:
             'special': Attack('Special', 20 * base_mult, 2000, 120, 60, 25, 30),
             'ultimate': Attack('Ultimate', c.ULTIMATE_DAMAGE * c.GLOBAL_DAMAGE_MULT, 5000, 200, 100, 50, 40)
         }
+        
+        # Per-frame hitbox sizes for melee moves (special/ultimate spawn effects instead)
+        self.hitbox_timelines = {
+            key: build_hitbox_timeline(key, move.width, move.height)
+            for key, move in self.moves.items()
+            if key not in ('special', 'ultimate')
+        }
+        self.hurtbox = self.rect.copy()
+        self.hurt_collider = Collider(self.rect.copy(), 'hurtbox', self, self)
+        self.pushbox = self.rect.copy()
+        
+        # Swept movement: opponent to collide with, position at start of frame
+        self.opponent = None
+        self.sweep_start_x = x
+        self.sweep_start_y = y
 
+    def store_render_position(self):
+        """Remember current position before a simulation step (for interpolation)"""
+        self.prev_x = self.rect.x
+        self.prev_y = self.rect.y
+    
+    def get_render_rect(self, interpolation=1.0):
+        """Get fighter rect interpolated between the last two simulation steps"""
+        if interpolation >= 1.0:
+            return self.rect
+        dx = self.rect.x - self.prev_x
+        dy = self.rect.y - self.prev_y
+        if abs(dx) > c.INTERPOLATION_SNAP_DISTANCE or abs(dy) > c.INTERPOLATION_SNAP_DISTANCE:
+            return self.rect
+        return pygame.Rect(round(lerp(self.prev_x, self.rect.x, interpolation)),
+                           round(lerp(self.prev_y, self.rect.y, interpolation)),
+                           self.rect.width, self.rect.height)
+    
+    def store_sweep_start(self):
+        """Remember position at the start of a simulation frame (swept collision)"""
+        self.sweep_start_x = self.rect.x
+        self.sweep_start_y = self.rect.y
+    
+    def limit_to_opponent(self, dx):
+        """
+        Shorten a horizontal displacement so it stops at the opponent's body
+        
+        Used for fast moves (dash, knockback, pushblock, spinning kick) so
+        they can't tunnel through the other fighter.
+        """
+        if self.opponent is None:
+            return dx
+        return sweep_x(self.rect, dx, self.opponent.rect)
+    
+    def get_pushbox(self):
+        """
+        Get the body box used to keep fighters apart
+        
+        Returns:
+            Rect (reused between calls)
+        """
+        inset = c.PUSHBOX_INSET
+        self.pushbox.update(self.rect.x + inset, self.rect.y, self.rect.width - 2 * inset, self.rect.height)
+        return self.pushbox
+    
+    def update_hurt_collider(self):
+        """
+        Sync broadphase collider: this frame's hurtbox swept back to where
+        the fighter started the frame
+        """
+        hurtbox = self.get_hurtbox()
+        rect = self.hurt_collider.rect
+        rect.update(hurtbox)
+        rect.union_ip(hurtbox.move(self.sweep_start_x - self.rect.x, self.sweep_start_y - self.rect.y))
+        return self.hurt_collider
+    
     def can_move(self):
         """Determine if fighter can move based on current state"""
         if not self.attacking:
             return True
         
         # Check frame data
-        current_time = pygame.time.get_ticks()
-        frames_elapsed = (current_time - self.attack_start_frame) / (1000 / 60)  # Convert to frames
-        
-        return FrameData.can_move_during_attack(self.attack_type, frames_elapsed)
+        return FrameData.can_move_during_attack(self.attack_type, self.attack_frame)
     
     def is_action_pressed(self, action):
         """
-        Check if an action is currently pressed via keyboard or joystick.
+        Check if an action is held this frame (from the per-frame sample).
         
         Args:
             action: Action name ('left', 'right', 'jump', 'light_punch', etc.)
@@ -380,26 +602,51 @@ class Fighter:
         Returns:
             True if the action is currently triggered
         """
-        # Check keyboard
-        key = pygame.key.get_pressed()
-        if action in self.controls and key[self.controls[action]]:
-            return True
+        return bool(self.input_bits & ACTION_BITS[action])
+    
+    def sample_input(self):
+        """Read all actions once and store them as this frame's bitmask"""
+        if self.input_source is not None:
+            self.input_bits = self.input_source()
+        else:
+            self.input_bits = self.poll_input()
+    
+    def poll_input(self):
+        """
+        Read the live keyboard / joystick state
         
-        # Check joystick via the getter function
-        if self.joy_input_getter:
-            joystick_id = 1 if self.is_p2 else 0
-            result = self.joy_input_getter(action, joystick_id)
-            if result:
-                # Debug: log when movement actions are detected
-                if action in ['left', 'right', 'jump', 'down']:
-                    print(f"[P{2 if self.is_p2 else 1}] {action} pressed via joystick")
-                return True
+        Presses latched since the last poll are included, so a tap that is
+        released before the next frame is still seen for one frame.
         
-        return False
+        Returns:
+            Bitmask of held actions (see inputs.ACTION_BITS)
+        """
+        bits = self.latched_bits | self.controls.keyboard_bits(pygame.key.get_pressed())
+        self.latched_bits = 0
+        if self.joy_bits_getter:
+            bits |= self.joy_bits_getter(1 if self.is_p2 else 0)
+        return bits
+    
+    def latch_key(self, key):
+        """Latch the actions bound to a pressed key until the next poll"""
+        self.latched_bits |= self.controls.key_bits.get(key, 0)
+    
+    def latch_joystick(self):
+        """Latch the actions held on this fighter's joystick until the next poll"""
+        if self.joy_bits_getter:
+            self.latched_bits |= self.joy_bits_getter(1 if self.is_p2 else 0)
     
     def move(self, target, width, height):
         dx = 0
         dy = 0
+        self.opponent = target
+        
+        # Sample input once per frame for motion detection and attack buffering
+        # (recorded during stun too, so motions and attacks can be buffered)
+        self.sample_input()
+        current_direction = self._get_current_direction(target)
+        input_frame = self.input_history.record(current_direction, self.input_bits)
+        self.motion_recognizer.feed(current_direction, input_frame)
         
         # Hit Stun / Gravity
         if self.hit_stun > 0:
@@ -429,7 +676,7 @@ class Fighter:
             return
 
         # Dash handling - now works in mid-air too
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if self.is_action_pressed('dash') and not self.dashing and current_time - self.last_dash_time > 500:
             self.dashing = True
             self.dash_timer = c.FRAME_DATA['dash']['active']  # 8 frames
@@ -447,15 +694,6 @@ class Fighter:
                 dash_speed = self.speed * 2.5
                 dx = dash_speed if self.facing_right else -dash_speed
 
-        # Record directional input for motion detection
-        current_direction = self._get_current_direction(target)
-        if current_direction and current_direction != self.last_direction:
-            self.input_buffer.append((current_direction, current_time))
-            self.last_direction = current_direction
-            # Keep buffer limited
-            if len(self.input_buffer) > c.INPUT_BUFFER_FRAMES:
-                self.input_buffer.pop(0)
-
         # Input Handling - can move during light attacks (but not during dash)
         if self.can_move() and not self.dashing:
             if self.is_action_pressed('left'):
@@ -498,7 +736,7 @@ class Fighter:
         self.is_blocking = (is_holding_back or is_holding_down) and not self.jumping and not self.attacking
         
         # Block handling (hold back or down to block)
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if self.is_blocking:
             if not self.blocking:
                 # Starting a new block
@@ -530,7 +768,7 @@ class Fighter:
                 self.parrying = False
 
         # Attacks - can't attack while blocking
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if not self.attacking and not self.blocking and current_time - self.last_attack_time > self.attack_cooldown:
             attack_key = None
             
@@ -548,7 +786,7 @@ class Fighter:
                     # Activate parry
                     self.activate_parry()
                 # Check for hadouken-style motion input + punch = special
-                elif self._check_motion_input('quarter_circle_forward') and (self.is_action_pressed('light_punch') or self.is_action_pressed('heavy_punch')):
+                elif (self.is_action_pressed('light_punch') or self.is_action_pressed('heavy_punch')) and self._check_motion_input('quarter_circle_forward'):
                     attack_key = 'special'
                 elif self.is_action_pressed('special'): 
                     attack_key = 'special'
@@ -560,12 +798,19 @@ class Fighter:
                     attack_key = 'light_kick'
                 elif self.is_action_pressed('light_punch'): 
                     attack_key = 'light_punch'
+                else:
+                    # Attack pressed during recovery, fired on first actionable frame
+                    attack_key = self.attack_buffer.get_buffered_attack()
 
             if attack_key:
                 return_val = self.attack(target, attack_key)
                 if return_val is not None:  # Special move returned projectile
                     return return_val
 
+        # Dashes are fast enough to pass through the opponent - sweep them
+        if self.dashing:
+            dx = self.limit_to_opponent(dx)
+        
         self.rect.x += dx
         self.rect.y += dy
         return None
@@ -577,10 +822,12 @@ class Fighter:
             return None
             
         self.attack_type = type_key
-        self.last_attack_time = pygame.time.get_ticks()
-        self.attack_start_frame = self.last_attack_time
+        self.last_attack_time = self.clock.get_ticks()
+        self.attack_frame = 0
+        self.attack_hit = False
         self.attack_cooldown = move_data.cooldown
         self.animation_state = type_key
+        self.attack_buffer.clear_buffer()
         
         # Add to attack history for combos
         self.attack_history.append(type_key)
@@ -599,7 +846,7 @@ class Fighter:
         
         # Handle special moves separately
         if type_key == 'special':
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.get_ticks()
             if current_time - self.last_special_time >= 4000:
                 self.last_special_time = current_time
                 return self.execute_special_move(target)
@@ -607,28 +854,51 @@ class Fighter:
                 self.attacking = False
                 return None
         
-        # Regular attacks
-        hitbox_x = self.rect.right if self.facing_right else self.rect.left - move_data.width
-        # Center hitbox vertically on character (was +10, now centered)
-        hitbox_y = self.rect.y + (self.rect.height - move_data.height) // 2
+        # Regular attacks - hits are checked each active frame by the fight's
+        # hit resolution stage (see update_hitbox / CombatSystem.resolve_hits)
+        self.update_hitbox()
+        return None
+    
+    def update_hitbox(self):
+        """Place attack_rect for the current attack frame from the move's hitbox timeline"""
+        timeline = self.hitbox_timelines.get(self.attack_type) if self.attacking else None
+        if not timeline:
+            self.attack_rect = None
+            return
         
-        self.attack_rect = pygame.Rect(hitbox_x, hitbox_y, move_data.width, move_data.height)
+        width, height = timeline[min(self.attack_frame, len(timeline) - 1)]
+        hitbox_x = self.rect.right if self.facing_right else self.rect.left - width
+        # Center hitbox vertically on character
+        hitbox_y = self.rect.y + (self.rect.height - height) // 2
+        if self.attack_rect is None:
+            self.attack_rect = pygame.Rect(hitbox_x, hitbox_y, width, height)
+        else:
+            self.attack_rect.update(hitbox_x, hitbox_y, width, height)
+    
+    def is_hitbox_active(self):
+        """Check if the current attack can hit this frame (active and not yet connected)"""
+        return (
+            self.attacking
+            and not self.attack_hit
+            and self.attack_rect is not None
+            and FrameData.is_in_active_frames(self.attack_type, self.attack_frame)
+        )
+    
+    def get_hurtbox(self):
+        """
+        Get the area this fighter can be hit in for its current animation state
         
-        if self.attack_rect.colliderect(target.rect):
-            # Apply combo damage scaling if combat system is available
-            damage = move_data.damage
-            if self.combat_system and self.fighter_id:
-                # Record the hit for combo tracking
-                combo_info = self.combat_system.record_hit(self.fighter_id, damage, self.attack_type)
-                # Apply combo damage multiplier
-                damage *= combo_info['multiplier']
-            
-            # Gain super meter on hit
-            self.gain_super_meter(c.SUPER_GAIN_ON_HIT)
-            
-            target.take_damage(damage, move_data.knockback, move_data.stun, self.facing_right)
-            return True 
-        return False
+        Returns:
+            Rect (reused between calls)
+        """
+        state = self.animation_state
+        if self.jumping and state == 'idle':
+            state = 'jump'
+        front, top, back, bottom = c.HURTBOXES.get(state, c.HURTBOXES['idle'])
+        left, right = (back, front) if self.facing_right else (front, back)
+        self.hurtbox.update(self.rect.x + left, self.rect.y + top,
+                            self.rect.width - left - right, self.rect.height - top - bottom)
+        return self.hurtbox
     
     def execute_ultimate_move(self, target):
         """Execute character-specific ultimate move (full super meter)"""
@@ -727,7 +997,7 @@ class Fighter:
             
             # Pushblock: push defender back
             direction = 1 if attacker_facing_right else -1
-            self.rect.x += c.PUSHBLOCK_DISTANCE * direction
+            self.rect.x += self.limit_to_opponent(c.PUSHBLOCK_DISTANCE * direction)
             
             # Keep on screen
             if self.rect.left < 0:
@@ -741,15 +1011,6 @@ class Fighter:
             self.color_flash = 3  # Brief flash
             return True  # Return True to indicate block
         
-        # Check if parrying (within parry window)
-        if self.parrying and self.parry_window > 0:
-            # Successful parry! No damage taken
-            self.parry_success = True
-            self.color_flash = 10  # Longer flash for parry
-            # Gain extra super meter on successful parry
-            self.gain_super_meter(c.SUPER_GAIN_ON_HIT)
-            return True  # Return True to indicate parry success
-        
         self.health -= amount
         self.hit_stun = stun
         self.attacking = False 
@@ -765,7 +1026,7 @@ class Fighter:
             self.combat_system.reset_combo(self.fighter_id)
         
         direction = 1 if attacker_facing_right else -1
-        self.rect.x += knockback * direction * 2 
+        self.rect.x += self.limit_to_opponent(knockback * direction * 2)
         
         if self.health <= 0:
             self.health = 0
@@ -779,6 +1040,7 @@ class Fighter:
     
     def _get_current_direction(self, target):
         """Get current directional input for motion input detection"""
+        holding_up = self.is_action_pressed('jump')
         holding_down = self.is_action_pressed('down')
         holding_left = self.is_action_pressed('left')
         holding_right = self.is_action_pressed('right')
@@ -798,41 +1060,27 @@ class Fighter:
             return 'down_back'
         elif holding_down:
             return 'down'
+        elif holding_up and holding_forward:
+            return 'up_forward'
+        elif holding_up and holding_back:
+            return 'up_back'
+        elif holding_up:
+            return 'up'
         elif holding_forward:
             return 'forward'
         elif holding_back:
             return 'back'
         
-        return None
+        return 'neutral'
     
     def _check_motion_input(self, motion_name):
-        """Check if a motion input pattern was completed recently"""
-        if motion_name not in c.MOTION_INPUTS:
-            return False
-        
-        pattern = c.MOTION_INPUTS[motion_name]
-        current_time = pygame.time.get_ticks()
-        
-        # Filter buffer to recent inputs only
-        recent_inputs = [
-            (direction, timestamp) for direction, timestamp in self.input_buffer
-            if current_time - timestamp < c.MOTION_INPUT_WINDOW * (1000 / 60)  # Convert frames to ms
-        ]
-        
-        if len(recent_inputs) < len(pattern):
+        """Check if a motion input pattern was completed recently (consumes it)"""
+        if not self.motion_recognizer.check(motion_name, self.input_history.frame):
             return False
         
-        # Check if the pattern matches (in order, allowing gaps)
-        pattern_idx = 0
-        for direction, _ in recent_inputs:
-            if direction == pattern[pattern_idx]:
-                pattern_idx += 1
-                if pattern_idx >= len(pattern):
-                    # Clear the buffer after successful motion
-                    self.input_buffer = []
-                    return True
-        
-        return False
+        # Clear the motion after a successful check
+        self.motion_recognizer.consume(motion_name)
+        return True
     
     def activate_parry(self):
         """Activate parry with 6-frame window
@@ -853,14 +1101,13 @@ class Fighter:
     def update(self):
         if self.attacking:
             # Use frame data for attack duration
-            current_time = pygame.time.get_ticks()
-            frames_elapsed = (current_time - self.attack_start_frame) / (1000 / 60)
-            
             duration = FrameData.get_attack_duration(self.attack_type)
-            if frames_elapsed >= duration:
+            if self.attack_frame >= duration:
                 self.attacking = False
                 self.attack_rect = None
                 self.animation_state = 'idle'
+            else:
+                self.attack_frame += 1
 
         if self.color_flash > 0:
             self.color_flash -= 1
@@ -871,46 +1118,65 @@ class Fighter:
         
         self.animation_frame += 1
 
-    def draw(self, surface):
+    def draw(self, surface, shield_alpha=True, interpolation=1.0):
+        """
+        Draw fighter with shadow, dash particles and block/parry shields
+        
+        Args:
+            surface: Pygame surface to draw on
+            shield_alpha: Draw translucent shields (False draws outlines only)
+            interpolation: Fraction of a simulation step to interpolate position by
+        """
+        rect = self.get_render_rect(interpolation)
+        
         # Shadow
-        pygame.draw.ellipse(surface, (20,20,20), (self.rect.centerx - 25, c.FLOOR_Y - 10, 50, 20))
+        pygame.draw.ellipse(surface, (20,20,20), (rect.centerx - 25, c.FLOOR_Y - 10, 50, 20))
         
         # Draw dash particles if dashing
         if self.dashing:
-            drawing.draw_dash_particles(surface, self.rect.centerx, self.rect.centery, 
+            drawing.draw_dash_particles(surface, rect.centerx, rect.centery, 
                                        self.facing_right, self.animation_frame)
         
         # Draw character based on professor type
         char_name = self.stats.get('name', '')
         
         if 'KHALID' in char_name:
-            drawing.draw_khalid(surface, self.rect.centerx, self.rect.bottom, 
+            drawing.draw_khalid(surface, rect.centerx, rect.bottom, 
                               self.facing_right, self.animation_state, self.animation_frame)
         elif 'EDUARDO' in char_name:
-            drawing.draw_eduardo(surface, self.rect.centerx, self.rect.bottom, 
+            drawing.draw_eduardo(surface, rect.centerx, rect.bottom, 
                                self.facing_right, self.animation_state, self.animation_frame)
         elif 'HASAN' in char_name:
-            drawing.draw_hasan(surface, self.rect.centerx, self.rect.bottom, 
+            drawing.draw_hasan(surface, rect.centerx, rect.bottom, 
                              self.facing_right, self.animation_state, self.animation_frame)
         elif 'HAMMOUD' in char_name:
-            drawing.draw_hammoud(surface, self.rect.centerx, self.rect.bottom, 
+            drawing.draw_hammoud(surface, rect.centerx, rect.bottom, 
                                 self.facing_right, self.animation_state, self.animation_frame)
         else:
             # Fallback to simple rectangle
             color = c.WHITE if self.color_flash > 0 else self.color
-            pygame.draw.rect(surface, color, self.rect)
-            eye_x = self.rect.right - 15 if self.facing_right else self.rect.left + 5
-            pygame.draw.rect(surface, c.BLACK, (eye_x, self.rect.y + 15, 10, 5))
+            pygame.draw.rect(surface, color, rect)
+            eye_x = rect.right - 15 if self.facing_right else rect.left + 5
+            pygame.draw.rect(surface, c.BLACK, (eye_x, rect.y + 15, 10, 5))
         
         # Draw transparent shield when blocking
-        if self.blocking:
+        if self.blocking and not shield_alpha:
+            # Reduced quality: outline only, no per-frame alpha surface
+            shield_rect = rect.inflate(40, 40)
+            pygame.draw.ellipse(surface, (150, 200, 255), shield_rect, 3)
+        
+        elif self.parrying and self.parry_window > 0 and not shield_alpha:
+            parry_rect = rect.inflate(30, 30)
+            pygame.draw.ellipse(surface, (255, 255, 100), parry_rect, 4)
+        
+        elif self.blocking:
             # Calculate pulsing alpha (optimized - avoid creating surface every frame)
             pulse = math.sin(self.animation_frame * 0.3)
             alpha = int(80 + 40 * pulse)
             
             # Create temporary surface for transparency
-            shield_w = self.rect.width + 40
-            shield_h = self.rect.height + 40
+            shield_w = rect.width + 40
+            shield_h = rect.height + 40
             shield_surface = pygame.Surface((shield_w, shield_h), pygame.SRCALPHA)
             shield_color = (100, 150, 255, alpha)  # Light blue with transparency
             
@@ -919,7 +1185,7 @@ class Fighter:
             # Add border
             pygame.draw.ellipse(shield_surface, (150, 200, 255, 200), (0, 0, shield_w, shield_h), 3)
             
-            surface.blit(shield_surface, (self.rect.x - 20, self.rect.y - 20))
+            surface.blit(shield_surface, (rect.x - 20, rect.y - 20))
         
         # Draw parry indicator when parrying (takes priority over blocking)
         elif self.parrying and self.parry_window > 0:
@@ -928,8 +1194,8 @@ class Fighter:
             alpha = int(150 + 105 * pulse)
             
             # Create temporary surface for transparency
-            parry_w = self.rect.width + 30
-            parry_h = self.rect.height + 30
+            parry_w = rect.width + 30
+            parry_h = rect.height + 30
             parry_surface = pygame.Surface((parry_w, parry_h), pygame.SRCALPHA)
             parry_color = (255, 255, 0, alpha)  # Yellow with transparency
             
@@ -938,11 +1204,12 @@ class Fighter:
             # Add bright border
             pygame.draw.ellipse(parry_surface, (255, 255, 100, 255), (0, 0, parry_w, parry_h), 4)
             
-            surface.blit(parry_surface, (self.rect.x - 15, self.rect.y - 15))
+            surface.blit(parry_surface, (rect.x - 15, rect.y - 15))
         
-        # Hitbox Debug View (optional)
+        # Hitbox Debug View (optional) - colored by frame data phase
         if self.attacking and self.attack_rect:
+            phase = FrameData.get_phase(self.attack_type, self.attack_frame)
             s = pygame.Surface((self.attack_rect.width, self.attack_rect.height))
             s.set_alpha(100)
-            s.fill(c.RED)
+            s.fill(c.FRAME_PHASE_COLORS[phase])
             surface.blit(s, (self.attack_rect.x, self.attack_rect.y))
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Combat event queue.
+
+The fight simulation emits combat events (hits, blocks, parries, reflects,
+KOs) instead of spawning visual effects itself. The renderer drains the
+queue and decides what to draw; a headless run turns recording off so
+events are only counted and nothing is allocated per event.
+"""
+
+# Event types emitted by the simulation
+EVENT_TYPES = ('hit', 'block', 'parry', 'projectile_reflect', 'projectile_clash', 'ko')
+
+
+class CombatEvent:
+    """One combat event"""
+
+    __slots__ = ('type', 'source', 'attack_type', 'attacker', 'target', 'frame', 'position')
+
+    def __init__(self, event_type, source, attack_type, attacker, target, frame, position=None):
+        """
+        Args:
+            event_type: One of EVENT_TYPES
+            source: 'melee', 'projectile' or 'spinning_kick'
+            attack_type: Attack name
+            attacker: Fighter credited with the attack
+            target: Fighter on the receiving end
+            frame: Simulation frame the event happened on
+            position: (x, y) of the event when it isn't on the target
+                (projectile clashes)
+        """
+        self.type = event_type
+        self.source = source
+        self.attack_type = attack_type
+        self.attacker = attacker
+        self.target = target
+        self.frame = frame
+        self.position = position
+
+
+class CombatEventQueue:
+    """
+    Per-frame combat event queue with running counts per event type.
+
+    Counts cover the current match (Game clears the queue when a fight
+    starts) and travel with match snapshots, so speculative run-ahead steps
+    and rolled-back steps are not counted.
+    """
+
+    def __init__(self, record=True):
+        """
+        Initialize queue
+
+        Args:
+            record: Keep events for a consumer; False only counts them
+                (headless / batch simulation)
+        """
+        self.record = record
+        self.events = []
+        self.counts = dict.fromkeys(EVENT_TYPES, 0)
+
+    def emit(self, event_type, source, attack_type, attacker, target, frame=0, position=None):
+        """Queue an event (or just count it when not recording)"""
+        self.counts[event_type] += 1
+        if self.record:
+            self.events.append(CombatEvent(event_type, source, attack_type, attacker, target, frame, position))
+
+    def drain(self):
+        """
+        Take all queued events
+
+        Returns:
+            List of CombatEvent in emission order
+        """
+        if not self.events:
+            return ()
+        events = self.events
+        self.events = []
+        return events
+
+    def clear(self):
+        """Drop queued events and reset counts"""
+        self.events = []
+        for event_type in self.counts:
+            self.counts[event_type] = 0
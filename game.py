@@ -21,13 +21,25 @@ Date: 2026
 
 from pygame_compat import pygame
 import sys
-import random
 import os
+import time
 import config as c
 from entities import Fighter, Particle, SpinningKickEffect, HitEffect, Projectile
-from ui_components import (Button, VintageTextRenderer, ArcadeFrame, ScanlineEffect,
+from ui_components import (Button, VintageTextRenderer, ArcadeOverlay,
                            GradientBackground, draw_panel, draw_health_bar)
-from combat import CombatSystem
+from combat import CombatSystem, Hit, SpecialMoveData
+from collision import SweepAndPrune, resolve_pushboxes
+from projectiles import ProjectileSystem
+from quality import QualityGovernor
+from rng import RandomStreams
+from replay import ReplayRecorder
+import snapshot
+from netplay import RollbackSession
+from runahead import RunAhead
+from latency import LatencyProbe
+from inputpoll import InputPoller
+from inputs import ControlMap
+from timing import FixedTimestep, SimulationClock
 import drawing
 import joystick
 
@@ -50,14 +62,25 @@ class Game:
             pygame.mixer.init()
         
         # Display setup - fullscreen scaled for authentic arcade feel
-        self.screen = pygame.display.set_mode(
-            (c.SCREEN_WIDTH, c.SCREEN_HEIGHT),
-            pygame.SCALED | pygame.FULLSCREEN
-        )
+        display_flags = pygame.SCALED | pygame.FULLSCREEN
+        try:
+            self.screen = pygame.display.set_mode(
+                (c.SCREEN_WIDTH, c.SCREEN_HEIGHT),
+                display_flags,
+                vsync=1 if c.VSYNC else 0
+            )
+        except (TypeError, pygame.error):
+            # Older pygame builds (arcade box) don't accept vsync
+            self.screen = pygame.display.set_mode(
+                (c.SCREEN_WIDTH, c.SCREEN_HEIGHT),
+                display_flags
+            )
         pygame.display.set_caption("CMUQ Arena - Vintage Arcade Fighter")
         
         # Core game components
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep()  # Simulation runs at exactly c.FPS
+        self.pending_click = False  # Mouse click waiting for the next simulation step
         self.text_renderer = VintageTextRenderer()
         
         # Initialize joystick/arcade box support
@@ -69,7 +92,13 @@ class Game:
             on_digital_axis=self._on_digital_joy_axis
         )
         
-        # Track joystick input state for fighters
+        # Per-player bindings compiled to action bitmask tables (inputs.ControlMap.remap to rebind)
+        self.control_maps = (
+            ControlMap(c.DEFAULT_P1_CONTROLS, c.ARCADE_P1_BUTTONS, c.ARCADE_P1_AXIS),
+            ControlMap(c.DEFAULT_P2_CONTROLS, c.ARCADE_P2_BUTTONS, c.ARCADE_P2_AXIS),
+        )
+        
+        # Track joystick input state for fighters (keyed by player slot, see joystick.py)
         self.joy_input_state = {
             0: {'buttons': set(), 'axis': set()},  # Player 1 joystick
             1: {'buttons': set(), 'axis': set()},  # Player 2 joystick
@@ -85,21 +114,17 @@ class Game:
         self.music_loop_point = 180000  # Loop from 3 minutes (180 seconds) in milliseconds
         
         # Visual effects
-        self.scanlines = ScanlineEffect(c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
+        self.overlay = ArcadeOverlay(c.SCREEN_WIDTH, c.SCREEN_HEIGHT)  # Cabinet frame (+ scanlines if config.SCANLINES)
+        self.quality = QualityGovernor()  # Drops eye candy when frames run over budget
         self.screen_shake = 0
         self.screen_shake_offset = (0, 0)
         self.hit_effects = []  # Comic book hit effects
         self.ko_slowdown = False
         self.slowdown_timer = 0
         
-        # Hit freeze effect (brief pause on heavy hits for impact)
-        self.hit_freeze_frames = 0
-        
         # Counter attack window (frames after successful parry where attacks do bonus damage)
         self.counter_attack_window = {'p1': 0, 'p2': 0}
-        
-        # Set random seed for consistent ground texture
-        random.seed(42)
+        self.broadphase = SweepAndPrune()  # Projectile / effect collision broadphase
         
         # Game state management
         self.state = "MAIN_MENU"  # Current game state
@@ -161,9 +186,20 @@ class Game:
         self.round_timer = 99
         self.last_timer_update = 0
         self.particles = []
-        self.projectiles = []
+        self.projectiles = ProjectileSystem()
         self.special_effects = []
-        self.combat_system = CombatSystem()  # Combat system for tracking combos
+        # Simulation time source - hit-stop, slow motion and pause scale it
+        self.sim_clock = SimulationClock()
+        # Seeded per-subsystem random streams (gameplay vs render)
+        self.rng = RandomStreams(c.RNG_SEED)
+        self.floor_spots = self._build_floor_spots()
+        self.replay_recorder = None  # Records the current match when RECORD_REPLAYS is on
+        self.netplay = None  # netplay.RollbackSession while a network match runs
+        self.run_ahead = RunAhead()  # Draw the fight a few steps ahead (off when frames == 0)
+        self.headless = False  # Set for run-ahead / rollback steps: skip cosmetic updates
+        self.latency_probe = LatencyProbe() if c.MEASURE_LATENCY else None  # Input-to-display timing
+        self.input_poller = InputPoller() if c.INPUT_POLLING else None  # Polls input while waiting to flip
+        self.combat_system = CombatSystem(clock=self.sim_clock)  # Combat system for tracking combos
         self.winner_sequence_active = False
         self.winner_sequence_frame = 0
         
@@ -184,47 +220,46 @@ class Game:
     # ==================== GAME LOOP ====================
     
     def run(self):
-        """Main game loop - handles events, updates, and rendering"""
+        """
+        Main game loop - handles events, updates, and rendering
+        
+        The simulation runs in fixed steps of 1/c.FPS seconds (with catch-up
+        steps after a slow frame, capped at c.MAX_CATCHUP_STEPS) while
+        rendering runs at display rate, interpolating fighter and projectile
+        positions between the last two simulation steps.
+        """
         # Start playing music at game start
         self._play_music()
+        self.timestep.reset()
         
         while self.running:
-            # Limit to 60 FPS for consistent gameplay
-            self.clock.tick(c.FPS)
+            # Render at display rate (vsync normally limits this further)
+            self.clock.tick(c.MAX_RENDER_FPS)
+            work_start = time.perf_counter()
+            steps = self.timestep.advance()
             
             # Update music looping (handles loop point at 3 minutes)
             self._update_music()
             
-            # Clear screen with arcade background
-            self.screen.fill(c.DARK_GRAY)
-            
             # Get mouse state
             mouse_pos = pygame.mouse.get_pos()
-            mouse_clicked = False
             
             # ===== EVENT HANDLING =====
+            # Input polled while the last frame waited to be shown comes first
+            if self.input_poller is not None:
+                for timestamp, event in self.input_poller.queue.drain():
+                    self._handle_event(event, timestamp)
             for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button == 1:  # Left click
-                        mouse_clicked = True
-                        
-                if event.type == pygame.KEYDOWN:
-                    self._handle_keypress(event.key)
-                
-                # Handle joystick events
-                joystick.handle_event(event)
+                self._handle_event(event)
             
             # Update joystick hold states
             joystick.update()
             
             # CRITICAL FIX: Clean up stale axis states
             # This is a safety check for arcade joysticks that might not send proper release events
-            for joystick_id in list(self.joy_input_state.keys()):
-                if joystick_id < pygame.joystick.get_count():
-                    joy = pygame.joystick.Joystick(joystick_id)
+            for joystick_id in self.joy_input_state:
+                joy = joystick.get_joystick(joystick_id)
+                if joy is not None:
                     # Check axis 0 (left/right)
                     axis0_val = joy.get_axis(0) if joy.get_numaxes() > 0 else 0
                     # Check axis 1 (up/down)
@@ -236,52 +271,163 @@ class Game:
                             print(f"[CLEANUP] Joy {joystick_id} axes cleared (were: {self.joy_input_state[joystick_id]['axis']})")
                             self.joy_input_state[joystick_id]['axis'].clear()
             
-            # Decrement joystick menu scroll cooldown
-            if self.joy_menu_scroll_cooldown > 0:
-                self.joy_menu_scroll_cooldown -= 1
-            for player_id in self.joy_char_select_cooldown:
-                if self.joy_char_select_cooldown[player_id] > 0:
-                    self.joy_char_select_cooldown[player_id] -= 1
+            # ===== FIXED-STEP SIMULATION =====
+            for _ in range(steps):
+                mouse_clicked = self.pending_click
+                self.pending_click = False
+                self._step(mouse_pos, mouse_clicked)
             
-            # ===== STATE-BASED UPDATE AND RENDERING =====
-            if self.state == "MAIN_MENU":
-                self._update_main_menu(mouse_pos, mouse_clicked)
-                self._draw_main_menu()
-                
-            elif self.state == "CONTROLS":
-                self._update_controls(mouse_pos, mouse_clicked)
-                self._draw_controls()
-                
-            elif self.state == "ABOUT":
-                self._update_about(mouse_pos, mouse_clicked)
-                self._draw_about()
-                
-            elif self.state == "CHARACTER_SELECT":
-                self._update_character_select(mouse_pos, mouse_clicked)
-                self._draw_character_select()
-                
-            elif self.state == "FIGHT":
-                self._update_fight()
-                self._draw_fight()
-                
-            elif self.state == "GAME_OVER":
-                self._update_game_over(mouse_pos, mouse_clicked)
-                self._draw_game_over()
+            # ===== RENDERING =====
+            # Run-ahead: draw the fight as it will be a few steps from now
+            run_ahead = self.state == "FIGHT" and self.run_ahead.frames > 0 and self.netplay is None
+            if run_ahead:
+                self.run_ahead.begin(self)
+            
+            # Clear screen with arcade background
+            self.screen.fill(c.DARK_GRAY)
+            self._draw_state(self.timestep.interpolation)
+            
+            if run_ahead:
+                self.run_ahead.end(self)
             
             # ===== VINTAGE ARCADE EFFECTS =====
-            ArcadeFrame.draw(self.screen)
-            self.scanlines.draw(self.screen)
+            self.overlay.scanlines_enabled = self.quality.is_enabled('scanlines')
+            self.overlay.draw(self.screen)
+            
+            # Update + draw time only (not vsync-blocked flip, input polling or tick delay)
+            work_ms = (time.perf_counter() - work_start) * 1000
             
             # Update display
+            if self.input_poller is not None:
+                self.input_poller.wait()
             pygame.display.flip()
+            if self.input_poller is not None:
+                self.input_poller.on_flip()
+            if self.latency_probe is not None:
+                self.latency_probe.on_flip()
+            
+            # Feed this frame's work time to the quality governor
+            self.quality.record_frame(work_ms)
         
         # Cleanup
+        if self.latency_probe is not None:
+            self.latency_probe.report()
         joystick.quit()
         pygame.quit()
         sys.exit()
     
+    def _step(self, mouse_pos, mouse_clicked):
+        """
+        Advance the current game state by one fixed simulation step
+        
+        Args:
+            mouse_pos: Current mouse position tuple (x, y)
+            mouse_clicked: Boolean indicating if mouse was clicked since last step
+        """
+        # Decrement joystick menu scroll cooldown
+        if self.joy_menu_scroll_cooldown > 0:
+            self.joy_menu_scroll_cooldown -= 1
+        for player_id in self.joy_char_select_cooldown:
+            if self.joy_char_select_cooldown[player_id] > 0:
+                self.joy_char_select_cooldown[player_id] -= 1
+        
+        if self.state == "MAIN_MENU":
+            self._update_main_menu(mouse_pos, mouse_clicked)
+            
+        elif self.state == "CONTROLS":
+            self._update_controls(mouse_pos, mouse_clicked)
+            
+        elif self.state == "ABOUT":
+            self._update_about(mouse_pos, mouse_clicked)
+            
+        elif self.state == "CHARACTER_SELECT":
+            self._update_character_select(mouse_pos, mouse_clicked)
+            
+        elif self.state == "FIGHT":
+            self._store_render_positions()
+            self._update_fight()
+            
+        elif self.state == "GAME_OVER":
+            self._update_game_over(mouse_pos, mouse_clicked)
+    
+    def _draw_state(self, interpolation=1.0):
+        """
+        Render the current game state
+        
+        Args:
+            interpolation: Fraction of a simulation step elapsed since the last step
+        """
+        if self.state == "MAIN_MENU":
+            self._draw_main_menu()
+        elif self.state == "CONTROLS":
+            self._draw_controls()
+        elif self.state == "ABOUT":
+            self._draw_about()
+        elif self.state == "CHARACTER_SELECT":
+            self._draw_character_select()
+        elif self.state == "FIGHT":
+            self._draw_fight(interpolation)
+        elif self.state == "GAME_OVER":
+            self._draw_game_over()
+    
+    def _store_render_positions(self):
+        """Remember fighter/projectile positions before a step for render interpolation"""
+        self.p1.store_render_position()
+        self.p2.store_render_position()
+        for proj in self.projectiles:
+            proj.store_render_position()
+    
     # ==================== INPUT HANDLING ====================
     
+    def _handle_event(self, event, timestamp=None):
+        """
+        Handle one pygame event
+        
+        Args:
+            event: pygame event
+            timestamp: perf_counter time the event was polled (None = now)
+        """
+        # Only fight input can reach a simulation frame (menu presses would never resolve)
+        if self.latency_probe is not None and self.state == "FIGHT" and not self.attract_mode:
+            self.latency_probe.on_event(event, self._event_slots(event), timestamp)
+        
+        if event.type == pygame.QUIT:
+            self.running = False
+            
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:  # Left click
+                self.pending_click = True
+                
+        if event.type == pygame.KEYDOWN:
+            self._handle_keypress(event.key)
+        
+        # Handle joystick events
+        joystick.handle_event(event)
+        
+        # Latch fight presses so taps released before the next step still register
+        if self.state == "FIGHT":
+            if event.type == pygame.KEYDOWN:
+                self.p1.latch_key(event.key)
+                self.p2.latch_key(event.key)
+            elif event.type in (pygame.JOYBUTTONDOWN, pygame.JOYHATMOTION):
+                self.p1.latch_joystick()
+                self.p2.latch_joystick()
+    
+    def _event_slots(self, event):
+        """
+        Players an input event belongs to
+        
+        Args:
+            event: pygame keyboard / joystick event
+        
+        Returns:
+            Tuple of player slots (0 = P1, 1 = P2); empty if unbound
+        """
+        if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+            return tuple(slot for slot, controls in enumerate(self.control_maps) if event.key in controls.key_bits)
+        slot = joystick.get_slot(getattr(event, 'instance_id', None))
+        return () if slot is None else (slot,)
+    
     def _handle_keypress(self, key):
         """
         Handle keyboard input based on current game state
@@ -294,6 +440,8 @@ class Game:
             if self.state == "MAIN_MENU":
                 self.running = False
             else:
+                if self.state == "FIGHT":
+                    self._end_netplay()  # Leaving a network match closes the session
                 self.state = "MAIN_MENU"
                 
         # Main menu keyboard navigation
@@ -325,6 +473,11 @@ class Game:
                 elif key == pygame.K_KP1:
                     self.p2_selected = True
                     
+        # Fight: P toggles pause (freezes simulation time; not in netplay, the peer keeps running)
+        elif self.state == "FIGHT":
+            if key == pygame.K_p and not self.attract_mode and self.netplay is None:
+                self.sim_clock.set_paused(not self.sim_clock.paused)
+                
         # Game over screen
         elif self.state == "GAME_OVER":
             if key == pygame.K_RETURN:
@@ -505,56 +658,21 @@ class Game:
                 elif button in ['0', '1']:  # b or a to select
                     self.p2_selected = True
     
-    def get_joy_action(self, action, joystick_id=0):
+    def get_joy_bits(self, joystick_id=0):
         """
-        Check if a game action is active via joystick.
+        Get the game actions held on a joystick.
         Used by Fighter class for combat input.
         
         Args:
-            action: Action name ('light_punch', 'jump', etc.)
             joystick_id: Which joystick to check (0 for P1, 1 for P2)
             
         Returns:
-            True if the action is currently triggered via joystick
+            Bitmask of held actions (see inputs.ACTION_BITS)
         """
-        if joystick_id not in self.joy_input_state:
-            return False
-        
-        state = self.joy_input_state[joystick_id]
-        
-        # Get button mappings based on player
-        if joystick_id == 0:
-            button_map = c.ARCADE_P1_BUTTONS
-            axis_map = c.ARCADE_P1_AXIS
-        else:
-            button_map = c.ARCADE_P2_BUTTONS
-            axis_map = c.ARCADE_P2_AXIS
-        
-        # Check button actions
-        if action in button_map:
-            button = button_map[action]
-            if button in state['buttons']:
-                return True
-        
-        # Check axis actions (movement)
-        if action in axis_map:
-            axis, direction = axis_map[action]
-            axis_tuple = (axis, direction)
-            in_axis_state = axis_tuple in state['axis']
-            
-            # Debug: log movement checks
-            if action in ['left', 'right', 'jump', 'down']:
-                if in_axis_state or (self.state == "FIGHT" and action in ['left', 'right']):
-                    print(f"[Joy {joystick_id}] Check {action}: axis_tuple={axis_tuple}, in_state={in_axis_state}, state['axis']={state['axis']}")
-            
-            return in_axis_state
-        
-        # Check hat/dpad buttons
-        for hat_button, hat_action in c.HAT_BUTTONS.items():
-            if hat_action == action and hat_button in state['buttons']:
-                return True
-        
-        return False
+        state = self.joy_input_state.get(joystick_id)
+        if state is None:
+            return 0
+        return self.control_maps[joystick_id].joystick_bits(state)
     
     # ==================== MAIN MENU STATE ====================
     
@@ -857,6 +975,7 @@ class Game:
         if self.p1_selected and self.p2_selected:
             pygame.time.delay(500)
             self._start_fight()
+            self.timestep.reset()  # Don't fast-forward the fight through the delay
     
     def _draw_character_select(self):
         """Render character selection screen with perfect alignment"""
@@ -949,28 +1068,44 @@ class Game:
     
     # ==================== FIGHT STATE ====================
     
-    def _start_fight(self):
-        """Initialize a new fight with selected characters"""
-        # Use control configuration from config
-        controls_p1 = c.DEFAULT_P1_CONTROLS
-        controls_p2 = c.DEFAULT_P2_CONTROLS
+    def _start_fight(self, fight_seed=None):
+        """
+        Initialize a new fight with selected characters
+        
+        Args:
+            fight_seed: Gameplay random seed (None draws a new one; replays pass theirs)
+        """
+        # A new local fight never runs through a leftover network session
+        self._end_netplay()
+        if self.latency_probe is not None:
+            self.latency_probe.clear_pending()
+        
+        # Compiled control bindings (shared, so remapping applies immediately)
+        controls_p1, controls_p2 = self.control_maps
         
         # Create fighters at proper ground positions
         stats_p1 = c.CHARACTERS[self.p1_cursor]
         stats_p2 = c.CHARACTERS[self.p2_cursor]
         
+        # Fresh simulation time and gameplay random streams for the new match
+        self.sim_clock.reset()
+        self.rng.start_fight(fight_seed)
+        self.quality.reset()  # Each match starts at full quality; the governor re-measures
+        self.counter_attack_window = {'p1': 0, 'p2': 0}
+        
         # Spawn fighters on the ground (FLOOR_Y - P_HEIGHT)
         spawn_y = c.FLOOR_Y - c.P_HEIGHT
         self.p1 = Fighter(200, spawn_y, stats_p1, controls_p1, is_p2=False, 
                          combat_system=self.combat_system, fighter_id="p1",
-                         joy_input_getter=self.get_joy_action)
+                         joy_bits_getter=self.get_joy_bits, clock=self.sim_clock)
         self.p2 = Fighter(550, spawn_y, stats_p2, controls_p2, is_p2=True, 
                          combat_system=self.combat_system, fighter_id="p2",
-                         joy_input_getter=self.get_joy_action)
+                         joy_bits_getter=self.get_joy_bits, clock=self.sim_clock)
         
         # Register fighters with combat system for combo tracking
-        self.combat_system.register_fighter("p1")
-        self.combat_system.register_fighter("p2")
+        self.combat_system.register_fighter("p1", stats_p1['name'])
+        self.combat_system.register_fighter("p2", stats_p2['name'])
+        self.combat_system.events.clear()  # Counts are per match
         
         # Reset round system for new match
         self.p1_wins = 0
@@ -983,7 +1118,7 @@ class Game:
         # Reset ALL fight variables and clear leftover effects
         self.round_timer = 99
         self.particles = []
-        self.projectiles = []
+        self.projectiles = ProjectileSystem()
         self.special_effects = []
         self.hit_effects = []  # Clear hit effects from previous game
         self.screen_shake = 0  # Reset screen shake
@@ -993,39 +1128,54 @@ class Game:
         self.winner_sequence_frame = 0
         
         self.state = "FIGHT"
-        self.last_timer_update = pygame.time.get_ticks()
+        self.last_timer_update = self.sim_clock.get_ticks()
+        self._begin_replay()
     
-    def _start_attract_mode(self):
-        """Start AI vs AI attract mode demo - exciting showcase of gameplay!"""
+    def _start_attract_mode(self, fight_seed=None, characters=None):
+        """
+        Start AI vs AI attract mode demo - exciting showcase of gameplay!
+        
+        Args:
+            fight_seed: Gameplay random seed (None draws a new one; replays pass theirs)
+            characters: (p1, p2) character indices (None picks at random)
+        """
         self.attract_mode = True
         
-        # Select random characters
-        self.p1_cursor = random.randint(0, len(c.CHARACTERS) - 1)
-        self.p2_cursor = random.randint(0, len(c.CHARACTERS) - 1)
-        while self.p2_cursor == self.p1_cursor:
-            self.p2_cursor = random.randint(0, len(c.CHARACTERS) - 1)
+        if characters is not None:
+            self.p1_cursor, self.p2_cursor = characters
+        else:
+            # Select random characters
+            attract_rng = self.rng.attract
+            self.p1_cursor = attract_rng.randint(0, len(c.CHARACTERS) - 1)
+            self.p2_cursor = attract_rng.randint(0, len(c.CHARACTERS) - 1)
+            while self.p2_cursor == self.p1_cursor:
+                self.p2_cursor = attract_rng.randint(0, len(c.CHARACTERS) - 1)
         
         # Start fight with AI control
-        controls_p1 = c.DEFAULT_P1_CONTROLS
-        controls_p2 = c.DEFAULT_P2_CONTROLS
+        controls_p1, controls_p2 = self.control_maps
         
         stats_p1 = c.CHARACTERS[self.p1_cursor]
         stats_p2 = c.CHARACTERS[self.p2_cursor]
         
+        self.sim_clock.reset()
+        self.quality.reset()
+        self.rng.start_fight(fight_seed)
+        self.counter_attack_window = {'p1': 0, 'p2': 0}
         spawn_y = c.FLOOR_Y - c.P_HEIGHT
         self.p1 = Fighter(200, spawn_y, stats_p1, controls_p1, is_p2=False,
                          combat_system=self.combat_system, fighter_id="p1",
-                         joy_input_getter=self.get_joy_action)
+                         joy_bits_getter=self.get_joy_bits, clock=self.sim_clock)
         self.p2 = Fighter(550, spawn_y, stats_p2, controls_p2, is_p2=True,
                          combat_system=self.combat_system, fighter_id="p2",
-                         joy_input_getter=self.get_joy_action)
+                         joy_bits_getter=self.get_joy_bits, clock=self.sim_clock)
         
         # Start with some super meter for exciting ultimates early on!
         self.p1.super_meter = 50
         self.p2.super_meter = 70  # P2 gets more to show ultimate sooner
         
-        self.combat_system.register_fighter("p1")
-        self.combat_system.register_fighter("p2")
+        self.combat_system.register_fighter("p1", stats_p1['name'])
+        self.combat_system.register_fighter("p2", stats_p2['name'])
+        self.combat_system.events.clear()  # Counts are per match
         
         # Reset round system
         self.p1_wins = 0
@@ -1037,14 +1187,71 @@ class Game:
         # Reset fight variables
         self.round_timer = 99
         self.particles = []
-        self.projectiles = []
+        self.projectiles = ProjectileSystem()
         self.special_effects = []
         self.hit_effects = []
         self.screen_shake = 0
         self.winner_sequence_active = False
         
         self.state = "FIGHT"
-        self.last_timer_update = pygame.time.get_ticks()
+        self.last_timer_update = self.sim_clock.get_ticks()
+        self._begin_replay()
+    
+    def _begin_replay(self):
+        """Start recording the match that was just set up (if enabled)"""
+        self.replay_recorder = ReplayRecorder(self) if c.RECORD_REPLAYS else None
+    
+    def _end_replay(self):
+        """Stop recording and write the replay file"""
+        if self.replay_recorder is not None:
+            path = self.replay_recorder.save()
+            if path:
+                print(f"Replay saved: {path}")
+            self.replay_recorder = None
+    
+    def start_netplay(self, transport, local_slot, p1_character, p2_character, fight_seed, **session_options):
+        """
+        Start a network match (both cabinets must pass the same characters and seed)
+        
+        Args:
+            transport: netplay.UdpTransport (or a loopback endpoint) to the peer
+            local_slot: 0 if this cabinet plays P1, 1 for P2
+            p1_character, p2_character: Indices into config.CHARACTERS
+            fight_seed: Shared gameplay random seed
+            **session_options: input_delay / max_rollback overrides for RollbackSession
+        """
+        self.attract_mode = False
+        self.p1_cursor = p1_character
+        self.p2_cursor = p2_character
+        self._start_fight(fight_seed=fight_seed)
+        self.netplay = RollbackSession(self, local_slot, transport, **session_options)
+    
+    def _end_netplay(self):
+        """Close the network session"""
+        if self.netplay is not None:
+            self.netplay.close()
+            self.netplay = None
+    
+    def save_state(self, buffer=None):
+        """
+        Snapshot the current match state (see snapshot.py)
+        
+        Args:
+            buffer: MatchSnapshot to reuse (None allocates one)
+        
+        Returns:
+            The MatchSnapshot
+        """
+        return snapshot.save_state(self, buffer)
+    
+    def load_state(self, buffer):
+        """
+        Restore a match state saved by save_state() during this match
+        
+        Args:
+            buffer: MatchSnapshot to restore
+        """
+        snapshot.load_state(self, buffer)
     
     def _reset_round(self):
         """Reset positions and health for new round (keep super meter)"""
@@ -1080,10 +1287,15 @@ class Game:
         self.p2.blocking = False
         self.p2.block_stun = 0
         
+        # Motions and buffered presses don't carry over into the next round
+        for fighter in (self.p1, self.p2):
+            fighter.input_history.clear()
+            fighter.motion_recognizer.reset()
+        
         # Reset fight variables
         self.round_timer = 99
         self.particles = []
-        self.projectiles = []
+        self.projectiles = ProjectileSystem()
         self.special_effects = []
         self.hit_effects = []
         self.screen_shake = 0
@@ -1092,7 +1304,7 @@ class Game:
         self.round_winner = None
         self.winner_sequence_active = False
         self.winner_sequence_frame = 0
-        self.last_timer_update = pygame.time.get_ticks()
+        self.last_timer_update = self.sim_clock.get_ticks()
         self.current_round += 1
     
     def _update_fight(self):
@@ -1112,8 +1324,56 @@ class Game:
                 self.attract_mode = False
                 self.idle_timer = 0
                 self.state = "MAIN_MENU"
+                self._end_replay()
                 return
             
+        if self.netplay is not None:
+            # Rollback session steps the fight (possibly resimulating)
+            self.netplay.tick()
+            if self.netplay.disconnected:
+                print("Netplay: connection lost")
+                self._end_netplay()
+                self.state = "MAIN_MENU"
+                return
+            if self.state != "FIGHT":
+                self._end_netplay()  # Match over (decided long before the rollback window)
+        else:
+            self._step_fight()
+        
+        # Turn this step's combat events into visual effects
+        for event in self.combat_system.events.drain():
+            self._spawn_hit_effects(event)
+    
+    def _step_fight(self):
+        """
+        Advance the fight by one fixed step
+        
+        Hit-stop, slow motion and pause make a step run zero or more
+        simulation frames. No rendering or event draining happens here, so
+        netplay and run-ahead can call it for resimulation; with
+        self.headless set, cosmetic updates and replay recording are skipped.
+        """
+        probe = self.latency_probe
+        for _ in range(self.sim_clock.tick()):
+            self.sim_clock.advance_frame()
+            if probe is not None:
+                probe.before_frame(self)
+            self._simulate_fight_frame()
+            if probe is not None:
+                probe.after_frame(self)
+            if self.replay_recorder is not None and not self.headless:
+                self.replay_recorder.record_frame(self)
+            if self.state != "FIGHT":
+                if not self.headless:
+                    self._end_replay()
+                break
+    
+    def _simulate_fight_frame(self):
+        """Run one simulation frame of the fight"""
+        self.p1.store_sweep_start()
+        self.p2.store_sweep_start()
+        
+        if self.attract_mode:
             # Run simple AI for both fighters
             self._update_ai_fighter(self.p1, self.p2)
             self._update_ai_fighter(self.p2, self.p1)
@@ -1132,20 +1392,19 @@ class Game:
                     self._reset_round()
             return
         
-        # Handle hit freeze (brief pause on heavy hits for impact)
-        if self.hit_freeze_frames > 0:
-            self.hit_freeze_frames -= 1
-            return  # Skip update during hit freeze
-        
         # Update counter attack windows
         for player in ['p1', 'p2']:
             if self.counter_attack_window[player] > 0:
                 self.counter_attack_window[player] -= 1
         
         # Update timer
-        if pygame.time.get_ticks() - self.last_timer_update > 1000:
+        current_time = self.sim_clock.get_ticks()
+        if current_time - self.last_timer_update > 1000:
             self.round_timer -= 1
-            self.last_timer_update = pygame.time.get_ticks()
+            self.last_timer_update = current_time
+        
+        # Drop combos whose window expired
+        self.combat_system.update(current_time)
         
         # ATTRACT MODE: Keep fighters alive for continuous demo
         if self.attract_mode:
@@ -1170,11 +1429,9 @@ class Game:
                 elif self.p1.health <= 0:
                     self.round_winner = "p2"
                     self.p2_wins += 1
-                    self.hit_effects.append(HitEffect(self.p1.rect.centerx, self.p1.rect.centery - 50, 'ko', c.RED))
                 elif self.p2.health <= 0:
                     self.round_winner = "p1"
                     self.p1_wins += 1
-                    self.hit_effects.append(HitEffect(self.p2.rect.centerx, self.p2.rect.centery - 50, 'ko', c.BLUE))
                 else:
                     # Time out - higher health wins
                     if self.p1.health > self.p2.health:
@@ -1190,35 +1447,33 @@ class Game:
                 if self.p1_wins >= c.WINS_REQUIRED or self.p2_wins >= c.WINS_REQUIRED:
                     self.winner_sequence_active = True
                     self.winner_sequence_frame = 0
+                    # Open the sequence in slow motion
+                    self.sim_clock.slow_motion(c.WINNER_SLOWMO_SCALE, c.WINNER_SLOWMO_FRAMES)
             return
         
-        # Winner sequence animation - exactly 3 seconds (180 frames at 60fps)
+        # Winner sequence animation - 180 simulation frames (slow motion at
+        # the start is applied by the simulation clock)
         if self.winner_sequence_active:
             self.winner_sequence_frame += 1
             
-            # Slow motion effect: Skip update on even frames for first 30 frames
-            # This creates a slow-mo effect by updating game state at half speed
-            is_in_slowmo_window = self.winner_sequence_frame <= 30
-            is_even_frame = self.winner_sequence_frame % 2 == 0
-            if is_in_slowmo_window and is_even_frame:
-                return  # Skip this update to create slow motion
-            
             if self.winner_sequence_frame >= 180:  # Exactly 3 seconds
                 self.state = "GAME_OVER"
                 self.winner_sequence_active = False
                 self.winner_sequence_frame = 0
             return  # Don't update fight during winner sequence
         
-        # Update screen shake
-        if self.screen_shake > 0:
-            self.screen_shake -= 1
-            shake_amount = min(self.screen_shake, 5)
-            self.screen_shake_offset = (
-                random.randint(-shake_amount, shake_amount),
-                random.randint(-shake_amount, shake_amount)
-            )
-        else:
-            self.screen_shake_offset = (0, 0)
+        # Update screen shake (cosmetic - only on real steps)
+        if not self.headless:
+            if self.screen_shake > 0:
+                self.screen_shake -= 1
+                shake_amount = min(self.screen_shake, 5)
+                shake_rng = self.rng.shake
+                self.screen_shake_offset = (
+                    shake_rng.randint(-shake_amount, shake_amount),
+                    shake_rng.randint(-shake_amount, shake_amount)
+                )
+            else:
+                self.screen_shake_offset = (0, 0)
         
         # Update fighters and handle special moves
         result1 = self.p1.move(self.p2, c.SCREEN_WIDTH, c.SCREEN_HEIGHT)
@@ -1237,128 +1492,30 @@ class Game:
                     # Single projectile (make sure it's not a SpinningKickEffect)
                     self.projectiles.append(result)
         
-        self.p1.update()
-        self.p2.update()
+        # Advance projectiles (batched by type) and special effects
+        self.projectiles.update()
         
-        # Update and handle projectiles
-        for proj in self.projectiles[:]:
-            proj.update()
-            if not proj.active:
-                self.projectiles.remove(proj)
-                continue
-            
-            # Check collision with fighters
-            proj_rect = proj.get_rect()
-            if proj.owner == self.p1 and proj_rect.colliderect(self.p2.rect):
-                # Check if p2 is parrying
-                if self.p2.parrying and self.p2.parry_window > 0:
-                    # Successful parry - reflect projectile
-                    proj.vel_x = -proj.vel_x  # Reverse horizontal velocity
-                    proj.owner = self.p2  # Change ownership to p2
-                    self.p2.parry_success = True
-                    self.p2.color_flash = 10
-                    self._spawn_particles(self.p2.rect.centerx, self.p2.rect.centery, c.YELLOW)
-                    self.hit_effects.append(HitEffect(self.p2.rect.centerx, self.p2.rect.centery, 'parry', c.YELLOW))
-                    # Grant counter attack window (60 frames = 1 second)
-                    self.counter_attack_window['p2'] = 60
-                    self.hit_freeze_frames = 5  # Brief freeze for impact
-                else:
-                    # Apply combo damage scaling
-                    damage = proj.damage
-                    if self.p1.combat_system and self.p1.fighter_id:
-                        combo_info = self.p1.combat_system.record_hit(self.p1.fighter_id, damage, 'special')
-                        damage *= combo_info['multiplier']
-                    
-                    # Check for counter attack bonus
-                    if self.counter_attack_window['p1'] > 0:
-                        damage *= 1.5  # 50% bonus damage on counter
-                    
-                    self.p2.take_damage(damage, 10, 15, self.p1.facing_right)
-                    self._spawn_particles(self.p2.rect.centerx, self.p2.rect.centery, c.ORANGE)
-                    self.hit_effects.append(HitEffect(self.p2.rect.centerx, self.p2.rect.centery, 'special', c.ORANGE))
-                    self.screen_shake = 8
-                    self.hit_freeze_frames = 4  # Brief freeze on heavy hits
-                    proj.active = False
-            elif proj.owner == self.p2 and proj_rect.colliderect(self.p1.rect):
-                # Check if p1 is parrying
-                if self.p1.parrying and self.p1.parry_window > 0:
-                    # Successful parry - reflect projectile
-                    proj.vel_x = -proj.vel_x  # Reverse horizontal velocity
-                    proj.owner = self.p1  # Change ownership to p1
-                    self.p1.parry_success = True
-                    self.p1.color_flash = 10
-                    self._spawn_particles(self.p1.rect.centerx, self.p1.rect.centery, c.YELLOW)
-                    self.hit_effects.append(HitEffect(self.p1.rect.centerx, self.p1.rect.centery, 'parry', c.YELLOW))
-                    # Grant counter attack window (60 frames = 1 second)
-                    self.counter_attack_window['p1'] = 60
-                    self.hit_freeze_frames = 5  # Brief freeze for impact
-                else:
-                    # Apply combo damage scaling
-                    damage = proj.damage
-                    if self.p2.combat_system and self.p2.fighter_id:
-                        combo_info = self.p2.combat_system.record_hit(self.p2.fighter_id, damage, 'special')
-                        damage *= combo_info['multiplier']
-                    
-                    # Check for counter attack bonus
-                    if self.counter_attack_window['p2'] > 0:
-                        damage *= 1.5  # 50% bonus damage on counter
-                    
-                    self.p1.take_damage(damage, 10, 15, self.p2.facing_right)
-                    self._spawn_particles(self.p1.rect.centerx, self.p1.rect.centery, c.ORANGE)
-                    self.hit_effects.append(HitEffect(self.p1.rect.centerx, self.p1.rect.centery, 'special', c.ORANGE))
-                    self.screen_shake = 8
-                    self.hit_freeze_frames = 4  # Brief freeze on heavy hits
-                    proj.active = False
-        
-        # Update special effects
         for effect in self.special_effects[:]:
             effect.update()
             if not effect.active:
                 self.special_effects.remove(effect)
-                continue
-            
-            # Check for spinning kick hits
-            if isinstance(effect, SpinningKickEffect) and effect.can_hit():
-                target = self.p2 if effect.fighter == self.p1 else self.p1
-                attacker = effect.fighter
-                kick_rect = pygame.Rect(attacker.rect.x - 30, attacker.rect.y - 30, 
-                                       attacker.rect.width + 60, attacker.rect.height + 60)
-                if kick_rect.colliderect(target.rect):
-                    # Apply combo damage scaling
-                    damage = 8
-                    if attacker.combat_system and attacker.fighter_id:
-                        attacker.combat_system.increment_combo(attacker.fighter_id)
-                        combo_multiplier = attacker.combat_system.get_combo_damage_multiplier(attacker.fighter_id)
-                        damage *= combo_multiplier
-                    
-                    target.take_damage(damage, 15, 10, attacker.facing_right)
-                    effect.register_hit()
-                    self._spawn_particles(target.rect.centerx, target.rect.centery, c.ORANGE)
-                    self.hit_effects.append(HitEffect(target.rect.centerx, target.rect.centery, 'heavy', c.ORANGE))
-                    self.screen_shake = 10
-        
-        # Spawn particles on hit
-        if self.p1.attacking and self.p1.attack_rect and self.p1.attack_rect.colliderect(self.p2.rect):
-            self._spawn_particles(self.p2.rect.centerx, self.p2.rect.centery, c.RED)
-            # Add hit effect based on attack type with randomness
-            effect_type = 'heavy' if 'heavy' in self.p1.attack_type else 'light'
-            # Higher chance for heavy attacks (80%), lower for light (30%)
-            chance = 0.8 if effect_type == 'heavy' else 0.3
-            if random.random() < chance:
-                # Position text higher to avoid blood splash overlap (move up by 40 pixels)
-                self.hit_effects.append(HitEffect(self.p2.rect.centerx, self.p2.rect.centery - 40, effect_type, c.RED))
-            if effect_type == 'heavy':
-                self.screen_shake = 10
-        if self.p2.attacking and self.p2.attack_rect and self.p2.attack_rect.colliderect(self.p1.rect):
-            self._spawn_particles(self.p1.rect.centerx, self.p1.rect.centery, c.BLUE)
-            effect_type = 'heavy' if 'heavy' in self.p2.attack_type else 'light'
-            # Higher chance for heavy attacks (80%), lower for light (30%)
-            chance = 0.8 if effect_type == 'heavy' else 0.3
-            if random.random() < chance:
-                # Position text higher to avoid blood splash overlap (move up by 40 pixels)
-                self.hit_effects.append(HitEffect(self.p1.rect.centerx, self.p1.rect.centery - 40, effect_type, c.BLUE))
-            if effect_type == 'heavy':
-                self.screen_shake = 10
+        
+        # Pushbox resolution - fighters never end a frame inside each other
+        resolve_pushboxes(self.p1, self.p2, 0, c.SCREEN_WIDTH)
+        
+        # Hit resolution - collect every hit this frame, then apply them together
+        # (before fighters advance to their next attack frame)
+        hits = self._collect_hits()
+        if hits:
+            hit_stop = self.combat_system.resolve_hits(hits, self.counter_attack_window, self.sim_clock.frame)
+            if hit_stop:
+                self.sim_clock.hit_stop(hit_stop)
+        
+        self.p1.update()
+        self.p2.update()
+        
+        if self.headless:
+            return  # Particles and hit effects only advance on real steps
         
         # Update particles
         for p in self.particles[:]:
@@ -1372,8 +1529,117 @@ class Game:
             if not effect.active:
                 self.hit_effects.remove(effect)
     
-    def _draw_fight(self):
-        """Render fight screen with vintage arcade HUD"""
+    def _collect_hits(self):
+        """
+        Find every hit landing this frame without applying any
+        
+        Melee hitboxes, projectiles and spinning kicks are all tested against
+        the target's hurtbox; projectiles and spinning kicks via the
+        sort-and-sweep broadphase, which also finds projectile clashes.
+        Since nothing is applied until CombatSystem.resolve_hits, hits on the
+        same frame trade.
+        
+        Returns:
+            List of Hit
+        """
+        hits = []
+        for attacker, target in ((self.p1, self.p2), (self.p2, self.p1)):
+            attacker.update_hitbox()
+            if attacker.is_hitbox_active() and attacker.attack_rect.colliderect(target.get_hurtbox()):
+                move = attacker.moves[attacker.attack_type]
+                attacker.attack_hit = True
+                hits.append(Hit(attacker, target, 'melee', attacker.attack_type, move.damage,
+                                move.knockback, move.stun, meter_gain=c.SUPER_GAIN_ON_HIT))
+        
+        # Projectiles and spinning kicks go through the broadphase
+        broadphase = self.broadphase
+        broadphase.clear()
+        for fighter in (self.p1, self.p2):
+            broadphase.add(fighter.update_hurt_collider())
+        for proj in self.projectiles:
+            if proj.active:
+                broadphase.add(proj.update_collider())
+        for effect in self.special_effects:
+            if isinstance(effect, SpinningKickEffect) and effect.can_hit():
+                broadphase.add(effect.update_collider())
+        pairs = broadphase.find_pairs()
+        
+        # Projectile clashes first, so a clashed projectile can't also hit
+        for a, b in pairs:
+            if (a.kind == 'projectile' and b.kind == 'projectile' and a.obj.active and b.obj.active
+                    and a.obj.sweep_hits_projectile(b.obj)):
+                self.combat_system.resolve_clash(a.obj, b.obj, self.sim_clock.frame)
+        
+        for a, b in pairs:
+            if b.kind == 'hurtbox':
+                a, b = b, a
+            if a.kind != 'hurtbox':
+                continue
+            target = a.obj
+            if b.kind == 'projectile':
+                proj = b.obj
+                if proj.active and proj.sweep_hits(target):
+                    hits.append(Hit(proj.owner, target, 'projectile', 'special', proj.damage, 10, 15,
+                                    projectile=proj))
+            elif b.kind == 'spinning_kick' and b.obj.hit_rect.colliderect(target.hurtbox):
+                effect = b.obj
+                effect.register_hit()
+                hits.append(Hit(effect.fighter, target, 'spinning_kick', 'special',
+                                SpecialMoveData.SPINNING_KICK['damage_per_hit'], 15, 10))
+        
+        return hits
+    
+    def _spawn_hit_effects(self, event):
+        """
+        Spawn particles, hit effects and screen shake for a combat event
+        
+        Args:
+            event: CombatEvent drained from the combat system's queue
+        """
+        target = event.target
+        x, y = target.rect.centerx, target.rect.centery
+        
+        if event.type == 'parry':
+            self._spawn_particles(x, y, c.YELLOW)
+            self.hit_effects.append(HitEffect(x, y, 'parry', c.YELLOW))
+        elif event.type == 'projectile_reflect':
+            pass  # Covered by the parry effect
+        elif event.type == 'projectile_clash':
+            clash_x, clash_y = event.position
+            self._spawn_particles(clash_x, clash_y, c.YELLOW)
+            self.hit_effects.append(HitEffect(clash_x, clash_y, 'special', c.YELLOW))
+            self.screen_shake = 6
+        elif event.type == 'ko':
+            self.hit_effects.append(HitEffect(x, y - 50, 'ko', c.RED if target is self.p1 else c.BLUE))
+            self.screen_shake = 15
+        elif event.source == 'projectile':
+            self._spawn_particles(x, y, c.ORANGE)
+            self.hit_effects.append(HitEffect(x, y, 'special', c.ORANGE))
+            self.screen_shake = 8
+        elif event.source == 'spinning_kick':
+            self._spawn_particles(x, y, c.ORANGE)
+            self.hit_effects.append(HitEffect(x, y, 'heavy', c.ORANGE))
+            self.screen_shake = 10
+        else:
+            color = c.RED if event.attacker == self.p1 else c.BLUE
+            self._spawn_particles(x, y, color)
+            # Add hit effect based on attack type with randomness
+            effect_type = 'heavy' if 'heavy' in event.attack_type else 'light'
+            # Higher chance for heavy attacks (80%), lower for light (30%)
+            chance = 0.8 if effect_type == 'heavy' else 0.3
+            if self.rng.hit_effects.random() < chance and self.quality.is_enabled('hit_effects'):
+                # Position text higher to avoid blood splash overlap (move up by 40 pixels)
+                self.hit_effects.append(HitEffect(x, y - 40, effect_type, color))
+            if effect_type == 'heavy':
+                self.screen_shake = 10
+    
+    def _draw_fight(self, interpolation=1.0):
+        """
+        Render fight screen with vintage arcade HUD
+        
+        Args:
+            interpolation: Fraction of a simulation step to interpolate positions by
+        """
         # Apply screen shake offset
         shake_x, shake_y = self.screen_shake_offset
         
@@ -1381,18 +1647,16 @@ class Game:
         current_frame = pygame.time.get_ticks() // 16  # ~60fps
         
         # Draw parallax background with CMU-Q pillars
-        drawing.draw_parallax_background(self.screen, self.p1.rect.centerx, self.p2.rect.centerx, current_frame)
+        background_frame = current_frame if self.quality.is_enabled('background_animation') else 0
+        drawing.draw_parallax_background(self.screen, self.p1.rect.centerx, self.p2.rect.centerx, background_frame)
         
         # Draw brown dirt floor (no perspective grid)
         dirt_floor = pygame.Rect(0 + shake_x, c.FLOOR_Y + shake_y, c.SCREEN_WIDTH, c.SCREEN_HEIGHT - c.FLOOR_Y)
         pygame.draw.rect(self.screen, c.DIRT_BROWN, dirt_floor)
         
-        # Add subtle texture with random darker spots (using consistent seed from __init__)
-        for _ in range(50):
-            spot_x = random.randint(0, c.SCREEN_WIDTH)
-            spot_y = random.randint(c.FLOOR_Y, c.SCREEN_HEIGHT)
-            spot_size = random.randint(3, 8)
-            darker_brown = (int(c.DIRT_BROWN[0] * 0.8), int(c.DIRT_BROWN[1] * 0.8), int(c.DIRT_BROWN[2] * 0.8))
+        # Add subtle texture with darker spots (fixed layout from _build_floor_spots)
+        darker_brown = (int(c.DIRT_BROWN[0] * 0.8), int(c.DIRT_BROWN[1] * 0.8), int(c.DIRT_BROWN[2] * 0.8))
+        for spot_x, spot_y, spot_size in self.floor_spots:
             pygame.draw.circle(self.screen, darker_brown, (spot_x + shake_x, spot_y + shake_y), spot_size)
         
         # Floor line
@@ -1442,12 +1706,13 @@ class Game:
                 flash_surface.set_alpha(100)
                 game_surface.blit(flash_surface, (0, 0))
         else:
-            self.p1.draw(game_surface)
-            self.p2.draw(game_surface)
+            shield_alpha = self.quality.is_enabled('shield_alpha')
+            self.p1.draw(game_surface, shield_alpha, interpolation)
+            self.p2.draw(game_surface, shield_alpha, interpolation)
         
         # Draw projectiles
         for proj in self.projectiles:
-            proj.draw(game_surface)
+            proj.draw(game_surface, interpolation)
         
         # Draw special effects (spinning kick rotation)
         for effect in self.special_effects:
@@ -1543,7 +1808,7 @@ class Game:
         # P1 Special ability power bar
         power_bar_width = 150
         power_bar_height = 15
-        current_time = pygame.time.get_ticks()
+        current_time = self.sim_clock.get_ticks()
         time_since_special_p1 = current_time - self.p1.last_special_time
         special_cooldown = 2000  # 2 seconds
         power_ratio_p1 = min(1.0, time_since_special_p1 / special_cooldown)
@@ -1611,6 +1876,12 @@ class Game:
         if self.round_over:
             self._draw_round_transition()
         
+        # Draw pause banner
+        if self.sim_clock.paused:
+            paused_text = self.text_renderer.render_outlined("PAUSED", 'large', c.WHITE, c.BLACK, 3)
+            paused_x = c.SCREEN_WIDTH // 2 - paused_text.get_width() // 2
+            self.screen.blit(paused_text, (paused_x, c.SCREEN_HEIGHT // 2 - 30))
+        
         # Draw attract mode banner
         if self.attract_mode:
             banner = self.text_renderer.render_outlined("DEMO - PRESS ANY BUTTON TO PLAY", 'medium', c.YELLOW, c.BLACK, 2)
@@ -1738,10 +2009,7 @@ class Game:
     
     def _draw_combo_display(self):
         """Draw combo counter and announcements"""
-        current_time = pygame.time.get_ticks()
-        
-        # Update combat system to check for dropped combos
-        self.combat_system.update(current_time)
+        current_time = self.sim_clock.get_ticks()
         
         # Draw P1 combo counter
         p1_combo = self.combat_system.get_combo_count("p1")
@@ -1859,11 +2127,19 @@ class Game:
     
     # ==================== HELPER METHODS ====================
     
+    def _build_floor_spots(self):
+        """Lay out the dirt floor texture spots once (render random stream)"""
+        floor_rng = self.rng.floor
+        return [(floor_rng.randint(0, c.SCREEN_WIDTH),
+                 floor_rng.randint(c.FLOOR_Y, c.SCREEN_HEIGHT),
+                 floor_rng.randint(3, 8)) for _ in range(50)]
+    
     def _spawn_particles(self, x, y, color):
         """Spawn particle effects at position"""
-        for _ in range(5):
-            vx = random.uniform(-5, 5)
-            vy = random.uniform(-5, -2)
+        particle_rng = self.rng.particles
+        for _ in range(self.quality.scale_count(5)):
+            vx = particle_rng.uniform(-5, 5)
+            vy = particle_rng.uniform(-5, -2)
             self.particles.append(Particle(x, y, color, (vx, vy)))
     
     def _update_ai_fighter(self, ai_fighter, target):
@@ -1871,7 +2147,7 @@ class Game:
         Enhanced AI logic for attract mode - aggressive fighting with specials and ultimates.
         Makes the demo exciting to watch!
         """
-        current_time = pygame.time.get_ticks()
+        current_time = self.sim_clock.get_ticks()
         dx = target.rect.centerx - ai_fighter.rect.centerx
         distance = abs(dx)
         
@@ -1879,7 +2155,8 @@ class Game:
         ai_fighter.facing_right = dx > 0
         
         # Random action selection with weighted probabilities
-        rand = random.random()
+        ai_rng = self.rng.ai
+        rand = ai_rng.random()
         
         # ===== ULTIMATE MOVE - Use when meter is full! =====
         if ai_fighter.super_meter >= c.SUPER_METER_MAX:
@@ -1905,7 +2182,7 @@ class Game:
                                 self.projectiles.append(result)
                         # Screen flash for ultimate
                         self.screen_shake = 15
-                        self.hit_freeze_frames = 8
+                        self.sim_clock.hit_stop(c.HIT_STOP_ULTIMATE)
         
         # ===== SPECIAL MOVES - Use frequently for demo =====
         elif rand < 0.08 and distance < 250:
@@ -1940,10 +2217,10 @@ class Game:
                 # Combo attacks - favor variety
                 attacks = ['light_punch', 'heavy_punch', 'light_kick', 'heavy_kick']
                 # Weight toward heavy attacks for more impact
-                if random.random() < 0.4:
-                    attack = random.choice(['heavy_punch', 'heavy_kick'])
+                if ai_rng.random() < 0.4:
+                    attack = ai_rng.choice(['heavy_punch', 'heavy_kick'])
                 else:
-                    attack = random.choice(attacks)
+                    attack = ai_rng.choice(attacks)
                 ai_fighter.attack(target, attack)
                 
             elif rand < 0.20:
@@ -1987,7 +2264,7 @@ class Game:
                     ai_fighter.rect.x -= ai_fighter.speed * 0.5
         
         # Stop blocking randomly
-        if ai_fighter.blocking and random.random() < 0.15:
+        if ai_fighter.blocking and ai_rng.random() < 0.15:
             ai_fighter.blocking = False
             ai_fighter.is_blocking = False
         
@@ -2014,8 +2291,9 @@ class Game:
     
     def _spawn_dust_particles(self, x, y):
         """Spawn dust particles for landing/jumping effects"""
-        for _ in range(8):
-            vx = random.uniform(-3, 3)
-            vy = random.uniform(-1, -0.5)
+        particle_rng = self.rng.particles
+        for _ in range(self.quality.scale_count(8)):
+            vx = particle_rng.uniform(-3, 3)
+            vy = particle_rng.uniform(-1, -0.5)
             color = (139, 90, 43)  # Dirt brown
             self.particles.append(Particle(x, y, color, (vx, vy)))
@@ -0,0 +1,108 @@
+"""
+High-rate input polling for CMUQ Arena
+Game.run normally reads events once per rendered frame, so every press is
+stamped with the time of that read. With INPUT_POLLING on, InputPoller keeps
+pumping SDL for keyboard / joystick events while the frame waits to be
+shown, stamping each with perf_counter as it arrives, and queues them for
+the next frame's event loop.
+
+SDL only allows events to be pumped from the thread that owns the window,
+so polling runs on the main thread in the idle time before display.flip()
+rather than on a thread of its own.
+"""
+
+import time
+from collections import deque
+import config as c
+from pygame_compat import pygame
+
+
+# Player input events
+INPUT_EVENT_TYPES = (pygame.KEYDOWN, pygame.KEYUP, pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP,
+                     pygame.JOYAXISMOTION, pygame.JOYHATMOTION)
+# Events polled ahead of the frame's event loop. A filtered event.get()
+# returns events grouped by type in this order, so hotplug events come
+# first and a new pad is opened before its first press is handled
+POLLED_EVENT_TYPES = (pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED) + INPUT_EVENT_TYPES
+
+
+class InputQueue:
+    """
+    Timestamped input events from one producer to one consumer.
+
+    deque append / popleft are atomic, so no lock is needed; when full, the
+    oldest events are dropped.
+    """
+
+    def __init__(self, size=c.INPUT_QUEUE_SIZE):
+        """
+        Initialize queue
+
+        Args:
+            size: Max events held before the oldest are dropped
+        """
+        self.events = deque(maxlen=size)
+
+    def push(self, timestamp, event):
+        """Queue an event read at timestamp (perf_counter seconds)"""
+        self.events.append((timestamp, event))
+
+    def drain(self):
+        """Yield (timestamp, event) pairs in arrival order until the queue is empty"""
+        events = self.events
+        while events:
+            yield events.popleft()
+
+    def __len__(self):
+        return len(self.events)
+
+
+class InputPoller:
+    """
+    Polls input events between frames at a fixed rate.
+
+    Game.run calls wait() just before display.flip() and on_flip() right
+    after it; the frame's event loop drains queue first.
+    """
+
+    def __init__(self, rate_hz=c.INPUT_POLL_HZ, margin_ms=c.INPUT_POLL_MARGIN_MS):
+        """
+        Initialize poller
+
+        Args:
+            rate_hz: Polls per second while waiting
+            margin_ms: Stop polling this long before the next flip is due
+        """
+        self.queue = InputQueue()
+        self.interval = 1.0 / rate_hz
+        self.margin = margin_ms / 1000
+        self.frame_time = 1.0 / c.FPS  # Smoothed time between flips
+        self.last_flip = None
+        self.polls = 0
+
+    def poll(self):
+        """Pump SDL once and queue any new input (and joystick hotplug) events"""
+        events = pygame.event.get(POLLED_EVENT_TYPES)
+        self.polls += 1
+        if events:
+            now = time.perf_counter()
+            for event in events:
+                self.queue.push(now, event)
+
+    def wait(self):
+        """Poll until shortly before the next flip is expected"""
+        if self.last_flip is None:
+            return
+        deadline = self.last_flip + self.frame_time - self.margin
+        now = time.perf_counter()
+        while now < deadline:
+            self.poll()
+            time.sleep(min(self.interval, max(0.0, deadline - time.perf_counter())))
+            now = time.perf_counter()
+
+    def on_flip(self):
+        """Track the display rate (call right after display.flip())"""
+        now = time.perf_counter()
+        if self.last_flip is not None:
+            self.frame_time += (now - self.last_flip - self.frame_time) * 0.1
+        self.last_flip = now
@@ -0,0 +1,313 @@
+"""
+Fighter control bindings, input history and motion-input recognition.
+
+ControlMap compiles a player's keyboard / joystick bindings into lookup
+tables that turn device state into an action bitmask.
+Inputs are sampled once per simulation frame into a fixed-size ring buffer
+(a direction plus a bitmask of held actions).
+The MotionRecognizer consumes the same per-frame samples and advances every
+motion pattern incrementally, so recognition cost does not grow with the
+buffer length or with how long a direction has been held.
+"""
+import config as c
+
+
+# Bit position of each action in the per-frame action bitmask
+ACTION_INDEX = {action: i for i, action in enumerate(c.ACTIONS)}
+ACTION_BITS = {action: 1 << i for action, i in ACTION_INDEX.items()}
+
+# Frame value meaning "never"
+NO_FRAME = -1 << 30
+
+# Component directions for each compound direction (used by charge inputs)
+DIRECTION_COMPONENTS = {
+    'neutral': (),
+    'up': ('up',),
+    'down': ('down',),
+    'forward': ('forward',),
+    'back': ('back',),
+    'up_forward': ('up', 'forward'),
+    'up_back': ('up', 'back'),
+    'down_forward': ('down', 'forward'),
+    'down_back': ('down', 'back'),
+}
+
+
+class ControlMap:
+    """
+    One player's control bindings compiled into bitmask lookup tables.
+
+    The keyboard table pairs each bound key with the bits of every action
+    bound to it; the joystick tables map held button strings ('0', 'H1', ...)
+    and digital axis tuples straight to action bits. Reading a device is one
+    pass over its table or over its held inputs, however many actions
+    there are. remap() changes a binding and recompiles.
+    """
+
+    def __init__(self, keys, buttons, axes, hats=c.HAT_BUTTONS):
+        """
+        Initialize and compile bindings
+
+        Args:
+            keys: Action -> pygame key code
+            buttons: Action -> joystick button string
+            axes: Action -> (axis, direction)
+            hats: Hat button string ('H0'..'H3') -> action
+        """
+        self.keys = dict(keys)
+        self.buttons = dict(buttons)
+        self.axes = dict(axes)
+        self.hats = dict(hats)
+        self.compile()
+
+    def compile(self):
+        """Rebuild the lookup tables from the current bindings"""
+        key_bits = {}
+        for action, key in self.keys.items():
+            key_bits[key] = key_bits.get(key, 0) | ACTION_BITS[action]
+        self.key_bits = key_bits
+        self.key_table = tuple(key_bits.items())
+
+        button_bits = {}
+        for action, button in self.buttons.items():
+            button_bits[button] = button_bits.get(button, 0) | ACTION_BITS[action]
+        for button, action in self.hats.items():
+            button_bits[button] = button_bits.get(button, 0) | ACTION_BITS[action]
+        self.button_bits = button_bits
+
+        axis_bits = {}
+        for action, axis in self.axes.items():
+            axis = tuple(axis)
+            axis_bits[axis] = axis_bits.get(axis, 0) | ACTION_BITS[action]
+        self.axis_bits = axis_bits
+
+    def remap(self, action, key=None, button=None, axis=None):
+        """
+        Rebind an action and recompile
+
+        Args:
+            action: Action name from config.ACTIONS
+            key: New pygame key code (None = unchanged)
+            button: New joystick button string (None = unchanged)
+            axis: New (axis, direction) (None = unchanged)
+        """
+        if action not in ACTION_BITS:
+            raise ValueError(f"Unknown action: {action}")
+        if key is not None:
+            self.keys[action] = key
+        if button is not None:
+            self.buttons[action] = button
+        if axis is not None:
+            self.axes[action] = tuple(axis)
+        self.compile()
+
+    def keyboard_bits(self, pressed):
+        """
+        Actions held on the keyboard
+
+        Args:
+            pressed: Key state from pygame.key.get_pressed()
+
+        Returns:
+            Action bitmask
+        """
+        bits = 0
+        for key, key_bits in self.key_table:
+            if pressed[key]:
+                bits |= key_bits
+        return bits
+
+    def joystick_bits(self, state):
+        """
+        Actions held on a joystick
+
+        Args:
+            state: {'buttons': held button strings, 'axis': held (axis, direction) tuples}
+
+        Returns:
+            Action bitmask
+        """
+        bits = 0
+        button_bits = self.button_bits
+        for button in state['buttons']:
+            bits |= button_bits.get(button, 0)
+        axis_bits = self.axis_bits
+        for axis in state['axis']:
+            bits |= axis_bits.get(axis, 0)
+        return bits
+
+
+class InputHistory:
+    """
+    Fixed-size ring buffer of per-frame input samples.
+
+    Frame numbers are fighter-local and increase by one per recorded sample.
+    The frame each action was last pressed (went from up to down) is kept
+    per action, so buffered presses can be looked up without a scan.
+    """
+
+    def __init__(self, size=c.INPUT_BUFFER_FRAMES):
+        """
+        Initialize history
+
+        Args:
+            size: Number of frames kept
+        """
+        self.size = size
+        self.directions = ['neutral'] * size
+        self.actions = [0] * size
+        self.last_press = [NO_FRAME] * len(ACTION_INDEX)  # By action index
+        self.frame = -1  # Frame number of the most recent sample
+
+    def record(self, direction, action_bits=0):
+        """
+        Record this frame's input
+
+        Args:
+            direction: Direction name from DIRECTION_COMPONENTS
+            action_bits: Bitmask of held actions (see ACTION_BITS)
+
+        Returns:
+            Frame number of the new sample
+        """
+        pressed = action_bits & ~self.actions[self.frame % self.size]
+        self.frame += 1
+        slot = self.frame % self.size
+        self.directions[slot] = direction
+        self.actions[slot] = action_bits
+
+        # Remember press frame for each newly pressed action
+        while pressed:
+            low_bit = pressed & -pressed
+            self.last_press[low_bit.bit_length() - 1] = self.frame
+            pressed ^= low_bit
+        return self.frame
+
+    def clear(self):
+        """Forget all samples (frame numbering continues)"""
+        for i in range(self.size):
+            self.directions[i] = 'neutral'
+            self.actions[i] = 0
+        for i in range(len(self.last_press)):
+            self.last_press[i] = NO_FRAME
+
+
+class MotionRecognizer:
+    """
+    Incremental matcher for all motion inputs at once.
+
+    Sequence motions (config.MOTION_INPUTS) allow gaps between steps. For
+    each pattern prefix the recognizer keeps the latest frame a match of
+    that prefix could have started, so a new direction only updates those
+    prefixes ending in it. Charge motions (config.CHARGE_INPUTS) track when
+    the hold direction was entered. Work happens only when the direction
+    changes, and is bounded by the total pattern length.
+    """
+
+    NO_MATCH = NO_FRAME
+
+    def __init__(self, motions=None, charges=None):
+        """
+        Compile motion patterns
+
+        Args:
+            motions: Dict of motion name -> direction sequence
+                (default config.MOTION_INPUTS)
+            charges: Dict of charge name -> {'hold', 'frames', 'release'}
+                (default config.CHARGE_INPUTS)
+        """
+        motions = c.MOTION_INPUTS if motions is None else motions
+        charges = c.CHARGE_INPUTS if charges is None else charges
+
+        # Sequence motions: direction -> [(motion, prefix_len), ...] with prefix
+        # lengths descending so each step reads the previous prefix's old value
+        self.sequences = {}
+        self.windows = {}
+        self.steps_by_direction = {}
+        for name, pattern in motions.items():
+            self.sequences[name] = [self.NO_MATCH] * (len(pattern) + 1)
+            self.windows[name] = c.MOTION_INPUT_WINDOWS.get(name, c.MOTION_INPUT_WINDOW)
+            for k in range(len(pattern), 0, -1):
+                self.steps_by_direction.setdefault(pattern[k - 1], []).append((name, k))
+
+        # Charge motions
+        self.charges = charges
+        self.charge_hold_since = {name: None for name in charges}
+        self.charge_ready_until = {name: self.NO_MATCH for name in charges}
+        for name in charges:
+            self.windows[name] = c.MOTION_INPUT_WINDOWS.get(name, c.MOTION_INPUT_WINDOW)
+
+        # Start frame of the latest completion of each motion
+        self.completed = {name: self.NO_MATCH for name in self.windows}
+        self.last_direction = 'neutral'
+
+    def feed(self, direction, frame):
+        """
+        Advance all motions by one frame's direction
+
+        Args:
+            direction: Direction name for this frame
+            frame: Frame number of the sample
+        """
+        if direction == self.last_direction:
+            return
+        self.last_direction = direction
+
+        for name, k in self.steps_by_direction.get(direction, ()):
+            prefixes = self.sequences[name]
+            start = frame if k == 1 else prefixes[k - 1]
+            if start > prefixes[k]:
+                prefixes[k] = start
+                if k == len(prefixes) - 1:
+                    self.completed[name] = start
+
+        components = DIRECTION_COMPONENTS.get(direction, ())
+        for name, charge in self.charges.items():
+            if charge['hold'] in components:
+                if self.charge_hold_since[name] is None:
+                    self.charge_hold_since[name] = frame
+                continue
+            hold_since = self.charge_hold_since[name]
+            if hold_since is not None:
+                self.charge_hold_since[name] = None
+                if frame - hold_since >= charge['frames']:
+                    self.charge_ready_until[name] = frame + self.windows[name]
+            if charge['release'] in components and frame <= self.charge_ready_until[name]:
+                self.completed[name] = frame
+                self.charge_ready_until[name] = self.NO_MATCH
+
+    def check(self, name, frame):
+        """
+        Check if a motion was completed within its window
+
+        Args:
+            name: Motion name
+            frame: Current frame number
+
+        Returns:
+            True if the motion's latest completion started inside its window
+        """
+        start = self.completed.get(name)
+        if start is None:
+            return False
+        return frame - start < self.windows[name]
+
+    def consume(self, name):
+        """Mark a motion as used so it does not fire again"""
+        if name in self.sequences:
+            prefixes = self.sequences[name]
+            for k in range(len(prefixes)):
+                prefixes[k] = self.NO_MATCH
+        self.completed[name] = self.NO_MATCH
+
+    def reset(self):
+        """Clear all partial and completed motions"""
+        for prefixes in self.sequences.values():
+            for k in range(len(prefixes)):
+                prefixes[k] = self.NO_MATCH
+        for name in self.charges:
+            self.charge_hold_since[name] = None
+            self.charge_ready_until[name] = self.NO_MATCH
+        for name in self.completed:
+            self.completed[name] = self.NO_MATCH
+        self.last_direction = 'neutral'
@@ -22,17 +22,30 @@ Key-Map for Arcade Machine:
 | p1 (RESET)   | 5      |
 | Select       | 8      |
 | Start        | 9      |
+
+Each device is given a player slot (0 = P1, 1 = P2) when it connects, and
+callbacks receive that slot as joystick_id. Slots are remembered by device
+GUID in config.JOYSTICK_SLOTS_FILE, so a stick unplugged mid-match comes
+back as the same player.
 """
 
 from pygame_compat import pygame
+import json
+import os
 import sys
+import config as c
 
-# Store state for all connected joysticks
+# Store state for all connected joysticks (keyed by player slot)
 _joysticks = {}
 _all_buttons_down = {}  # Track which buttons are held for each joystick
 _all_axis_down = {}     # Track digital axis state for each joystick
 _last_joy_axis = {}     # Track last axis values for detecting changes
 
+# Player slot assignment
+_instance_slots = {}    # SDL instance id -> player slot (the only per-event lookup)
+_saved_slots = {}       # Device GUID -> slots it has been given, in connection order
+_slots_file = None      # Where _saved_slots is persisted (None = not persisted)
+
 # Callback functions that users can override
 _on_joy_press_callback = None
 _on_joy_release_callback = None
@@ -41,8 +54,17 @@ _on_digital_joy_axis_callback = None
 _on_joy_axis_callback = None
 
 
-def init():
-    """Initialize the joystick subsystem. Call this after pygame.init()"""
+def init(slots_file=c.JOYSTICK_SLOTS_FILE):
+    """
+    Initialize the joystick subsystem. Call this after pygame.init()
+    
+    Args:
+        slots_file: JSON file remembering each device's player slot (None = don't persist)
+    """
+    global _slots_file
+    _slots_file = slots_file
+    _load_slots()
+    
     # Use try/except for arcade box compatibility (some pygame builds lack get_init)
     try:
         if hasattr(pygame.joystick, 'get_init'):
@@ -59,12 +81,123 @@ def init():
     
     # Initialize all connected joysticks
     for i in range(pygame.joystick.get_count()):
-        joy = pygame.joystick.Joystick(i)
-        joy.init()
-        _joysticks[joy.get_instance_id()] = joy
-        _all_buttons_down[joy.get_instance_id()] = set()
-        _all_axis_down[joy.get_instance_id()] = set()
-        print(f"Joystick connected: {joy.get_name()} (ID: {joy.get_instance_id()})")
+        _connect(i)
+
+
+def _device_guid(joy):
+    """Stable identifier for a device model (arcade box pygame builds may lack get_guid)"""
+    if hasattr(joy, 'get_guid'):
+        return joy.get_guid()
+    return joy.get_name()
+
+
+def _load_slots():
+    """Read remembered GUID -> slot assignments"""
+    _saved_slots.clear()
+    if not _slots_file or not os.path.exists(_slots_file):
+        return
+    try:
+        with open(_slots_file) as f:
+            saved = json.load(f)
+        for guid, slots in saved.items():
+            _saved_slots[guid] = [int(slot) for slot in slots]
+    except (OSError, ValueError, AttributeError, TypeError) as e:
+        print(f"Ignoring joystick slot file {_slots_file}: {e}")
+
+
+def _save_slots():
+    """Write remembered GUID -> slot assignments"""
+    if not _slots_file:
+        return
+    try:
+        temp_path = _slots_file + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(_saved_slots, f, indent=1)
+        os.replace(temp_path, _slots_file)
+    except OSError as e:
+        print(f"Could not save joystick slots to {_slots_file}: {e}")
+
+
+def _assign_slot(guid):
+    """
+    Pick the player slot for a connecting device
+    
+    Devices of the same model share a GUID, so each GUID remembers a list of
+    slots: the nth such device connected gets the nth free one. A device
+    seen for the first time prefers slots no other device has used.
+    
+    Args:
+        guid: Device GUID
+        
+    Returns:
+        (slot, is_new) - slot is None if every slot is taken
+    """
+    remembered = _saved_slots.setdefault(guid, [])
+    for slot in remembered:
+        if slot not in _joysticks and slot < c.JOYSTICK_SLOTS:
+            return slot, False
+    
+    free = [slot for slot in range(c.JOYSTICK_SLOTS) if slot not in _joysticks]
+    if not free:
+        return None, False
+    others = {slot for other, slots in _saved_slots.items() if other != guid for slot in slots}
+    slot = next((slot for slot in free if slot not in others), free[0])
+    remembered.append(slot)
+    _save_slots()
+    return slot, True
+
+
+def _connect(device_index):
+    """Open a device and give it a player slot"""
+    joy = pygame.joystick.Joystick(device_index)
+    instance_id = joy.get_instance_id()
+    if instance_id in _instance_slots:
+        return  # Already open (devices present at init() are also reported by JOYDEVICEADDED)
+    joy.init()
+    
+    slot, is_new = _assign_slot(_device_guid(joy))
+    if slot is None:
+        print(f"Joystick ignored, all {c.JOYSTICK_SLOTS} player slots taken: {joy.get_name()}")
+        return
+    _instance_slots[instance_id] = slot
+    _joysticks[slot] = joy
+    _all_buttons_down[slot] = set()
+    _all_axis_down[slot] = set()
+    print(f"Joystick connected as P{slot + 1}: {joy.get_name()}")
+    
+    # Rumble the first time a device is given a slot, so players can tell which stick is theirs
+    if is_new:
+        try:
+            joy.rumble(0, 0.7, 500)
+        except Exception:
+            pass
+
+
+def _disconnect(instance_id):
+    """Free a device's slot and release everything it was holding"""
+    slot = _instance_slots.pop(instance_id, None)
+    if slot is None:
+        return
+    del _joysticks[slot]
+    print(f"Joystick disconnected: P{slot + 1}")
+    
+    for button in list(_all_buttons_down.pop(slot, ())):
+        if _on_joy_release_callback:
+            _on_joy_release_callback(button, slot)
+    if _all_axis_down.pop(slot, None) and _on_digital_joy_axis_callback:
+        _on_digital_joy_axis_callback([], slot)
+    for key in [key for key in _last_joy_axis if key.startswith(f"J{slot}A") or key == f"J{slot}H"]:
+        del _last_joy_axis[key]
+
+
+def get_joystick(slot):
+    """Get the open Joystick for a player slot, or None"""
+    return _joysticks.get(slot)
+
+
+def get_slot(instance_id):
+    """Get the player slot of an SDL joystick instance id, or None"""
+    return _instance_slots.get(instance_id)
 
 
 def set_callbacks(on_press=None, on_release=None, on_hold=None, on_digital_axis=None, on_axis=None):
@@ -88,6 +221,9 @@ def set_callbacks(on_press=None, on_release=None, on_hold=None, on_digital_axis=
     _on_joy_axis_callback = on_axis
 
 
+_INPUT_EVENTS = (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYHATMOTION, pygame.JOYAXISMOTION)
+
+
 def handle_event(event):
     """
     Process a pygame event for joystick input.
@@ -100,52 +236,34 @@ def handle_event(event):
         True if event was a joystick event, False otherwise
     """
     if event.type == pygame.JOYDEVICEADDED:
-        joy = pygame.joystick.Joystick(event.device_index)
-        joy.init()
-        _joysticks[joy.get_instance_id()] = joy
-        _all_buttons_down[joy.get_instance_id()] = set()
-        _all_axis_down[joy.get_instance_id()] = set()
-        print(f"Joystick connected: {joy.get_name()} (ID: {joy.get_instance_id()})")
-        # Rumble if supported
-        try:
-            joy.rumble(0, 0.7, 500)
-        except Exception:
-            pass
+        _connect(event.device_index)
         return True
         
     elif event.type == pygame.JOYDEVICEREMOVED:
-        if event.instance_id in _joysticks:
-            print(f"Joystick disconnected: ID {event.instance_id}")
-            del _joysticks[event.instance_id]
-            if event.instance_id in _all_buttons_down:
-                del _all_buttons_down[event.instance_id]
-            if event.instance_id in _all_axis_down:
-                del _all_axis_down[event.instance_id]
-            # Clean up axis history
-            keys_to_remove = [k for k in _last_joy_axis if k.startswith(f"J{event.instance_id}")]
-            for k in keys_to_remove:
-                del _last_joy_axis[k]
-        return True
-        
-    elif event.type == pygame.JOYBUTTONDOWN:
-        _handle_button_press(str(event.button), event.instance_id)
+        _disconnect(event.instance_id)
         return True
+    
+    if event.type not in _INPUT_EVENTS:
+        return False
+    slot = _instance_slots.get(event.instance_id)
+    if slot is None:
+        return True  # Device without a player slot
+    
+    if event.type == pygame.JOYBUTTONDOWN:
+        _handle_button_press(str(event.button), slot)
         
     elif event.type == pygame.JOYBUTTONUP:
-        _handle_button_release(str(event.button), event.instance_id)
-        return True
+        _handle_button_release(str(event.button), slot)
         
     elif event.type == pygame.JOYHATMOTION:
-        _handle_hat_motion(event.value, event.instance_id)
-        return True
+        _handle_hat_motion(event.value, slot)
         
     elif event.type == pygame.JOYAXISMOTION:
-        _handle_digital_axis(event.value, event.axis, event.instance_id)
+        _handle_digital_axis(event.value, event.axis, slot)
         if _on_joy_axis_callback:
-            _on_joy_axis_callback(event.value, event.axis, event.instance_id)
-        return True
+            _on_joy_axis_callback(event.value, event.axis, slot)
     
-    return False
+    return True
 
 
 def update():
@@ -310,4 +428,5 @@ def quit():
     _all_buttons_down.clear()
     _all_axis_down.clear()
     _last_joy_axis.clear()
+    _instance_slots.clear()
     pygame.joystick.quit()
@@ -0,0 +1,182 @@
+"""
+Input-to-display latency instrumentation for CMUQ Arena
+Each keyboard / joystick event is timestamped when Game.run's event loop
+reads it and followed through three stages:
+  sample  - first simulation frame whose fighter's input bits changed after it
+  state   - first simulation frame where that fighter's action state changed
+  display - first display.flip() after that state change
+Events are matched to their player (keyboard bindings / joystick slot) and
+only that fighter is compared. State is discrete action flags, so inputs
+that only move the fighter (walking without turning) are not measured.
+Times are from perf_counter; time the event spent in SDL's queue before the
+loop polled it is not included (INPUT_POLLING narrows that gap).
+
+Enable with MEASURE_LATENCY = True or `python main.py --measure-latency`.
+"""
+
+import time
+import config as c
+from inputpoll import INPUT_EVENT_TYPES
+
+
+STAGES = ('sample', 'state', 'display')
+
+
+def fighter_signature(fighter):
+    """Discrete fighter action state used to detect that an input took effect"""
+    return (fighter.facing_right, fighter.attacking, fighter.attack_type, fighter.blocking,
+            fighter.jumping, fighter.dashing, fighter.parrying, fighter.animation_state)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class LatencyProbe:
+    """
+    Follows input events to the frame that displays their effect.
+
+    Game.run calls on_event() for every pygame event during a fight and
+    on_flip() after display.flip(); Game._step_fight calls before_frame() /
+    after_frame() around each simulation frame, and _start_fight calls
+    clear_pending().
+    """
+
+    def __init__(self, report_samples=c.LATENCY_REPORT_SAMPLES, timeout_frames=c.LATENCY_TIMEOUT_FRAMES):
+        """
+        Initialize probe
+
+        Args:
+            report_samples: Print a report every this many completed samples
+                (0 = only when report() is called)
+            timeout_frames: Real simulation frames after which an event that
+                never changed the input or the state is dropped
+        """
+        self.report_samples = report_samples
+        self.timeout_frames = timeout_frames
+        self.waiting_sample = ([], [])  # Per player: (event time, frame when read)
+        self.waiting_state = ([], [])  # Per player: (event time, sample time, sample frame)
+        self.waiting_display = []  # (event time, sample time, state time, frames sample->state)
+        self.samples = []  # (sample ms, state ms, display ms, frames to state)
+        self.unmatched = 0
+        self.next_report = report_samples
+        self.frame = 0
+        self._bits = [0, 0]
+        self._signatures = [None, None]
+
+    def clear_pending(self):
+        """Forget events still in flight (e.g. from the end of the last fight)"""
+        for pending in self.waiting_sample + self.waiting_state:
+            pending.clear()
+        self.waiting_display.clear()
+
+    def on_event(self, event, slots, timestamp=None):
+        """
+        Timestamp an input event
+
+        Args:
+            event: pygame event
+            slots: Players the event is bound to (0 = P1, 1 = P2)
+            timestamp: perf_counter time it was read (None = now)
+        """
+        if event.type in INPUT_EVENT_TYPES and slots:
+            entry = (time.perf_counter() if timestamp is None else timestamp, self.frame)
+            for slot in slots:
+                self.waiting_sample[slot].append(entry)
+
+    def before_frame(self, game):
+        """Remember fighter state before a simulation frame"""
+        self._signatures[0] = fighter_signature(game.p1)
+        self._signatures[1] = fighter_signature(game.p2)
+
+    def after_frame(self, game):
+        """Advance pending events whose fighter's input or state changed this frame"""
+        if not game.headless:
+            self.frame += 1  # Timeouts count real frames only (not run-ahead / rollback)
+        now = time.perf_counter()
+        for slot, fighter in enumerate((game.p1, game.p2)):
+            bits = fighter.input_bits
+            input_changed = bits != self._bits[slot]
+            self._bits[slot] = bits
+            waiting_state = self.waiting_state[slot]
+            waiting_sample = self.waiting_sample[slot]
+            if not waiting_state and not waiting_sample:
+                continue
+            state_changed = fighter_signature(fighter) != self._signatures[slot]
+
+            if waiting_state:
+                if state_changed:
+                    for event_time, sample_time, sample_frame in waiting_state:
+                        self.waiting_display.append((event_time, sample_time, now, self.frame - sample_frame))
+                    waiting_state.clear()
+                else:
+                    self._expire(waiting_state)
+
+            if waiting_sample:
+                if input_changed:
+                    for event_time, _ in waiting_sample:
+                        if state_changed:
+                            self.waiting_display.append((event_time, now, now, 0))
+                        else:
+                            waiting_state.append((event_time, now, self.frame))
+                    waiting_sample.clear()
+                else:
+                    self._expire(waiting_sample)
+
+    def _expire(self, pending):
+        """Drop events waiting longer than timeout_frames (last field is the frame they started waiting)"""
+        if self.frame - pending[0][-1] <= self.timeout_frames:
+            return  # Oldest entry is still in time
+        keep = [entry for entry in pending if self.frame - entry[-1] <= self.timeout_frames]
+        self.unmatched += len(pending) - len(keep)
+        pending[:] = keep
+
+    def on_flip(self):
+        """Complete every sample whose state change has now been displayed"""
+        if not self.waiting_display:
+            return
+        now = time.perf_counter()
+        for event_time, sample_time, state_time, frames in self.waiting_display:
+            self.samples.append(((sample_time - event_time) * 1000, (state_time - event_time) * 1000,
+                                 (now - event_time) * 1000, frames))
+        self.waiting_display.clear()
+        if self.report_samples and len(self.samples) >= self.next_report:
+            self.next_report += self.report_samples
+            self.report()
+
+    def summary(self):
+        """
+        Latency distribution per stage
+
+        Returns:
+            Dict of stage -> {'p50', 'p90', 'p99', 'max', 'mean'} in ms,
+            plus 'count', 'unmatched' and 'frames' (mean simulation frames
+            from input sample to state change)
+        """
+        result = {'count': len(self.samples), 'unmatched': self.unmatched}
+        if not self.samples:
+            return result
+        result['frames'] = sum(sample[3] for sample in self.samples) / len(self.samples)
+        for index, stage in enumerate(STAGES):
+            values = sorted(sample[index] for sample in self.samples)
+            result[stage] = {
+                'p50': percentile(values, 0.5),
+                'p90': percentile(values, 0.9),
+                'p99': percentile(values, 0.99),
+                'max': values[-1],
+                'mean': sum(values) / len(values),
+            }
+        return result
+
+    def report(self):
+        """Print the latency distribution"""
+        summary = self.summary()
+        print(f"[Latency] {summary['count']} inputs ({summary['unmatched']} never took effect), "
+              f"{summary.get('frames', 0):.2f} frames sample->state on average")
+        for stage in STAGES:
+            if stage in summary:
+                s = summary[stage]
+                print(f"[Latency]   event->{stage:8} p50 {s['p50']:6.1f}  p90 {s['p90']:6.1f}  "
+                      f"p99 {s['p99']:6.1f}  max {s['max']:6.1f}  mean {s['mean']:6.1f} ms")
@@ -1,5 +1,35 @@
+import argparse
+import config as c
 from game import Game
+from latency import LatencyProbe
+from inputpoll import InputPoller
+from netplay import UdpTransport
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CMUQ Arena")
+    parser.add_argument('--netplay', metavar='HOST[:PORT]',
+                        help="start a rollback netplay match against the cabinet at HOST")
+    parser.add_argument('--port', type=int, default=c.NETPLAY_PORT, help="local UDP port for netplay")
+    parser.add_argument('--side', type=int, choices=(1, 2), default=1, help="player this cabinet controls")
+    parser.add_argument('--p1', type=int, default=0, help="P1 character index (same on both cabinets)")
+    parser.add_argument('--p2', type=int, default=1, help="P2 character index (same on both cabinets)")
+    parser.add_argument('--seed', type=int, default=0, help="fight seed (same on both cabinets)")
+    parser.add_argument('--run-ahead', type=int, default=c.RUN_AHEAD_FRAMES, metavar='N',
+                        help="draw fights N steps ahead to hide display lag (not used in netplay)")
+    parser.add_argument('--measure-latency', action='store_true',
+                        help="report input-to-display latency (printed periodically and on exit)")
+    parser.add_argument('--poll-input', action='store_true',
+                        help="poll input at a high rate while waiting for the display")
+    args = parser.parse_args()
+    
     game = Game()
-    game.run()
\ No newline at end of file
+    game.run_ahead.frames = args.run_ahead
+    if args.measure_latency:
+        game.latency_probe = LatencyProbe()
+    if args.poll_input:
+        game.input_poller = InputPoller()
+    if args.netplay:
+        host, _, port = args.netplay.partition(':')
+        transport = UdpTransport((host, int(port) if port else c.NETPLAY_PORT), args.port)
+        game.start_netplay(transport, args.side - 1, args.p1, args.p2, args.seed)
+    game.run()
@@ -0,0 +1,439 @@
+"""
+Rollback netplay for CMUQ Arena
+GGPO-style: each cabinet simulates every step immediately, predicting the
+remote player's input (their last confirmed input repeated). When the real
+input arrives and differs from the prediction, the match is restored from
+the snapshot taken before that step (snapshot.py) and resimulated up to
+the present. Local input is delayed by NETPLAY_INPUT_DELAY steps to hide
+part of the latency.
+
+Inputs travel over plain UDP. Every packet carries all inputs the peer has
+not acknowledged yet, so a lost packet is covered by the next one.
+
+Loopback test - two simulated cabinets in one process, no network:
+    python netplay.py --latency 80 --jitter 20 --loss 0.05
+"""
+
+import heapq
+import random
+import socket
+import struct
+import config as c
+from replay import state_hash
+from snapshot import MatchSnapshot, save_state, load_state
+
+
+PACKET_MAGIC = b'CQ'
+PACKET_INPUTS = 1
+# magic, packet type, frame of the first input, last frame received from peer, input count
+PACKET_HEADER = struct.Struct('!2sBiiB')
+
+
+def encode_packet(first_frame, ack_frame, inputs):
+    """
+    Build an input packet
+
+    Args:
+        first_frame: Frame of inputs[0]
+        ack_frame: Last frame of the peer's input received (contiguous)
+        inputs: Action bitmasks for consecutive frames
+
+    Returns:
+        Packet bytes
+    """
+    return (PACKET_HEADER.pack(PACKET_MAGIC, PACKET_INPUTS, first_frame, ack_frame, len(inputs))
+            + struct.pack(f'!{len(inputs)}H', *inputs))
+
+
+def decode_packet(data):
+    """
+    Parse an input packet
+
+    Returns:
+        (first_frame, ack_frame, inputs) or None if the packet is not ours
+    """
+    if len(data) < PACKET_HEADER.size:
+        return None
+    magic, packet_type, first_frame, ack_frame, count = PACKET_HEADER.unpack_from(data)
+    if magic != PACKET_MAGIC or packet_type != PACKET_INPUTS:
+        return None
+    if len(data) != PACKET_HEADER.size + 2 * count:
+        return None
+    return first_frame, ack_frame, struct.unpack_from(f'!{count}H', data, PACKET_HEADER.size)
+
+
+class UdpTransport:
+    """Non-blocking UDP socket talking to one peer"""
+
+    def __init__(self, peer, port=c.NETPLAY_PORT):
+        """
+        Open socket
+
+        Args:
+            peer: (host, port) of the other cabinet
+            port: Local port to listen on
+        """
+        self.peer = (socket.gethostbyname(peer[0]), peer[1])
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('', port))
+        self.sock.setblocking(False)
+
+    def send(self, data):
+        """Send a packet (errors such as an unreachable peer are ignored)"""
+        try:
+            self.sock.sendto(data, self.peer)
+        except OSError:
+            pass
+
+    def receive(self):
+        """
+        Get every packet waiting from the peer
+
+        Returns:
+            List of packet bytes
+        """
+        packets = []
+        while True:
+            try:
+                data, address = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                continue  # e.g. ICMP port unreachable reported on Linux
+            if address == self.peer:
+                packets.append(data)
+        return packets
+
+    def close(self):
+        self.sock.close()
+
+
+class LoopbackNetwork:
+    """
+    In-process network between two endpoints with simulated latency,
+    jitter (which also reorders packets) and packet loss.
+
+    Time is virtual: call advance() once per simulated step.
+    """
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, loss=0.0, seed=0):
+        """
+        Args:
+            latency_ms: One-way delay
+            jitter_ms: Random extra delay in [-jitter, +jitter]
+            loss: Probability a packet is dropped
+            seed: Seed for the loss / jitter random stream
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.now_ms = 0.0
+        self.in_flight = ([], [])  # Heap of (arrival time, sequence, data) per endpoint
+        self.sequence = 0
+        self.sent = 0
+        self.dropped = 0
+
+    def endpoints(self):
+        """Get the two transports"""
+        return LoopbackTransport(self, 0), LoopbackTransport(self, 1)
+
+    def advance(self, ms):
+        """Move virtual time forward"""
+        self.now_ms += ms
+
+    def send(self, destination, data):
+        """Queue a packet for an endpoint (or drop it)"""
+        self.sent += 1
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms))
+        self.sequence += 1
+        heapq.heappush(self.in_flight[destination], (self.now_ms + delay, self.sequence, data))
+
+    def receive(self, endpoint):
+        """Take the packets that have arrived at an endpoint"""
+        queue = self.in_flight[endpoint]
+        packets = []
+        while queue and queue[0][0] <= self.now_ms:
+            packets.append(heapq.heappop(queue)[2])
+        return packets
+
+
+class LoopbackTransport:
+    """One end of a LoopbackNetwork (same interface as UdpTransport)"""
+
+    def __init__(self, network, index):
+        self.network = network
+        self.index = index
+
+    def send(self, data):
+        self.network.send(1 - self.index, data)
+
+    def receive(self):
+        return self.network.receive(self.index)
+
+    def close(self):
+        pass
+
+
+class RollbackSession:
+    """
+    Rollback netplay session driving one Game.
+
+    One session step is one fixed simulation step (Game._step_fight), so
+    hit-stop and slow motion stay in sync on both cabinets. The match end
+    is not rolled back: GAME_OVER is reached long after the KO, by which
+    time every input that could affect it is confirmed.
+    """
+
+    def __init__(self, game, local_slot, transport, input_delay=c.NETPLAY_INPUT_DELAY,
+                 max_rollback=c.NETPLAY_MAX_ROLLBACK):
+        """
+        Take over input for a fight that has just been started
+
+        Args:
+            game: Game in the FIGHT state
+            local_slot: 0 if this side plays P1, 1 for P2
+            transport: UdpTransport or LoopbackTransport to the peer
+            input_delay: Steps local input is delayed by
+            max_rollback: Max steps simulated past the last confirmed
+                remote input; beyond that the session stalls
+        """
+        self.game = game
+        self.local_slot = local_slot
+        self.transport = transport
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        self.local_fighter = game.p2 if local_slot else game.p1
+
+        self.frame = 0  # Next step to simulate
+        self.local_inputs = [0] * input_delay  # By step (delay steps ahead of self.frame)
+        self.remote_inputs = []  # Confirmed remote inputs by step (contiguous)
+        self.pending_remote = {}  # Remote inputs received after a gap
+        self.predicted = []  # Remote input each simulated step used
+        self.peer_ack = -1  # Last local step the peer has received
+        self.rollback_frame = None  # Earliest mispredicted step
+        self.snapshots = [MatchSnapshot() for _ in range(max_rollback + 2)]
+        self.frame_inputs = [0, 0]  # P1 / P2 input for the step being simulated
+
+        self.connected = False
+        self.disconnected = False
+        self.idle_steps = 0
+        self.record_hashes = False  # Keep frame_hashes (desync checks)
+        self.frame_hashes = []  # State hash after each step (valid once the step is confirmed)
+
+        # Stats
+        self.rollbacks = 0
+        self.resimulated_frames = 0
+        self.max_rollback_depth = 0
+        self.stalls = 0
+
+        inputs = self.frame_inputs
+        game.p1.input_source = lambda: inputs[0]
+        game.p2.input_source = lambda: inputs[1]
+        game.replay_recorder = None  # Resimulation would record steps twice
+
+    def tick(self, local_bits=None):
+        """
+        Run one step: read the network, roll back if needed, simulate
+
+        Args:
+            local_bits: Local action bitmask (None polls the local fighter)
+
+        Returns:
+            True if a step was simulated, False if stalled waiting for the peer
+        """
+        if local_bits is None:
+            local_bits = self.local_fighter.poll_input()
+
+        self.poll()
+        if self.rollback_frame is not None:
+            self._rollback()
+
+        if self.frame - len(self.remote_inputs) >= self.max_rollback:
+            self.stalls += 1
+            self._send()
+            return False
+
+        self.local_inputs.append(local_bits)  # Input for step self.frame + input_delay
+        if self.game.state == "FIGHT":
+            # Rollback restored prev_x / prev_y from an older step; interpolate from the present
+            self.game._store_render_positions()
+        self._simulate(self.frame)
+        self.frame += 1
+        self._send()
+        return True
+
+    def poll(self):
+        """Receive remote inputs and note the earliest misprediction"""
+        received = False
+        remote_inputs = self.remote_inputs
+        pending = self.pending_remote
+        for data in self.transport.receive():
+            packet = decode_packet(data)
+            if packet is None:
+                continue
+            received = True
+            first_frame, ack_frame, inputs = packet
+            if ack_frame > self.peer_ack:
+                self.peer_ack = ack_frame
+            for offset, bits in enumerate(inputs):
+                if first_frame + offset >= len(remote_inputs):
+                    pending[first_frame + offset] = bits
+
+            # Confirm inputs that are now contiguous
+            while len(remote_inputs) in pending:
+                frame = len(remote_inputs)
+                bits = pending.pop(frame)
+                remote_inputs.append(bits)
+                if frame < self.frame and self.predicted[frame] != bits:
+                    if self.rollback_frame is None or frame < self.rollback_frame:
+                        self.rollback_frame = frame
+
+        if received:
+            self.connected = True
+            self.idle_steps = 0
+        elif self.connected:
+            self.idle_steps += 1
+            if self.idle_steps > c.NETPLAY_TIMEOUT_FRAMES:
+                self.disconnected = True
+
+    def _remote_input(self, frame):
+        """Confirmed remote input for a step, or the prediction"""
+        remote_inputs = self.remote_inputs
+        if frame < len(remote_inputs):
+            return remote_inputs[frame]
+        return remote_inputs[-1] if remote_inputs else 0
+
+    def _simulate(self, frame):
+        """Snapshot, then simulate one step with its inputs"""
+        game = self.game
+        save_state(game, self.snapshots[frame % len(self.snapshots)])
+
+        remote = self._remote_input(frame)
+        if frame < len(self.predicted):
+            self.predicted[frame] = remote
+        else:
+            self.predicted.append(remote)
+        self.frame_inputs[self.local_slot] = self.local_inputs[frame]
+        self.frame_inputs[1 - self.local_slot] = remote
+
+        if game.state == "FIGHT":
+            game._step_fight()
+        if self.record_hashes:
+            if frame < len(self.frame_hashes):
+                self.frame_hashes[frame] = state_hash(game)
+            else:
+                self.frame_hashes.append(state_hash(game))
+
+    def _rollback(self):
+        """Restore the first mispredicted step and resimulate to the present"""
+        start = self.rollback_frame
+        self.rollback_frame = None
+        depth = self.frame - start
+        load_state(self.game, self.snapshots[start % len(self.snapshots)])
+
+        # Effects of the replaced steps were already shown; don't queue them again
+        events = self.game.combat_system.events
+        record = events.record
+        events.record = False
+        self.game.headless = True
+        for frame in range(start, self.frame):
+            self._simulate(frame)
+        self.game.headless = False
+        events.record = record
+
+        self.rollbacks += 1
+        self.resimulated_frames += depth
+        self.max_rollback_depth = max(self.max_rollback_depth, depth)
+
+    def _send(self):
+        """Send every local input the peer hasn't acknowledged"""
+        first = max(self.peer_ack + 1, len(self.local_inputs) - c.NETPLAY_MAX_INPUTS_PER_PACKET)
+        self.transport.send(encode_packet(first, len(self.remote_inputs) - 1, self.local_inputs[first:]))
+
+    def confirmed_frames(self):
+        """Number of steps simulated with confirmed inputs on both sides"""
+        return min(self.frame, len(self.remote_inputs))
+
+    def close(self):
+        """Hand input back to the fighters and close the transport"""
+        self.game.p1.input_source = None
+        self.game.p2.input_source = None
+        self.transport.close()
+
+
+def run_loopback(steps=1200, latency_ms=60.0, jitter_ms=10.0, loss=0.0,
+                 input_delay=c.NETPLAY_INPUT_DELAY, max_rollback=c.NETPLAY_MAX_ROLLBACK,
+                 seed=1, characters=(0, 2)):
+    """
+    Play a match between two in-process cabinets over a LoopbackNetwork
+
+    Both sides press random buttons; afterwards the state hashes of every
+    step confirmed on both sides are compared.
+
+    Returns:
+        Dict of results (desyncs, rollbacks, stalls, ...)
+    """
+    from game import Game
+
+    network = LoopbackNetwork(latency_ms, jitter_ms, loss, seed)
+    sessions = []
+    for slot, transport in enumerate(network.endpoints()):
+        game = Game()
+        game.start_netplay(transport, slot, characters[0], characters[1], seed,
+                           input_delay=input_delay, max_rollback=max_rollback)
+        game.netplay.record_hashes = True
+        sessions.append(game.netplay)
+
+    players = [random.Random(seed * 2 + slot) for slot in (0, 1)]
+    held = [0, 0]
+    step_ms = 1000.0 / c.FPS
+    for step in range(steps):
+        network.advance(step_ms)
+        for slot, session in enumerate(sessions):
+            if step % 6 == 0:
+                held[slot] = sum(1 << i for i in range(len(c.ACTIONS)) if players[slot].random() < 0.15)
+            session.tick(held[slot])
+            session.game.combat_system.events.drain()
+
+    hashes_a, hashes_b = sessions[0].frame_hashes, sessions[1].frame_hashes
+    compared = min(session.confirmed_frames() for session in sessions)
+    desyncs = [frame for frame in range(compared) if hashes_a[frame] != hashes_b[frame]]
+    return {
+        'steps': [session.frame for session in sessions],
+        'compared': compared,
+        'first_desync': desyncs[0] if desyncs else None,
+        'rollbacks': [session.rollbacks for session in sessions],
+        'resimulated': [session.resimulated_frames for session in sessions],
+        'max_depth': [session.max_rollback_depth for session in sessions],
+        'stalls': [session.stalls for session in sessions],
+        'packets_sent': network.sent,
+        'packets_dropped': network.dropped,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import sys
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    parser = argparse.ArgumentParser(description="Rollback netplay loopback test")
+    parser.add_argument('--steps', type=int, default=1200)
+    parser.add_argument('--latency', type=float, default=60.0, help="one-way latency (ms)")
+    parser.add_argument('--jitter', type=float, default=10.0, help="latency jitter (ms)")
+    parser.add_argument('--loss', type=float, default=0.0, help="packet loss probability")
+    parser.add_argument('--delay', type=int, default=c.NETPLAY_INPUT_DELAY, help="input delay (steps)")
+    parser.add_argument('--rollback', type=int, default=c.NETPLAY_MAX_ROLLBACK, help="max rollback (steps)")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    results = run_loopback(args.steps, args.latency, args.jitter, args.loss,
+                           args.delay, args.rollback, args.seed)
+    for key, value in results.items():
+        print(f"{key:16} {value}")
+    sys.exit(1 if results['first_desync'] is not None else 0)
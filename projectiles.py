@@ -0,0 +1,77 @@
+"""
+Batched projectile updates and lookup-table trig.
+
+ProjectileSystem keeps active projectiles grouped by type and advances each
+group in one pass (the type's update_all), so per-frame cost is a tight
+loop per type rather than a method call per projectile. Projectile
+kinematics use the sine table below instead of math.sin/cos/atan2.
+"""
+import math
+
+
+# Sine lookup table: TRIG_TABLE_SIZE steps per full turn
+TRIG_TABLE_SIZE = 4096
+TRIG_TABLE_MASK = TRIG_TABLE_SIZE - 1
+TRIG_STEPS_PER_RADIAN = TRIG_TABLE_SIZE / (2 * math.pi)
+COS_OFFSET = TRIG_TABLE_SIZE // 4  # cos(a) = sin(a + quarter turn)
+SINE_TABLE = tuple(math.sin(i / TRIG_STEPS_PER_RADIAN) for i in range(TRIG_TABLE_SIZE))
+COSINE_TABLE = SINE_TABLE[COS_OFFSET:] + SINE_TABLE[:COS_OFFSET]
+
+
+def angle_to_index(radians):
+    """Convert an angle in radians to a trig table index"""
+    return round(radians * TRIG_STEPS_PER_RADIAN) & TRIG_TABLE_MASK
+
+
+class ProjectileSystem:
+    """
+    Active projectiles grouped by type.
+
+    Supports the list operations the fight uses (append, extend, iteration,
+    len) so it can stand in for a plain list of projectiles.
+    """
+
+    def __init__(self):
+        self.groups = {}  # Projectile class -> list of projectiles
+
+    def append(self, projectile):
+        """Add a projectile"""
+        group = self.groups.get(type(projectile))
+        if group is None:
+            group = self.groups[type(projectile)] = []
+        group.append(projectile)
+
+    def extend(self, projectiles):
+        """Add several projectiles"""
+        for projectile in projectiles:
+            self.append(projectile)
+
+    def update(self):
+        """Advance every projectile one frame and drop inactive ones"""
+        for projectile_type, group in self.groups.items():
+            if not group:
+                continue
+            projectile_type.update_all(group)
+
+            # Compact in place, keeping order
+            keep = 0
+            for projectile in group:
+                if projectile.active:
+                    group[keep] = projectile
+                    keep += 1
+            del group[keep:]
+
+    def clear(self):
+        """Remove all projectiles"""
+        for group in self.groups.values():
+            group.clear()
+
+    def __iter__(self):
+        for group in self.groups.values():
+            yield from group
+
+    def __len__(self):
+        return sum(len(group) for group in self.groups.values())
+
+    def __bool__(self):
+        return any(self.groups.values())
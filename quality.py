@@ -0,0 +1,98 @@
+"""
+Adaptive quality governor for CMUQ Arena
+Drops visual effects when frames run over budget so gameplay stays at 60 FPS
+"""
+
+import config as c
+
+
+class QualityGovernor:
+    """
+    Watches per-frame work time and steps visual quality down or up.
+    
+    Quality is a single level: the number of entries of config.QUALITY_STEPS
+    that are currently switched off, counted from the front of the list.
+    Downgrades react quickly to sustained overload; upgrades wait for a much
+    longer stretch of headroom so the level does not oscillate.
+    """
+    
+    def __init__(self, budget_ms=c.FRAME_BUDGET_MS, steps=c.QUALITY_STEPS):
+        """
+        Initialize governor at full quality
+        
+        Args:
+            budget_ms: Frame time budget in milliseconds
+            steps: Feature names in the order they are dropped
+        """
+        self.budget_ms = budget_ms
+        self.steps = list(steps)
+        self.level = 0  # Number of steps currently disabled
+        self._disabled = set()
+        
+        # Running sums over the current observation window
+        self._over_sum = 0.0
+        self._over_count = 0
+        self._under_sum = 0.0
+        self._under_count = 0
+    
+    def record_frame(self, work_ms):
+        """
+        Record the work time of one frame (update + draw, excluding sleep)
+        
+        Args:
+            work_ms: Milliseconds spent on the frame
+            
+        Returns:
+            True if the quality level changed
+        """
+        self._over_sum += work_ms
+        self._over_count += 1
+        self._under_sum += work_ms
+        self._under_count += 1
+        
+        # Fast path: frames running hot -> step down
+        if self._over_count >= c.QUALITY_DOWNGRADE_FRAMES:
+            average = self._over_sum / self._over_count
+            self._over_sum = 0.0
+            self._over_count = 0
+            if average > self.budget_ms * c.QUALITY_DOWNGRADE_LOAD and self.level < len(self.steps):
+                self._set_level(self.level + 1)
+                return True
+        
+        # Slow path: sustained headroom -> step back up
+        if self._under_count >= c.QUALITY_UPGRADE_FRAMES:
+            average = self._under_sum / self._under_count
+            self._under_sum = 0.0
+            self._under_count = 0
+            if average < self.budget_ms * c.QUALITY_UPGRADE_LOAD and self.level > 0:
+                self._set_level(self.level - 1)
+                return True
+        
+        return False
+    
+    def _set_level(self, level):
+        """Set quality level and reset observation windows"""
+        self.level = max(0, min(len(self.steps), level))
+        self._disabled = set(self.steps[:self.level])
+        self._under_sum = 0.0
+        self._under_count = 0
+        print(f"[Quality] Level {self.level}: disabled {self.steps[:self.level] or 'nothing'}")
+    
+    def reset(self):
+        """Restore full quality and start fresh observation windows (new match)"""
+        if self.level:
+            self._set_level(0)
+        self._over_sum = 0.0
+        self._over_count = 0
+        self._under_sum = 0.0
+        self._under_count = 0
+    
+    def is_enabled(self, feature):
+        """Check if a quality feature is currently enabled"""
+        return feature not in self._disabled
+    
+    def scale_count(self, count):
+        """Scale a particle count for the current quality level (at least 1)"""
+        if 'particles' in self._disabled:
+            return max(1, int(count * c.QUALITY_REDUCED_PARTICLES))
+        return count
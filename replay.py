@@ -0,0 +1,226 @@
+"""
+Fight replays and per-frame state hashing for CMUQ Arena
+A replay is the fight seed, the characters and both fighters' input bits per
+simulation frame; the hash of the gameplay state after every frame is stored
+alongside so replaying the file detects any change in behavior.
+
+Verify a corpus headlessly with:
+    python replay.py replays/*.json
+"""
+
+import json
+import os
+import time
+import zlib
+from array import array
+import config as c
+
+
+REPLAY_VERSION = 1
+
+
+def name_code(name):
+    """Stable integer for a name (str hashes are randomized per process)"""
+    if name is None:
+        return 0
+    return zlib.crc32(name.encode())
+
+
+def state_hash(game):
+    """
+    Hash the gameplay-relevant fight state
+
+    Covers round state, both fighters (position, velocity, health, meter,
+    attack/stun/dash/parry timers), projectiles, spinning kicks and combo
+    counters. Rendering-only state (particles, hit effects, shake) is left out.
+
+    Args:
+        game: Game in the FIGHT state
+
+    Returns:
+        32-bit CRC of the packed state
+    """
+    clock = game.sim_clock
+    windows = game.counter_attack_window
+    values = array('d', (
+        clock.frame, clock.hit_stop_frames, clock.slow_motion_frames,
+        game.round_timer, game.last_timer_update, game.current_round,
+        game.p1_wins, game.p2_wins, game.round_over, game.round_transition_timer,
+        game.winner_sequence_active, game.winner_sequence_frame,
+        windows['p1'], windows['p2'],
+    ))
+
+    for fighter in (game.p1, game.p2):
+        values.extend((
+            fighter.rect.x, fighter.rect.y, fighter.vel_y,
+            fighter.health, fighter.super_meter, fighter.input_bits,
+            fighter.facing_right, fighter.jumping, fighter.alive,
+            fighter.attacking, name_code(fighter.attack_type), fighter.attack_frame,
+            fighter.attack_hit, fighter.attack_cooldown, fighter.last_attack_time,
+            fighter.hit_stun, fighter.block_stun, fighter.blocking,
+            fighter.parrying, fighter.parry_window, fighter.parry_cooldown,
+            fighter.dashing, fighter.dash_timer, fighter.dash_cooldown, fighter.last_dash_time,
+            fighter.special_move_cooldown, fighter.last_special_time, fighter.ultimate_active,
+        ))
+
+    for projectile in game.projectiles:
+        values.extend((
+            name_code(type(projectile).__name__), projectile.owner is game.p1,
+            projectile.x, projectile.y, projectile.vel_x, projectile.vel_y,
+            projectile.frame, projectile.active,
+        ))
+
+    for effect in game.special_effects:
+        values.extend((effect.fighter is game.p1, effect.frame, effect.hits_dealt,
+                       effect.hit_cooldown, effect.active))
+
+    combat = game.combat_system
+    for fighter_id in ('p1', 'p2'):
+        values.extend((
+            combat.combo_hits.get(fighter_id, 0),
+            combat.combo_damage.get(fighter_id, 0),
+            combat.combo_string_state.get(fighter_id, 0),
+        ))
+
+    return zlib.crc32(values.tobytes())
+
+
+class ReplayRecorder:
+    """Records one match: per-frame input bits and (optionally) state hashes"""
+
+    def __init__(self, game, hashes=c.REPLAY_HASHES, directory=c.REPLAY_DIR):
+        """
+        Start recording the match that was just set up
+
+        Args:
+            game: Game whose fight has just started
+            hashes: Also record the state hash of every frame
+            directory: Where save() writes the file (None = keep in memory)
+        """
+        self.header = {
+            'version': REPLAY_VERSION,
+            'p1': game.p1_cursor,
+            'p2': game.p2_cursor,
+            'attract': game.attract_mode,
+            'fight_seed': game.rng.fight_seed,
+        }
+        self.hashes_enabled = hashes
+        self.directory = directory
+        self.inputs = []  # [p1 bits, p2 bits] per simulation frame
+        self.hashes = []
+
+    def record_frame(self, game):
+        """Record the simulation frame that just ran"""
+        self.inputs.append((game.p1.input_bits, game.p2.input_bits))
+        if self.hashes_enabled:
+            self.hashes.append(state_hash(game))
+
+    def to_dict(self):
+        """Get the replay as JSON-ready data"""
+        data = dict(self.header, frames=len(self.inputs), inputs=self.inputs)
+        if self.hashes_enabled:
+            data['hashes'] = self.hashes
+        return data
+
+    def save(self):
+        """
+        Write the replay file
+
+        Returns:
+            Path written, or None if there is no directory or nothing recorded
+        """
+        if self.directory is None or not self.inputs:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"replay_{time.strftime('%Y%m%d_%H%M%S')}_{self.header['fight_seed']:016x}.json"
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        return path
+
+
+def load_replay(path):
+    """Load a replay file written by ReplayRecorder.save()"""
+    with open(path) as f:
+        data = json.load(f)
+    if data.get('version') != REPLAY_VERSION:
+        raise ValueError(f"{path}: unsupported replay version {data.get('version')}")
+    return data
+
+
+def start_replay(game, data):
+    """
+    Set up a game to play back a replay
+
+    Starts the recorded match with the recorded fight seed and routes both
+    fighters' input through the recorded bits.
+
+    Args:
+        game: Game instance
+        data: Replay data from load_replay()
+    """
+    game.p1_cursor = data['p1']
+    game.p2_cursor = data['p2']
+    if data['attract']:
+        game._start_attract_mode(fight_seed=data['fight_seed'], characters=(data['p1'], data['p2']))
+    else:
+        game.attract_mode = False
+        game._start_fight(fight_seed=data['fight_seed'])
+
+    inputs = data['inputs']
+    clock = game.sim_clock
+
+    def source(slot):
+        def read():
+            index = clock.frame - 1  # The clock advances before each simulated frame
+            return inputs[index][slot] if index < len(inputs) else 0
+        return read
+
+    game.p1.input_source = source(0)
+    game.p2.input_source = source(1)
+
+
+def verify_replay(game, data):
+    """
+    Play a replay and compare per-frame state hashes
+
+    Args:
+        game: Game instance (a headless one is fine)
+        data: Replay data with 'hashes'
+
+    Returns:
+        Index of the first frame whose hash differs, or None if all match
+    """
+    expected = data['hashes']
+    start_replay(game, data)
+    recorder = ReplayRecorder(game, hashes=True, directory=None)
+    game.replay_recorder = recorder
+    while game.state == "FIGHT" and len(recorder.hashes) < len(expected):
+        game._update_fight()
+    game.replay_recorder = None
+
+    for frame, (got, want) in enumerate(zip(recorder.hashes, expected)):
+        if got != want:
+            return frame
+    if len(recorder.hashes) != len(expected):
+        return len(recorder.hashes)
+    return None
+
+
+if __name__ == "__main__":
+    import sys
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    from game import Game
+
+    game = Game()
+    failed = 0
+    for replay_path in sys.argv[1:]:
+        replay = load_replay(replay_path)
+        mismatch = verify_replay(game, replay)
+        if mismatch is None:
+            print(f"OK    {replay_path} ({replay['frames']} frames)")
+        else:
+            failed += 1
+            print(f"DIFF  {replay_path} first differs at frame {mismatch}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,122 @@
+"""
+Seeded random number streams for CMUQ Arena
+Independent random.Random per subsystem so draws in one never shift another
+"""
+
+import random
+
+
+# Streams that affect the fight; derived from one seed
+GAMEPLAY_STREAMS = ('attract', 'ai')
+# Gameplay streams reseeded at the start of every fight
+FIGHT_STREAMS = ('ai',)
+# Cosmetic streams; free to change without affecting gameplay
+RENDER_STREAMS = ('shake', 'particles', 'hit_effects', 'floor')
+
+
+MASK64 = (1 << 64) - 1
+
+
+class SplitMix64(random.Random):
+    """
+    random.Random driven by the SplitMix64 generator.
+    
+    The whole state is a single integer, so getstate()/setstate() cost
+    nothing - gameplay streams use it so match snapshots (snapshot.py) can
+    capture them every frame. All random.Random methods (randint, choice,
+    uniform, ...) work on top of random() and getrandbits().
+    """
+    
+    def seed(self, a=None, version=2):
+        """Seed from an integer (None picks one from the OS)"""
+        if a is None:
+            a = random.SystemRandom().getrandbits(64)
+        self.state = a & MASK64
+        self.gauss_next = None
+    
+    def next64(self):
+        """Advance and return the next 64-bit output"""
+        self.state = z = (self.state + 0x9E3779B97F4A7C15) & MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+        return z ^ (z >> 31)
+    
+    def random(self):
+        """Float in [0, 1) with 53 random bits"""
+        return (self.next64() >> 11) * (1.0 / 9007199254740992)
+    
+    def getrandbits(self, k):
+        """Integer with k random bits"""
+        if k <= 64:
+            return self.next64() >> (64 - k)
+        bits = 0
+        for shift in range(0, k, 64):
+            bits |= self.next64() << shift
+        return bits & ((1 << k) - 1)
+    
+    def getstate(self):
+        return self.state
+    
+    def setstate(self, state):
+        self.state = state
+
+
+def derive_seed(seed, name):
+    """
+    Derive a stream seed from a parent seed and stream name
+    
+    Args:
+        seed: Parent seed
+        name: Stream name
+    
+    Returns:
+        64-bit integer seed (stable across runs and platforms)
+    """
+    return random.Random(f"{seed}:{name}").getrandbits(64)
+
+
+class RandomStreams:
+    """
+    Per-subsystem random streams owned by the simulation.
+    
+    Each stream is an attribute named after its subsystem (rng.ai,
+    rng.particles, ...). Gameplay streams come from the master seed, and the
+    per-fight ones are reseeded from a fight seed in start_fight(), so a fight
+    is reproducible from that one number. Gameplay streams are SplitMix64 so
+    their state is cheap to snapshot. Render streams are never read by
+    gameplay code.
+    """
+    
+    def __init__(self, seed=None):
+        """
+        Initialize streams
+        
+        Args:
+            seed: Master seed (None picks one from the OS)
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.fight_seed = None
+        self.fight_seeds = random.Random(derive_seed(seed, 'fights'))
+        for name in GAMEPLAY_STREAMS:
+            setattr(self, name, SplitMix64(derive_seed(seed, name)))
+        for name in RENDER_STREAMS:
+            setattr(self, name, random.Random(derive_seed(seed, name)))
+    
+    def start_fight(self, fight_seed=None):
+        """
+        Reseed the per-fight gameplay streams
+        
+        Args:
+            fight_seed: Seed to replay a recorded fight (None draws the next one)
+        
+        Returns:
+            The fight seed used
+        """
+        if fight_seed is None:
+            fight_seed = self.fight_seeds.getrandbits(64)
+        self.fight_seed = fight_seed
+        for name in FIGHT_STREAMS:
+            getattr(self, name).seed(derive_seed(fight_seed, name))
+        return fight_seed
@@ -0,0 +1,93 @@
+"""
+Run-ahead input latency reduction for CMUQ Arena
+Before each rendered frame the fight is simulated a few steps further with
+the current input held, that future state is drawn, and the real state is
+restored from a snapshot (particles, hit effects and screen shake are kept
+from the real state) - the way emulator run-ahead hides fixed display
+and USB encoder lag. The steps ahead are headless (no cosmetic effects,
+no combat events), and their CPU cost is measured and reported.
+"""
+
+import time
+import config as c
+from snapshot import MatchSnapshot, save_state, load_state
+
+
+class RunAhead:
+    """
+    Run-ahead around the fight's draw call.
+
+    Game.run calls begin() before drawing and end() right after it.
+    """
+
+    def __init__(self, frames=c.RUN_AHEAD_FRAMES, report_frames=c.RUN_AHEAD_REPORT_FRAMES):
+        """
+        Initialize run-ahead
+
+        Args:
+            frames: Steps simulated ahead of the real state (0 = off)
+            report_frames: Print the average added cost every this many
+                rendered frames (0 = never)
+        """
+        self.frames = frames
+        self.report_frames = report_frames
+        self.snapshot = MatchSnapshot()
+        self.active = False
+        self.cost_ms = 0.0  # Added CPU time of the last rendered frame
+        self._begin_s = 0.0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._count = 0
+
+    def begin(self, game):
+        """
+        Save the real state and simulate ahead (call before drawing)
+
+        Args:
+            game: Game in the FIGHT state
+        """
+        start = time.perf_counter()
+        save_state(game, self.snapshot)
+        latched = (game.p1.latched_bits, game.p2.latched_bits)  # Taps are for the real step
+        # Cosmetic state isn't in the snapshot; a round reset or ultimate ahead must not touch it
+        cosmetics = (game.particles, game.hit_effects, game.screen_shake)
+
+        events = game.combat_system.events
+        record = events.record
+        events.record = False
+        game.headless = True
+        for step in range(self.frames):
+            if step == self.frames - 1:
+                game._store_render_positions()  # Interpolate within the last step ahead
+            game._step_fight()
+            if game.state != "FIGHT":
+                break
+        game.headless = False
+        events.record = record
+        game.p1.latched_bits, game.p2.latched_bits = latched
+        game.particles, game.hit_effects, game.screen_shake = cosmetics
+
+        self.active = True
+        self._begin_s = time.perf_counter() - start
+
+    def end(self, game):
+        """
+        Restore the real state (call after drawing)
+
+        Args:
+            game: Game passed to begin()
+        """
+        start = time.perf_counter()
+        load_state(game, self.snapshot)
+        self.active = False
+
+        self.cost_ms = (self._begin_s + time.perf_counter() - start) * 1000
+        self._total_ms += self.cost_ms
+        self._max_ms = max(self._max_ms, self.cost_ms)
+        self._count += 1
+        if self.report_frames and self._count >= self.report_frames:
+            print(f"[RunAhead] {self.frames} frames ahead: +{self._total_ms / self._count:.2f} ms/frame avg, "
+                  f"{self._max_ms:.2f} ms max")
+            self._total_ms = 0.0
+            self._max_ms = 0.0
+            self._count = 0
@@ -0,0 +1,223 @@
+"""
+Match state snapshots for CMUQ Arena
+save_state() copies the gameplay state of a match into a flat, reused
+buffer; load_state() writes it back. Only plain values and references to
+objects that already exist are stored (no deep copies, no new pygame
+objects), so a snapshot takes microseconds. Rollback, run-ahead and instant
+replays build on this.
+
+Rendering-only state (particles, hit effects, screen shake, combat events
+already queued for the renderer) is not part of a snapshot; the per-type
+combat event counts are, so steps undone by run-ahead or rollback aren't
+counted twice.
+"""
+
+from operator import attrgetter
+from rng import GAMEPLAY_STREAMS
+
+
+GAME_FIELDS = ('state', 'round_timer', 'last_timer_update', 'current_round', 'p1_wins', 'p2_wins',
+               'round_over', 'round_transition_timer', 'round_winner',
+               'winner_sequence_active', 'winner_sequence_frame')
+CLOCK_FIELDS = ('frame', 'paused', 'hit_stop_frames',
+                'slow_motion_scale', 'slow_motion_frames', '_frame_progress')
+COMBAT_DICTS = ('combo_hits', 'combo_damage', 'combo_timer', 'last_hit_time',
+                'active_combo_string', 'combo_string_state')
+FIGHTER_IDS = ('p1', 'p2')
+
+_get_game = attrgetter(*GAME_FIELDS)
+_get_clock = attrgetter(*CLOCK_FIELDS)
+_getters = {}  # Class -> attrgetter for its SNAPSHOT_FIELDS
+
+# Entries per snapshot before the projectile / effect lists
+FIGHTER_ENTRIES = 5
+FIXED_ENTRIES = 3 + 2 * FIGHTER_ENTRIES + 1 + len(GAMEPLAY_STREAMS) + 2
+
+
+def _getter(cls):
+    """Get (and cache) the attrgetter for a class's SNAPSHOT_FIELDS"""
+    getter = _getters.get(cls)
+    if getter is None:
+        getter = _getters[cls] = attrgetter(*cls.SNAPSHOT_FIELDS)
+    return getter
+
+
+class MatchSnapshot:
+    """
+    Preallocated flat buffer holding one match state.
+
+    Entries are written and read back in a fixed order by save_state() and
+    load_state(); the buffer only grows when a snapshot has more projectiles
+    than any before it.
+    """
+
+    def __init__(self, capacity=FIXED_ENTRIES + 64):
+        """
+        Initialize buffer
+
+        Args:
+            capacity: Initial number of entries
+        """
+        self.data = [None] * capacity
+        self.size = 0  # Entries used by the current snapshot
+        self.frame = -1  # Simulation frame the snapshot was taken at
+
+    def reserve(self, count):
+        """Make room for count entries and return the buffer"""
+        if count > len(self.data):
+            self.data.extend([None] * (count - len(self.data)))
+        return self.data
+
+
+def save_state(game, snapshot=None):
+    """
+    Capture the current match state
+
+    Args:
+        game: Game in the FIGHT state
+        snapshot: MatchSnapshot to overwrite (None allocates a new one)
+
+    Returns:
+        The snapshot
+    """
+    if snapshot is None:
+        snapshot = MatchSnapshot()
+    projectiles = game.projectiles
+    effects = game.special_effects
+    data = snapshot.reserve(FIXED_ENTRIES + 2 * (len(projectiles) + len(effects)))
+
+    data[0] = _get_game(game)
+    data[1] = _get_clock(game.sim_clock)
+    windows = game.counter_attack_window
+    data[2] = (windows['p1'], windows['p2'])
+    i = 3
+
+    for fighter in (game.p1, game.p2):
+        data[i] = _getter(type(fighter))(fighter)
+        attack_rect = fighter.attack_rect
+        data[i + 1] = (fighter.rect.x, fighter.rect.y,
+                       None if attack_rect is None else tuple(attack_rect))
+        history = fighter.input_history
+        data[i + 2] = (tuple(history.directions), tuple(history.actions),
+                       tuple(history.last_press), history.frame)
+        motions = fighter.motion_recognizer
+        data[i + 3] = (tuple([tuple(prefixes) for prefixes in motions.sequences.values()]),
+                       tuple(motions.completed.values()),
+                       tuple(motions.charge_hold_since.values()),
+                       tuple(motions.charge_ready_until.values()),
+                       motions.last_direction)
+        data[i + 4] = (fighter.attack_buffer.consumed_frame, tuple(fighter.attack_history))
+        i += FIGHTER_ENTRIES
+
+    combat = game.combat_system
+    data[i] = (tuple([tuple([getattr(combat, name).get(fighter_id) for name in COMBAT_DICTS])
+                      for fighter_id in FIGHTER_IDS]),
+               tuple([tuple(combat.attack_history.get(fighter_id, ())) for fighter_id in FIGHTER_IDS]),
+               tuple(combat.combo_announcements),
+               tuple(combat.events.counts.values()))
+    i += 1
+
+    rng = game.rng
+    for name in GAMEPLAY_STREAMS:
+        data[i] = getattr(rng, name).getstate()
+        i += 1
+
+    data[i] = len(projectiles)
+    data[i + 1] = len(effects)
+    i += 2
+    for projectile in projectiles:
+        data[i] = projectile
+        data[i + 1] = _getter(type(projectile))(projectile)
+        i += 2
+    for effect in effects:
+        data[i] = effect
+        data[i + 1] = _getter(type(effect))(effect)
+        i += 2
+
+    snapshot.size = i
+    snapshot.frame = game.sim_clock.frame
+    return snapshot
+
+
+def load_state(game, snapshot):
+    """
+    Restore a match state captured by save_state()
+
+    The snapshot must come from the current match (it refers to its
+    fighters and projectiles).
+
+    Args:
+        game: Game the snapshot was taken from
+        snapshot: MatchSnapshot to restore
+    """
+    data = snapshot.data
+    game.__dict__.update(zip(GAME_FIELDS, data[0]))
+    game.sim_clock.__dict__.update(zip(CLOCK_FIELDS, data[1]))
+    windows = game.counter_attack_window
+    windows['p1'], windows['p2'] = data[2]
+    i = 3
+
+    for fighter in (game.p1, game.p2):
+        fighter.__dict__.update(zip(type(fighter).SNAPSHOT_FIELDS, data[i]))
+        x, y, attack_rect = data[i + 1]
+        fighter.rect.x = x
+        fighter.rect.y = y
+        if attack_rect is None:
+            fighter.attack_rect = None
+        elif fighter.attack_rect is None:
+            fighter.attack_rect = fighter.rect.copy()
+            fighter.attack_rect.update(attack_rect)
+        else:
+            fighter.attack_rect.update(attack_rect)
+
+        history = fighter.input_history
+        history.directions[:], history.actions[:], history.last_press[:], history.frame = data[i + 2]
+
+        motions = fighter.motion_recognizer
+        sequences, completed, hold_since, ready_until, motions.last_direction = data[i + 3]
+        for prefixes, saved in zip(motions.sequences.values(), sequences):
+            prefixes[:] = saved
+        motions.completed.update(zip(motions.completed, completed))
+        motions.charge_hold_since.update(zip(motions.charge_hold_since, hold_since))
+        motions.charge_ready_until.update(zip(motions.charge_ready_until, ready_until))
+
+        fighter.attack_buffer.consumed_frame, attack_history = data[i + 4]
+        fighter.attack_history[:] = attack_history
+        i += FIGHTER_ENTRIES
+
+    combat = game.combat_system
+    values, attack_histories, announcements, event_counts = data[i]
+    for fighter_id, fighter_values, attacks in zip(FIGHTER_IDS, values, attack_histories):
+        for name, value in zip(COMBAT_DICTS, fighter_values):
+            getattr(combat, name)[fighter_id] = value
+        history = combat.attack_history.get(fighter_id)
+        if history is not None:
+            history.clear()
+            history.extend(attacks)
+    combat.combo_announcements = list(announcements)
+    counts = combat.events.counts
+    counts.update(zip(counts, event_counts))
+    i += 1
+
+    rng = game.rng
+    for name in GAMEPLAY_STREAMS:
+        getattr(rng, name).setstate(data[i])
+        i += 1
+
+    projectile_count = data[i]
+    effect_count = data[i + 1]
+    i += 2
+    projectiles = game.projectiles
+    projectiles.clear()
+    for _ in range(projectile_count):
+        projectile = data[i]
+        projectile.__dict__.update(zip(type(projectile).SNAPSHOT_FIELDS, data[i + 1]))
+        projectiles.append(projectile)
+        i += 2
+    effects = game.special_effects
+    effects.clear()
+    for _ in range(effect_count):
+        effect = data[i]
+        effect.__dict__.update(zip(type(effect).SNAPSHOT_FIELDS, data[i + 1]))
+        effects.append(effect)
+        i += 2
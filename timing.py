@@ -0,0 +1,152 @@
+"""
+Timing utilities for CMUQ Arena
+Fixed-timestep accumulator that decouples simulation rate from display rate
+"""
+
+import time
+import config as c
+
+
+class FixedTimestep:
+    """
+    Fixed-timestep accumulator.
+    
+    Real elapsed time is accumulated every rendered frame and consumed in
+    whole simulation steps of exactly 1/SIM_HZ seconds. The leftover fraction
+    is exposed as an interpolation factor for rendering between the previous
+    and current simulation states.
+    """
+    
+    def __init__(self, step_hz=c.FPS, max_steps=c.MAX_CATCHUP_STEPS):
+        """
+        Initialize accumulator
+        
+        Args:
+            step_hz: Simulation steps per second
+            max_steps: Maximum catch-up steps per rendered frame; any
+                backlog beyond this is dropped (the game slows down
+                instead of spiralling)
+        """
+        self.step_ms = 1000.0 / step_hz
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_ms = 0.0  # Total time discarded by the catch-up cap (logged as it happens)
+        self.last_time = time.perf_counter()
+    
+    def reset(self):
+        """Discard accumulated time (e.g. after a deliberate blocking delay)"""
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+    
+    def advance(self, elapsed_ms=None):
+        """
+        Accumulate elapsed time and return how many simulation steps to run
+        
+        Args:
+            elapsed_ms: Real time since the last call; measured with
+                time.perf_counter() when omitted
+                
+        Returns:
+            Number of fixed simulation steps to run this frame
+        """
+        now = time.perf_counter()
+        if elapsed_ms is None:
+            elapsed_ms = (now - self.last_time) * 1000.0
+        self.last_time = now
+        
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            dropped = (steps - self.max_steps) * self.step_ms
+            self.dropped_ms += dropped
+            self.accumulator -= dropped
+            print(f"[Timing] Catch-up cap hit: dropped {dropped:.0f} ms ({self.dropped_ms:.0f} ms total)")
+            steps = self.max_steps
+        self.accumulator -= steps * self.step_ms
+        return steps
+    
+    @property
+    def interpolation(self):
+        """Fraction (0.0-1.0) of a step elapsed since the last simulation step"""
+        return min(1.0, self.accumulator / self.step_ms)
+
+
+def lerp(a, b, t):
+    """Linear interpolation between a and b"""
+    return a + (b - a) * t
+
+
+class SimulationClock:
+    """
+    Simulation time source with time scaling.
+    
+    All gameplay timers read time from here instead of pygame.time, so that
+    hit-stop, slow motion and pause stop or slow millisecond timers (attack
+    cooldowns, round timer, combo windows) and frame counters together.
+    Simulated time only advances in whole frames: get_ticks() is always
+    exactly frame * 1000 / c.FPS, which keeps frame data consistent no
+    matter how slow motion is tuned.
+    
+    tick() is called once per fixed real step and returns how many
+    simulation frames to run for it (0 during hit-stop or pause, 0 or 1 in
+    slow motion, 1 normally); advance_frame() is then called at the start
+    of each of those frames.
+    """
+    
+    FRAME_MS = 1000.0 / c.FPS
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Reset simulated time to zero and clear all time scaling"""
+        self.frame = 0  # Simulation frames elapsed
+        self.paused = False
+        self.hit_stop_frames = 0  # Fixed steps left with time frozen
+        self.slow_motion_scale = 1.0
+        self.slow_motion_frames = 0  # Fixed steps left in slow motion
+        self._frame_progress = 0.0  # Fractional simulation frame carried over
+    
+    def get_ticks(self):
+        """Simulated milliseconds elapsed (drop-in for pygame.time.get_ticks)"""
+        return int(self.frame * self.FRAME_MS)
+    
+    def hit_stop(self, frames):
+        """Freeze simulation time for a number of fixed steps (hit impact)"""
+        self.hit_stop_frames = max(self.hit_stop_frames, frames)
+    
+    def slow_motion(self, scale, frames):
+        """Run simulation at scale speed for a number of fixed steps"""
+        self.slow_motion_scale = scale
+        self.slow_motion_frames = frames
+    
+    def set_paused(self, paused):
+        """Pause or resume simulation time"""
+        self.paused = paused
+    
+    def tick(self):
+        """
+        Advance by one real fixed step
+        
+        Returns:
+            Number of whole simulation frames to run for this step
+        """
+        if self.paused:
+            return 0
+        if self.hit_stop_frames > 0:
+            self.hit_stop_frames -= 1
+            return 0
+        
+        scale = 1.0
+        if self.slow_motion_frames > 0:
+            self.slow_motion_frames -= 1
+            scale = self.slow_motion_scale
+        
+        self._frame_progress += scale
+        frames = int(self._frame_progress)
+        self._frame_progress -= frames
+        return frames
+    
+    def advance_frame(self):
+        """Advance simulated time by exactly one frame"""
+        self.frame += 1
@@ -227,26 +227,119 @@ class ArcadeFrame:
         pygame.draw.circle(surface, c.ORANGE, (width - corner_size, height - corner_size), 8)
 
 
-class ScanlineEffect:
-    """Creates vintage CRT scanline effect"""
+class ArcadeOverlay:
+    """
+    Pre-baked arcade frame and scanline overlay
+    
+    The cabinet frame decorations are rendered once into an RLE colorkey
+    surface, so compositing them each frame is a single blit instead of a
+    dozen primitives. Scanlines are opt-in (config.SCANLINES): when on, a
+    converted per-pixel alpha surface with the frame and the lines is baked
+    as well and used while scanlines_enabled is set.
+    """
     
-    def __init__(self, width, height):
-        """Initialize scanline surface"""
-        self.surface = pygame.Surface((width, height))
-        self.surface.set_colorkey(c.BLACK)
-        self.surface.set_alpha(30)  # Reduced alpha for better visibility
-        
-        # Draw horizontal scanlines with more spacing
-        for y in range(0, height, 4):
-            pygame.draw.line(self.surface, (0, 0, 0), (0, y), (width, y), 1)
+    SCANLINE_SPACING = 4
+    SCANLINE_ALPHA = 30
+    FRAME_COLORKEY = (255, 0, 255)
+    
+    def __init__(self, width, height, scanlines=c.SCANLINES):
+        """
+        Bake the overlay surfaces
+        
+        Args:
+            width, height: Overlay size (normally the internal resolution)
+            scanlines: Whether to bake the scanline variant at all
+        """
+        self.scanlines_enabled = scanlines
+        has_display = pygame.display.get_surface() is not None
+        
+        # Frame + scanlines, per-pixel alpha (only when opted in)
+        self.full_surface = None
+        if scanlines:
+            full = pygame.Surface((width, height), pygame.SRCALPHA)
+            full.fill((0, 0, 0, 0))
+            for y in range(0, height, self.SCANLINE_SPACING):
+                pygame.draw.line(full, (0, 0, 0, self.SCANLINE_ALPHA), (0, y), (width, y))
+            ArcadeFrame.draw(full)
+            self.full_surface = full.convert_alpha() if has_display else full
+        
+        # Frame only, RLE colorkey (almost free to blit)
+        frame = pygame.Surface((width, height))
+        frame.fill(self.FRAME_COLORKEY)
+        ArcadeFrame.draw(frame)
+        frame.set_colorkey(self.FRAME_COLORKEY, pygame.RLEACCEL)
+        self.frame_surface = frame.convert() if has_display else frame
     
     def draw(self, surface):
-        """Apply scanline effect to surface"""
-        surface.blit(self.surface, (0, 0))
+        """Composite the overlay onto surface"""
+        if self.scanlines_enabled and self.full_surface is not None:
+            surface.blit(self.full_surface, (0, 0))
+        else:
+            surface.blit(self.frame_surface, (0, 0))
 
 
 class GradientBackground:
-    """Creates smooth gradient backgrounds for menus"""
+    """Creates smooth gradient backgrounds for menus
+
+    Gradients are rendered once into a surface cache keyed by size and
+    colors, so drawing a menu background each frame is a single blit.
+    """
+    
+    # Cached gradient surfaces, keyed by (kind, size, colors)
+    _cache = {}
+    MAX_CACHED_SURFACES = 32
+    
+    @staticmethod
+    def _lerp_color(color_a, color_b, ratio):
+        """Linearly interpolate between two RGB colors"""
+        return (
+            int(color_a[0] + (color_b[0] - color_a[0]) * ratio),
+            int(color_a[1] + (color_b[1] - color_a[1]) * ratio),
+            int(color_a[2] + (color_b[2] - color_a[2]) * ratio)
+        )
+    
+    @classmethod
+    def _store(cls, key, surface):
+        """Store a generated gradient, converting it for fast blits when possible"""
+        if len(cls._cache) >= cls.MAX_CACHED_SURFACES:
+            cls._cache.clear()
+        if pygame.display.get_surface() is not None:
+            if surface.get_flags() & pygame.SRCALPHA:
+                surface = surface.convert_alpha()
+            else:
+                surface = surface.convert()
+        cls._cache[key] = surface
+        return surface
+    
+    @classmethod
+    def get_vertical(cls, width, height, color_top, color_bottom):
+        """
+        Get a cached vertical gradient surface.
+        
+        The gradient is built as a 1xN strip (one pixel per row) and
+        stretched horizontally, which copies every row exactly.
+        """
+        key = ('vertical', width, height, tuple(color_top), tuple(color_bottom))
+        surface = cls._cache.get(key)
+        if surface is None:
+            strip = pygame.Surface((1, height))
+            for y in range(height):
+                strip.set_at((0, y), cls._lerp_color(color_top, color_bottom, y / height))
+            surface = cls._store(key, pygame.transform.scale(strip, (width, height)))
+        return surface
+    
+    @classmethod
+    def get_radial(cls, radius, color_center, color_edge):
+        """Get a cached radial gradient surface (transparent outside the radius)"""
+        key = ('radial', radius, tuple(color_center), tuple(color_edge))
+        surface = cls._cache.get(key)
+        if surface is None:
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            for r in range(radius, 0, -2):
+                color = cls._lerp_color(color_edge, color_center, 1 - (r / radius))
+                pygame.draw.circle(surface, color, (radius, radius), r)
+            surface = cls._store(key, surface)
+        return surface
     
     @staticmethod
     def draw_vertical(surface, color_top, color_bottom, rect=None):
@@ -261,16 +354,11 @@ class GradientBackground:
         """
         if rect is None:
             rect = pygame.Rect(0, 0, surface.get_width(), surface.get_height())
+        if rect.width <= 0 or rect.height <= 0:
+            return
         
-        for y in range(rect.height):
-            # Linear interpolation between colors
-            ratio = y / rect.height
-            r = int(color_top[0] + (color_bottom[0] - color_top[0]) * ratio)
-            g = int(color_top[1] + (color_bottom[1] - color_top[1]) * ratio)
-            b = int(color_top[2] + (color_bottom[2] - color_top[2]) * ratio)
-            pygame.draw.line(surface, (r, g, b), 
-                           (rect.x, rect.y + y), 
-                           (rect.x + rect.width, rect.y + y))
+        gradient = GradientBackground.get_vertical(rect.width, rect.height, color_top, color_bottom)
+        surface.blit(gradient, rect.topleft)
     
     @staticmethod
     def draw_radial(surface, center, radius, color_center, color_edge):
@@ -284,12 +372,11 @@ class GradientBackground:
             color_center: RGB tuple for center color
             color_edge: RGB tuple for edge color
         """
-        for r in range(radius, 0, -2):
-            ratio = 1 - (r / radius)
-            cr = int(color_edge[0] + (color_center[0] - color_edge[0]) * ratio)
-            cg = int(color_edge[1] + (color_center[1] - color_edge[1]) * ratio)
-            cb = int(color_edge[2] + (color_center[2] - color_edge[2]) * ratio)
-            pygame.draw.circle(surface, (cr, cg, cb), center, r)
+        if radius <= 0:
+            return
+        
+        gradient = GradientBackground.get_radial(radius, color_center, color_edge)
+        surface.blit(gradient, (center[0] - radius, center[1] - radius))
 
 
 class AnimatedText: